@@ -0,0 +1,165 @@
+import atexit
+import queue
+import threading
+
+import numpy as np
+import sounddevice as sd
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+CaptureBlockSize = int(env_vars.get("CaptureBlockSize", 1024))        # Samples per block
+CaptureBufferSeconds = float(env_vars.get("CaptureBufferSeconds", 10)) # Ring buffer length
+PreRollSeconds = float(env_vars.get("PreRollSeconds", 0.5))           # Audio kept before speech onset
+CaptureStallTimeout = float(env_vars.get("CaptureStallTimeout", 2.0))  # No block for this long = stalled stream
+
+
+class AudioCaptureService:
+    """
+    Long-lived microphone capture shared by every listener.
+
+    One sd.InputStream stays open across turns. The PortAudio callback copies
+    each block into a preallocated int16 ring buffer and hands the block's
+    sequence number to the consumer, so no allocation happens per block and
+    the most recent audio is always available as pre-roll.
+    """
+
+    def __init__(self, blocksize=CaptureBlockSize, buffer_seconds=CaptureBufferSeconds,
+                 preroll_seconds=PreRollSeconds, samplerate=None, device=None):
+        self.blocksize = blocksize
+        self.buffer_seconds = buffer_seconds
+        self.preroll_seconds = preroll_seconds
+        self.samplerate = samplerate
+        self.device = device
+
+        self.capacity = 0
+        self.overruns = 0
+        self._ring = None
+        self._stream = None
+        self._write_seq = 0
+        self._ready = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._stream is not None
+
+    @property
+    def preroll_blocks(self):
+        if not self.samplerate:
+            return 0
+        return int(round(self.preroll_seconds * self.samplerate / self.blocksize))
+
+    def start(self):
+        """Open the input stream once. Later calls are no-ops."""
+        with self._lock:
+            if self._stream is not None:
+                return self
+
+            if self.samplerate is None:
+                device_info = sd.query_devices(device=self.device, kind='input')
+                self.samplerate = int(device_info['default_samplerate'])
+
+            blocks = int(self.buffer_seconds * self.samplerate / self.blocksize)
+            self.capacity = max(blocks, self.preroll_blocks + 2)
+            self._ring = np.zeros((self.capacity, self.blocksize), dtype=np.int16)
+            self._write_seq = 0
+            self._ready = queue.Queue()
+
+            stream = sd.InputStream(
+                samplerate=self.samplerate,
+                blocksize=self.blocksize,
+                device=self.device,
+                channels=1,
+                dtype='int16',
+                callback=self._callback
+            )
+            stream.start()
+            self._stream = stream
+            print(f"[AudioCapture] Stream open ({self.samplerate} Hz, {self.blocksize} samples/block, "
+                  f"{self.capacity} blocks buffered)")
+        return self
+
+    def stop(self):
+        with self._lock:
+            if self._stream is None:
+                return
+            try:
+                self._stream.stop()
+                self._stream.close()
+            except Exception as e:
+                print(f"[AudioCapture] Error closing stream: {e}")
+            self._stream = None
+
+    def restart(self):
+        """Close and reopen the stream (device stalled or disappeared). Returns the new turn start."""
+        print("[AudioCapture] Stream stalled, reopening...")
+        self.stop()
+        self.start()
+        return self.flush()
+
+    def _callback(self, indata, frames, time_info, status):
+        # Runs on the PortAudio thread: copy into the ring slot and publish the sequence number.
+        if status:
+            print(status, flush=True)
+        seq = self._write_seq
+        slot = self._ring[seq % self.capacity]
+        n = min(frames, self.blocksize)
+        slot[:n] = indata[:n, 0]
+        if n < self.blocksize:
+            slot[n:] = 0
+        self._write_seq = seq + 1
+        self._ready.put(seq)
+
+    def flush(self):
+        """
+        Drop blocks queued since the last turn (e.g. our own TTS output).
+        Returns the sequence number where the new turn begins.
+        """
+        while True:
+            try:
+                self._ready.get_nowait()
+            except queue.Empty:
+                break
+        return self._write_seq
+
+    def read(self, timeout=None):
+        """
+        Returns (seq, block) for the next captured block, or (None, None) on timeout.
+        `block` is a view into the ring buffer; copy it if it must outlive the buffer window.
+        """
+        while True:
+            try:
+                seq = self._ready.get(timeout=timeout)
+            except queue.Empty:
+                return None, None
+
+            if self._write_seq - seq > self.capacity:
+                # Consumer fell more than a full buffer behind; this slot was overwritten.
+                self.overruns += 1
+                continue
+
+            return seq, self._ring[seq % self.capacity]
+
+    def preroll(self, seq, since=0):
+        """
+        Copy of up to `preroll_blocks` blocks captured immediately before `seq`,
+        never reaching further back than `since` (the start of the current turn).
+        """
+        lo = max(seq - self.preroll_blocks, since, self._write_seq - self.capacity + 1, 0)
+        if lo >= seq:
+            return np.empty(0, dtype=np.int16)
+        return self._ring[np.arange(lo, seq) % self.capacity].reshape(-1)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_capture_service():
+    """Process-wide capture service, started on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = AudioCaptureService()
+            atexit.register(_service.stop)
+    return _service.start()
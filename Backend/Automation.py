@@ -4,7 +4,7 @@ from pywhatkit import search, playonyt
 from dotenv import dotenv_values
 from bs4 import BeautifulSoup
 from rich import print
-from groq import Groq
+from Backend.LLMGateway import get_gateway
 import webbrowser
 import subprocess
 import requests
@@ -15,7 +15,8 @@ import pyautogui
 import time
 from Backend.TextToSpeech import TTS
 from Backend.TextToSpeech import TTS
-from Backend.SpeechToText import SpeechRecognition, SpeechRecognitionConfirmation
+from Backend.SpeechToText import SpeechRecognition, ConfirmationKeywordRecognition
+from Backend.ConfirmationDecoder import decision_stats
 import win32gui
 import pytesseract
 from PIL import Image
@@ -60,6 +61,7 @@ import json
 
 class TrustedContactManager:
     def __init__(self, filepath="Data/trusted_contacts.json"):
+        # Always file-backed (also with MemoryBackend=sqlite): the allow-list must follow the file exactly
         self.filepath = filepath
         self.contacts = self._load_contacts()
 
@@ -190,11 +192,6 @@ print(f"[System] OCR Availability: {OCR_AVAILABLE}")
 def is_ocr_available():
     return OCR_AVAILABLE
 
-# Initialize Groq client only if API key exists
-client = None
-if GroqAPIKey:
-    client = Groq(api_key=GroqAPIKey)
-
 professional_responses = [
     "Your satisfaction is my top priority; feel free to reach out if there's anything else I can help you with.",
     "I'm at your service for any additional questions or support you may need—don't hesitate to ask.",
@@ -211,14 +208,14 @@ def GoogleSearch(topic):
 
 
 def ContentWriterAI(prompt):
-    if not client:
+    if not GroqAPIKey:
         print("Error: Groq API key not found. Please check your .env file.")
         return "Error: Unable to generate content - API key missing."
     
     try:
         messages.append({"role": "user", "content": f"{prompt}"})
 
-        completion = client.chat.completions.create(
+        completion = get_gateway().chat("content",
             model="llama-3.3-70b-versatile",
             messages=SystemChatBot + messages,
             max_tokens=2048,
@@ -836,32 +833,30 @@ def wait_for_user_confirmation(contact_name):
     """
     try:
         # Prompt Updated for "NEW CHAT" Context
-        prompt = f"I have opened a NEW chat for {contact_name}. Please say YES to send the message or NO to cancel."
-        TTS(prompt)
+        # The fixed half is a separate clip so it is served from the speech cache
+        TTS(f"I have opened a NEW chat for {contact_name}.")
+        TTS("Please say YES to send the message or NO to cancel.")
         time.sleep(0.5) # Explicit Delay after TTS
 
-        # STRICT MATCHING
-        valid_yes = ["yes", "yeah", "yep", "sure", "ok", "okay", "confirm", "send", "proceed", "correct", "right"]
-        valid_no = ["no", "nope", "cancel", "stop", "abort", "don't", "wrong", "wait"]
-        
         # Retry Loop (Max 2 Attempts)
         for attempt in range(1, 3):
             print(f"[Confirmation] Waiting for user input (YES/NO) in CONFIRMATION MODE (Attempt {attempt}/2)...")
             
-            # Listen for response (Blocking, Dedicated Mode)
-            response = SpeechRecognitionConfirmation(timeout=5)
-            print(f"[Confirmation] User said: '{response}'")
-            
-            normalized = response.lower()
+            # Listen for response (Blocking, Dedicated Mode).
+            # Keyword spotting decides mid-utterance; ambiguous audio falls back to
+            # full recognition with the same STRICT MATCHING word lists.
+            result = ConfirmationKeywordRecognition(timeout=5)
+            print(f"[Confirmation] User said: '{result.text}' -> {result.decision} "
+                  f"via {result.path} in {result.latency_ms:.0f} ms")
+            print(f"[Confirmation] Decision latency so far: {decision_stats.summary()}")
             
-            # Check NO first (Safe Default)
-            if any(word in normalized for word in valid_no):
+            # NO is decided first (Safe Default)
+            if result.decision == "no":
                 TTS("Cancelled.")
                 print("[Confirmation] User explicitly CANCELLED.")
                 return False
                 
-            # Check YES
-            if any(word in normalized for word in valid_yes):
+            if result.decision == "yes":
                 print("[Confirmation] User CONFIRMED.")
                 return True
             
@@ -0,0 +1,236 @@
+import json
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+ChatRecentTurns = int(env_vars.get("ChatRecentTurns", 6))         # user+assistant pairs kept verbatim
+ChatTokenBudget = int(env_vars.get("ChatTokenBudget", 3000))      # prompt tokens per request
+ChatSummaryModel = env_vars.get("ChatSummaryModel", "llama-3.1-8b-instant")
+ChatSummaryBatchTokens = int(env_vars.get("ChatSummaryBatchTokens", 2000))  # per summarization call
+ChatSummaryFile = env_vars.get("ChatSummaryFile", os.path.join("Data", "ChatSummary.json"))
+
+METRIC_WINDOW = 500
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an assistant. "
+    "Merge the previous summary with the new messages into one short paragraph of facts, "
+    "preferences and open questions worth remembering. Reply with the summary only."
+)
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def message_tokens(message):
+    return estimate_tokens(message["content"]) + 4  # role + framing
+
+
+def summarize_with_llm(previous_summary, messages):
+    """Default summarizer: one cheap, non-streaming call through the shared gateway."""
+    from Backend.LLMGateway import get_gateway
+
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    completion = get_gateway().chat(
+        "summary",
+        model=ChatSummaryModel,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": f"Previous summary:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}"},
+        ],
+        max_tokens=300,
+        temperature=0.2,
+    )
+    return completion.choices[0].message.content.strip()
+
+
+class ChatContext:
+    """
+    Builds a bounded prompt from an ever-growing chat history.
+
+    The last `recent_turns` exchanges are sent verbatim; everything older is
+    folded into a rolling summary by `summarize(previous_summary, messages)`
+    on a background thread, so a turn never waits for it. A long backlog is
+    folded in one call per `batch_tokens` of messages, in order, so no single
+    request outgrows the summary model. Messages that are older than the
+    recent window but not yet summarized are still sent while the budget
+    allows. The result never exceeds `token_budget` (estimated): the oldest
+    history goes first, then the summary is cut, but the system messages and
+    the current user message always stay.
+
+    With `state_path` the summary and how far it reaches are saved after
+    every batch, so a restart carries on where the last run stopped.
+    """
+
+    def __init__(self, summarize=summarize_with_llm, recent_turns=ChatRecentTurns, token_budget=ChatTokenBudget,
+                 batch_tokens=ChatSummaryBatchTokens, state_path=None):
+        self.summarize = summarize
+        self.recent_messages = recent_turns * 2
+        self.token_budget = token_budget
+        self.batch_tokens = batch_tokens
+        self.state_path = state_path
+        self.summary = ""
+        self.summarized_upto = 0       # messages [0, summarized_upto) of the whole log are in self.summary
+        self._pending = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-summary")
+        self.stats = {"requests": 0, "summaries": 0, "summary_errors": 0, "trimmed_messages": 0}
+        self._prompt_tokens = deque(maxlen=METRIC_WINDOW)
+        self._history_tokens = deque(maxlen=METRIC_WINDOW)
+        self._latency = deque(maxlen=METRIC_WINDOW)
+        self._summary_latency = deque(maxlen=METRIC_WINDOW)
+        self._load_state()
+
+    def _load_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.summary, self.summarized_upto = state["summary"], int(state["summarized_upto"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[ChatContext] Ignoring {self.state_path}: {e}")
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {"summary": self.summary, "summarized_upto": self.summarized_upto}
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            tmp = self.state_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp, self.state_path)
+        except OSError as e:
+            print(f"[ChatContext] Could not save {self.state_path}: {e}")
+
+    def build(self, system_messages, history, offset=0):
+        """
+        Messages to send for this turn; `history` ends with the current user
+        message. `offset` is how many older messages the log has already
+        archived (history[0] is message number `offset` of the conversation).
+        """
+        with self._lock:
+            cleared = self.summarized_upto > offset + len(history)
+            if cleared:
+                # History was cleared underneath us
+                self.summary, self.summarized_upto = "", 0
+            summary = self.summary
+            start = max(self.summarized_upto - offset, 0)
+        if cleared:
+            self._save_state()
+        older_end = max(len(history) - self.recent_messages, 0)
+        if older_end > start:
+            self._schedule(history, start, older_end, offset)
+
+        fixed = list(system_messages)
+        budget = self.token_budget - sum(message_tokens(m) for m in fixed) - message_tokens(history[-1])
+        tail = history[start:-1]
+
+        summary_message = None
+        if summary:
+            summary_message = {"role": "system", "content": f"Summary of the earlier conversation: {summary}"}
+            budget -= message_tokens(summary_message)
+
+        kept = []
+        for message in reversed(tail):
+            cost = message_tokens(message)
+            if cost > budget:
+                break
+            kept.append(message)
+            budget -= cost
+        kept.reverse()
+        trimmed = len(tail) - len(kept)
+
+        if summary_message and budget < 0:
+            # Not even the summary fits next to the system prompt: keep its most recent part
+            keep_chars = max((message_tokens(summary_message) + budget) * 4, 0)
+            summary_message["content"] = summary_message["content"][-keep_chars:] if keep_chars else ""
+
+        prompt = fixed + ([summary_message] if summary_message and summary_message["content"] else []) + kept + [history[-1]]
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["trimmed_messages"] += trimmed
+            self._prompt_tokens.append(sum(message_tokens(m) for m in prompt))
+            self._history_tokens.append(sum(message_tokens(m) for m in history))
+        return prompt
+
+    def _schedule(self, history, start, older_end, offset):
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                return
+            backlog = [dict(m) for m in history[start:older_end]]
+            self._pending = self._executor.submit(self._refresh, backlog, offset + start)
+
+    def _next_batch(self, backlog, done):
+        """The messages after `done` that fit in one summarization call (at least one)."""
+        batch, tokens = [], 0
+        for message in backlog[done:]:
+            cost = message_tokens(message)
+            if batch and tokens + cost > self.batch_tokens:
+                break
+            batch.append(message)
+            tokens += cost
+        return batch
+
+    def _refresh(self, backlog, first):
+        """Fold `backlog` (message number `first` onwards) into the summary, one bounded batch at a time."""
+        done = 0
+        while done < len(backlog):
+            batch = self._next_batch(backlog, done)
+            with self._lock:
+                previous_summary = self.summary
+            began = time.perf_counter()
+            try:
+                summary = self.summarize(previous_summary, batch)
+            except Exception as e:
+                with self._lock:
+                    self.stats["summary_errors"] += 1
+                print(f"[ChatContext] Summary refresh failed: {e}")
+                return  # The next build() resumes from the last saved batch
+            done += len(batch)
+            with self._lock:
+                self.summary = summary
+                self.summarized_upto = first + done
+                self.stats["summaries"] += 1
+                self._summary_latency.append(time.perf_counter() - began)
+            self._save_state()
+
+    def wait(self, timeout=None):
+        """Block until the pending summary refresh (if any) finished. For tests and benchmarks."""
+        pending = self._pending
+        if pending is not None:
+            pending.result(timeout)
+
+    def record_latency(self, seconds):
+        """Wall time of the chat call this prompt was used for."""
+        with self._lock:
+            self._latency.append(seconds)
+
+    def metrics(self):
+        def p95(samples):
+            ordered = sorted(samples)
+            return ordered[int(round(0.95 * (len(ordered) - 1)))]
+
+        with self._lock:
+            out = {**self.stats, "summarized_messages": self.summarized_upto,
+                   "summary_tokens": estimate_tokens(self.summary) if self.summary else 0}
+            if self._prompt_tokens:
+                out["prompt_tokens_last"] = self._prompt_tokens[-1]
+                out["prompt_tokens_p50"] = statistics.median(self._prompt_tokens)
+                out["prompt_tokens_max"] = max(self._prompt_tokens)
+                out["history_tokens_last"] = self._history_tokens[-1]
+            if self._latency:
+                out["latency_p50_ms"] = statistics.median(self._latency) * 1000
+                out["latency_p95_ms"] = p95(self._latency) * 1000
+            if self._summary_latency:
+                out["summary_p50_ms"] = statistics.median(self._summary_latency) * 1000
+            return out
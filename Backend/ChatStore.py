@@ -0,0 +1,196 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+ChatLogFile = env_vars.get("ChatLogFile", os.path.join("Data", "ChatLog.jsonl"))
+ChatLogLegacyFile = os.path.join("Data", "ChatLog.json")
+ChatLogMaxMessages = int(env_vars.get("ChatLogMaxMessages", 2000))   # kept in the live log
+ChatFsyncEvery = int(env_vars.get("ChatFsyncEvery", 8))               # messages between fsyncs
+ChatFsyncInterval = float(env_vars.get("ChatFsyncInterval", 2.0))     # seconds between fsyncs
+
+
+class ChatStore:
+    """
+    Append-only JSONL chat history with the working set in memory.
+
+    Each message is one line; appending costs one write regardless of how
+    long the history is. Lines are flushed immediately but fsynced in
+    batches (every `fsync_every` messages or `fsync_interval` seconds, and
+    on close). The file is read lazily on first use; a legacy ChatLog.json
+    is imported once. When the log grows past 1.5x `max_messages` a
+    background compaction moves everything but the newest `max_messages`
+    to `<path>.archive` and atomically replaces the live file. A torn last
+    line (crash mid-write) is skipped on load.
+    """
+
+    def __init__(self, path=ChatLogFile, legacy_path=ChatLogLegacyFile, max_messages=ChatLogMaxMessages,
+                 fsync_every=ChatFsyncEvery, fsync_interval=ChatFsyncInterval):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.max_messages = max_messages
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._messages = None
+        self._file = None
+        self._lines = 0            # lines in the live file
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._compacting = False
+        self.archived = 0          # messages in the archive (counted on load, so stable across restarts)
+        self._lock = threading.RLock()
+        self.stats = {"appends": 0, "fsyncs": 0, "compactions": 0, "skipped_lines": 0, "imported": 0}
+
+    def _load(self):
+        if self._messages is not None:
+            return
+        messages = []
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        messages.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        self.stats["skipped_lines"] += 1
+            self._lines = len(messages)
+        elif self.legacy_path and os.path.exists(self.legacy_path):
+            messages = self._import_legacy()
+        self.archived = self._count_lines(self.path + ".archive")
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._file.tell() and not self._ends_with_newline():
+            self._file.write("\n")  # Seal a torn last line so the next append starts clean
+            self._file.flush()
+        self._messages = messages
+
+    @staticmethod
+    def _count_lines(path):
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                count += block.count(b"\n")
+        return count
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _import_legacy(self):
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                messages = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[ChatStore] Could not import {self.legacy_path}: {e}")
+            return []
+        if not isinstance(messages, list):
+            return []
+        self._write_all(self.path, messages)
+        self._lines = len(messages)
+        self.stats["imported"] = len(messages)
+        return messages
+
+    @staticmethod
+    def _write_all(path, messages):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def messages(self):
+        """The in-memory history (a copy of the list; the dicts are shared)."""
+        with self._lock:
+            self._load()
+            return list(self._messages)
+
+    def snapshot(self):
+        """(archived, messages): history[0] is message number `archived` of the whole conversation."""
+        with self._lock:
+            self._load()
+            return self.archived, list(self._messages)
+
+    def append(self, *messages):
+        """Append messages ({"role", "content"}) in one write."""
+        with self._lock:
+            self._load()
+            self._file.write("".join(json.dumps(m, ensure_ascii=False) + "\n" for m in messages))
+            self._file.flush()
+            self._messages.extend(messages)
+            self._lines += len(messages)
+            self._unsynced += len(messages)
+            self.stats["appends"] += len(messages)
+            if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+            if self._lines > self.max_messages * 1.5 and not self._compacting:
+                self._compacting = True
+                threading.Thread(target=self.compact, daemon=True, name="chatlog-compact").start()
+
+    def _sync(self):
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.stats["fsyncs"] += 1
+
+    def compact(self):
+        """Archive all but the newest max_messages and rewrite the live log."""
+        try:
+            with self._lock:
+                self._load()
+                overflow = len(self._messages) - self.max_messages
+                if overflow <= 0:
+                    return
+                archived, kept = self._messages[:overflow], self._messages[overflow:]
+                with open(self.path + ".archive", "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(m, ensure_ascii=False) + "\n" for m in archived))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._file.close()
+                self._write_all(self.path, kept)
+                self._file = open(self.path, "a", encoding="utf-8")
+                self._messages = kept
+                self._lines = len(kept)
+                self._unsynced = 0
+                self.archived += overflow
+                self.stats["compactions"] += 1
+        except OSError as e:
+            print(f"[ChatStore] Compaction failed: {e}")
+        finally:
+            self._compacting = False
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+                self._messages = None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_chat_store():
+    """The process-wide chat log shared by ChatBot and RealtimeSearchEngine."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ChatStore()
+            atexit.register(_store.close)
+        return _store
@@ -1,9 +1,11 @@
-import json  # Ensure the import is used
-from json import load, dump
 from dotenv import dotenv_values
 import requests
 import datetime
-from groq import Groq
+import time
+from Backend.LLMGateway import get_gateway
+from Backend.ChatContext import ChatContext, ChatSummaryFile
+from Backend.ChatStore import get_chat_store
+from Backend.SpeechStream import strip_tag
 
 import os
 
@@ -13,11 +15,7 @@ env_vars = dotenv_values(env_path)
 
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
-GroqAPIKey = env_vars.get("GroqAPIKey")
 
-client = Groq(api_key=GroqAPIKey)
-
-messages = []
 
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which also has real-time up-to-date information from the internet.
 *** Do not tell time until I ask, do not talk too much, just answer the question.***
@@ -29,16 +27,8 @@ SystemChatBot = [
     {"role": "system", "content": System}
 ]
 
-try:
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-except FileNotFoundError:
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump([], f)
-except json.JSONDecodeError:
-    print("ChatLog.json is empty or corrupted. Initializing with an empty list.")
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump([], f)
+# Last few turns verbatim + rolling summary of the rest, within a token budget
+chat_context = ChatContext(state_path=ChatSummaryFile)
 
 def RealtimeInformation():
     current_date_time = datetime.datetime.now()
@@ -61,18 +51,19 @@ def AnswerModifier(Answer):
     modified_answer = '\n'.join(non_empty_lines)
     return modified_answer
 
-def ChatBot(Query):
-    """ This function sends the user's query to the chatbot and returns the AI's response """
+def ChatBotStream(Query):
+    """ Yields the AI's response chunk by chunk as it is generated; the chat log is saved once it is complete """
 
+    Answer = ""
     try:
-        with open(r"Data\ChatLog.json", "r") as f:
-            messages = load(f)
+        offset, messages = get_chat_store().snapshot()
+        question = {"role": "user", "content": f"{Query}"}
+        messages.append(question)
 
-        messages.append({"role": "user", "content": f"{Query}"})
-
-        completion = client.chat.completions.create(
+        started = time.perf_counter()
+        completion = get_gateway().chat("chat",
             model="llama-3.3-70b-versatile",
-            messages=SystemChatBot + [{"role": "system", "content": RealtimeInformation()}] + messages,
+            messages=chat_context.build(SystemChatBot + [{"role": "system", "content": RealtimeInformation()}], messages, offset),
             max_tokens=1024,
             temperature=0.7,
             top_p=1,
@@ -80,38 +71,34 @@ def ChatBot(Query):
             stop=None
         )
 
-        Answer = ""
-
-        for chunk in completion:
-            if chunk.choices[0].delta.content:
-                Answer += chunk.choices[0].delta.content
-
-        Answer = Answer.replace("</s>", "")
+        for content in strip_tag(chunk.choices[0].delta.content or "" for chunk in completion):
+            Answer += content
+            yield content
 
-        messages.append({"role": "assistant", "content": Answer})
-
-        with open(r"Data\ChatLog.json", "w") as f:
-            dump(messages, f, indent=4)
-
-        return Answer  # Return the answer to the main function
+        chat_context.record_latency(time.perf_counter() - started)
+        # One appended line per message; the log is never rewritten here
+        get_chat_store().append(question, {"role": "assistant", "content": Answer})
 
     except requests.exceptions.RequestException as e:
         print(f"Connection error: {e}")
         with open("error_log.txt", "w") as log:
             log.write(f"Connection error: {e}")
-        with open(r"Data\ChatLog.json", "w") as f:
-            dump([], f, indent=4)
-        return "Connection error, please try again."
+        if not Answer:  # Never appended to an answer that is already being spoken
+            yield "Connection error, please try again."
     except Exception as e:
         print(f"Error: {e}")
         with open("error_log.txt", "w") as log:
             log.write(f"Error: {e}")
-        with open(r"Data\ChatLog.json", "w") as f:
-            dump([], f, indent=4)
-        return "An error occurred, please try again."
+        if not Answer:
+            yield "An error occurred, please try again."
+
+def ChatBot(Query):
+    """ This function sends the user's query to the chatbot and returns the AI's response """
+    return "".join(ChatBotStream(Query))  # Return the answer to the main function
 
 if __name__ == "__main__":
     while True:
         user_input = input("Enter Your Question: ")
         response = ChatBot(user_input)
-        print(response)  # Print the response to the user
\ No newline at end of file
+        print(response)  # Print the response to the user
+        print(f"[ChatContext] {chat_context.metrics()}")
\ No newline at end of file
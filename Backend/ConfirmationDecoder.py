@@ -0,0 +1,169 @@
+import audioop
+import os
+import tempfile
+import threading
+import statistics
+from dataclasses import dataclass
+from typing import Optional
+
+import speech_recognition as sr
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+ConfirmationMode = env_vars.get("ConfirmationMode", "keyword")            # "keyword" or "transcribe"
+KeywordThreshold = float(env_vars.get("KeywordThreshold", 1e-20))       # PocketSphinx kws threshold; spotted words only cancel
+
+# STRICT MATCHING (shared with Automation.wait_for_user_confirmation)
+YES_WORDS = ["yes", "yeah", "yep", "sure", "ok", "okay", "confirm", "send", "proceed", "correct", "right"]
+NO_WORDS = ["no", "nope", "cancel", "stop", "abort", "don't", "wrong", "wait"]
+
+SPOTTER_RATE = 16000  # The bundled en-US acoustic model expects 16 kHz
+
+
+@dataclass
+class ConfirmationResult:
+    decision: Optional[str]  # "yes", "no" or None (nothing usable heard)
+    path: str                # "keyword", "fallback" or "timeout"
+    text: str = ""
+    confidence: float = 0.0
+    margin: float = 0.0
+    latency_ms: float = 0.0  # Speech onset -> decision
+
+
+def classify_text(text):
+    """Full-transcript fallback: the original substring rules, NO checked first (safe default)."""
+    normalized = (text or "").lower()
+    if any(word in normalized for word in NO_WORDS):
+        return "no"
+    if any(word in normalized for word in YES_WORDS):
+        return "yes"
+    return None
+
+
+class ConfirmationDecoder:
+    """
+    Turns the running list of spotted keywords into an early NO.
+
+    Any spotted NO word cancels at once, the same rule classify_text applies
+    to transcripts. A YES sends a message, and the spotter runs with a loose
+    threshold and never sees a transcript, so it is never taken from the
+    keywords alone: it is only accepted once the full-transcript fallback
+    agrees.
+    """
+
+    def __init__(self, yes_words=YES_WORDS, no_words=NO_WORDS):
+        self.yes_words = set(yes_words)
+        self.no_words = set(no_words)
+
+    def score(self, words):
+        """Returns (label, confidence, margin) for the keywords spotted so far; any NO labels it "no"."""
+        yes = sum(1 for w in words if w in self.yes_words)
+        no = sum(1 for w in words if w in self.no_words)
+        total = yes + no
+        if total == 0:
+            return None, 0.0, 0.0
+        label = "no" if no else "yes"
+        return label, max(yes, no) / total, abs(yes - no) / total
+
+    def update(self, words):
+        """
+        Feed the keywords spotted so far.
+        Returns (decision, confidence, margin); decision is "no" or None (YES needs the transcript).
+        """
+        label, confidence, margin = self.score(words)
+        if label == "no":
+            return label, confidence, margin
+        return None, confidence, margin
+
+
+class KeywordSpotter:
+    """
+    Streaming PocketSphinx keyword search over the confirmation vocabulary.
+    Audio is fed block by block while the user is still speaking; the decoder
+    (and its acoustic model) is loaded once per process.
+    """
+
+    def __init__(self, keywords=None, threshold=KeywordThreshold, language="en-US"):
+        self.keywords = keywords or (YES_WORDS + NO_WORDS)
+        self.threshold = threshold
+        self.language = language
+        self._decoder = None
+        self._rate_state = None
+        self._samplerate = SPOTTER_RATE
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        with self._lock:
+            if self._decoder is not None:
+                return self._decoder
+            try:
+                from pocketsphinx import Config, Decoder
+            except ImportError:
+                raise sr.RequestError("missing PocketSphinx module: ensure that PocketSphinx is set up correctly.")
+
+            data_dir = os.path.join(os.path.dirname(sr.__file__), "pocketsphinx-data", self.language)
+            if not os.path.isdir(data_dir):
+                raise sr.RequestError(f"missing PocketSphinx language data directory: \"{data_dir}\"")
+
+            with tempfile.NamedTemporaryFile("w", suffix=".kws", delete=False) as f:
+                f.writelines(f"{word} /{self.threshold:g}/\n" for word in self.keywords)
+                kws_path = f.name
+            try:
+                config = Config(
+                    hmm=os.path.join(data_dir, "acoustic-model"),
+                    dict=os.path.join(data_dir, "pronounciation-dictionary.dict"),
+                    kws=kws_path,
+                    samprate=SPOTTER_RATE,
+                    logfn=os.devnull
+                )
+                self._decoder = Decoder(config)
+            finally:
+                os.remove(kws_path)
+            return self._decoder
+
+    def start(self, samplerate):
+        self.warm_up().start_utt()
+        self._samplerate = samplerate
+        self._rate_state = None
+
+    def feed(self, block):
+        """Feed int16 mono samples; returns every keyword spotted so far in this utterance."""
+        raw = block.tobytes()
+        if self._samplerate != SPOTTER_RATE:
+            raw, self._rate_state = audioop.ratecv(raw, 2, 1, self._samplerate, SPOTTER_RATE, self._rate_state)
+        self._decoder.process_raw(raw, False, False)
+        return self._words()
+
+    def finish(self):
+        self._decoder.end_utt()
+        return self._words()
+
+    def _words(self):
+        hyp = self._decoder.hyp()
+        return hyp.hypstr.split() if hyp and hyp.hypstr else []
+
+
+class DecisionStats:
+    """Decision latency per path, so the keyword path can be compared with full recognition."""
+
+    def __init__(self):
+        self._latencies = {}
+        self._lock = threading.Lock()
+
+    def record(self, result):
+        with self._lock:
+            self._latencies.setdefault(result.path, []).append(result.latency_ms)
+
+    def summary(self):
+        with self._lock:
+            return {
+                path: {
+                    "count": len(samples),
+                    "p50_ms": statistics.median(samples),
+                    "max_ms": max(samples),
+                }
+                for path, samples in self._latencies.items() if samples
+            }
+
+
+decision_stats = DecisionStats()
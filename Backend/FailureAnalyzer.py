@@ -1,9 +1,16 @@
 from Backend.MemoryManager import MemoryManager
+from Backend.FailureIndex import FailureIndex
 import datetime
 
+ESCALATE_AT = 3  # Recent (time-decayed) failures of a goal type before we stop retrying
+
 class FailureAnalyzer:
     def __init__(self):
         self.memory = MemoryManager()
+        self.index = FailureIndex(store=self.memory.store)
+        if not self.index.loaded:
+            # First run with the index: count what the failure log already holds, once
+            self.index.bootstrap(self.memory._failures_view())
 
     def analyze_failure(self, goal_type, context, failure_stage, failure_reason):
         """
@@ -21,6 +28,8 @@ class FailureAnalyzer:
         }
         
         self.memory.record_failure(failure_record)
+        failure_count, recent_failures = self.index.record(goal_type, failure_reason)
+        recent_failures = round(recent_failures, 1)
         
         # STAGE 4: DIAGNOSTIC LOGIC
         reason_lower = failure_reason.lower()
@@ -38,28 +47,26 @@ class FailureAnalyzer:
         elif "logic" in reason_lower or "unknown" in reason_lower:
              correction = "ABORT"
 
-        # Escalation based on history
-        past_failures = self.memory.get_failures_by_goal(goal_type)
-        failure_count = len(past_failures)
-        
-        if failure_count >= 3:
+        # Escalation based on recent history (old failures decay away)
+        if recent_failures >= ESCALATE_AT:
             correction = "ABORT"
             
         print(f"[FailureAnalyzer] Diagnosis: {failure_reason} -> {correction}")
 
         return {
             "correction": correction,
-            "risk_modifier": 0.2 * failure_count,
+            "risk_modifier": 0.2 * recent_failures,
             "recommendation": correction, # Legacy compatibility
-            "failure_count": failure_count
+            "failure_count": failure_count,
+            "recent_failures": recent_failures
         }
 
     def get_learning_context(self, goal_type):
         """
         Returns a summary of past failures to guide the Planner.
         """
-        failures = self.memory.get_failures_by_goal(goal_type)
-        if not failures:
+        failure_count = self.index.count(goal_type)
+        if not failure_count:
             return None
             
-        return f"WARNING: This goal ('{goal_type}') has failed {len(failures)} times previously. Reasons: {', '.join([f['failure_reason'] for f in failures[-3:]])}."
+        return f"WARNING: This goal ('{goal_type}') has failed {failure_count} times previously. Reasons: {', '.join(self.index.reasons(goal_type, 3))}."
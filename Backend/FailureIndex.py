@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+FAILURE_INDEX = "memory/failure_index.json"
+FAILURE_HALF_LIFE = 7 * 24 * 3600   # Seconds for a failure to count half as much
+RECENT_REASONS = 10                 # Failure reasons kept per goal type
+INDEX_GOALS = 1024                  # Goal types kept (LRU)
+
+
+class FailureIndex:
+    """
+    Per-goal-type failure counters, maintained as failures are recorded.
+
+    For every goal type it keeps the lifetime count, an exponentially
+    time-decayed count (each failure weighs 1 when it happens and half as
+    much every `half_life` seconds after) and the last few reasons in a
+    bounded deque, so nothing ever rescans the failure log. The index is
+    persisted next to it (JSON file, or the `failure_index` namespace of
+    the MemoryStore, one key per goal type).
+    """
+
+    def __init__(self, path=FAILURE_INDEX, store=None, half_life=FAILURE_HALF_LIFE, clock=time.time):
+        self.path = path
+        self.store = store
+        self.half_life = half_life
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._goals = OrderedDict()   # goal_type -> {"count", "score", "updated", "reasons"}
+        self.loaded = self._load()
+
+    def _load(self):
+        if self.store is not None:
+            raw = self.store.items("failure_index")
+        elif os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"[FailureIndex] Ignoring {self.path}: {e}")
+                return False
+        else:
+            return False
+        for goal_type, entry in sorted(raw.items(), key=lambda item: item[1].get("updated", 0)):
+            self._goals[goal_type] = {"count": entry["count"], "score": entry["score"], "updated": entry["updated"],
+                                      "reasons": deque(entry["reasons"], maxlen=RECENT_REASONS)}
+        return True
+
+    def _save(self, goal_type):
+        def encode(entry):
+            return {**entry, "reasons": list(entry["reasons"])}
+
+        if self.store is not None:
+            self.store.put("failure_index", goal_type, encode(self._goals[goal_type]))
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({goal: encode(entry) for goal, entry in self._goals.items()}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[FailureIndex] Save failed: {e}")
+
+    def _decayed(self, entry, now):
+        age = max(now - entry["updated"], 0.0)
+        return entry["score"] * 0.5 ** (age / self.half_life)
+
+    def _add(self, goal_type, reason, ts):
+        entry = self._goals.get(goal_type)
+        if entry is None:
+            entry = self._goals[goal_type] = {"count": 0, "score": 0.0, "updated": ts,
+                                              "reasons": deque(maxlen=RECENT_REASONS)}
+            if len(self._goals) > INDEX_GOALS:
+                evicted, _ = self._goals.popitem(last=False)
+                if self.store is not None:
+                    self.store.delete("failure_index", evicted)
+        else:
+            self._goals.move_to_end(goal_type)
+        entry["score"] = self._decayed(entry, ts) + 1.0
+        entry["updated"] = max(entry["updated"], ts)
+        entry["count"] += 1
+        entry["reasons"].append(reason)
+        return entry
+
+    def record(self, goal_type, reason, ts=None):
+        """Count one failure; returns (lifetime count, decayed count)."""
+        now = self.clock() if ts is None else ts
+        with self._lock:
+            entry = self._add(goal_type, reason, now)
+            self._save(goal_type)
+            return entry["count"], entry["score"]
+
+    def bootstrap(self, failures):
+        """Build the index from an existing failure log (records with goal_type / failure_reason / timestamp)."""
+        with self._lock:
+            for failure in failures:
+                try:
+                    ts = datetime.fromisoformat(failure["timestamp"]).timestamp()
+                except (KeyError, TypeError, ValueError):
+                    ts = self.clock()
+                self._add(failure.get("goal_type"), failure.get("failure_reason", ""), ts)
+            if self.store is not None:
+                self.store.put_many("failure_index", {goal: {**entry, "reasons": list(entry["reasons"])}
+                                                      for goal, entry in self._goals.items()})
+            elif self._goals:
+                self._save(next(iter(self._goals)))
+        self.loaded = True
+
+    def count(self, goal_type):
+        with self._lock:
+            entry = self._goals.get(goal_type)
+            return entry["count"] if entry else 0
+
+    def recent_count(self, goal_type, now=None):
+        """Failures of this goal type, each weighted by how long ago it happened."""
+        with self._lock:
+            entry = self._goals.get(goal_type)
+            return self._decayed(entry, self.clock() if now is None else now) if entry else 0.0
+
+    def reasons(self, goal_type, k=3):
+        """The last `k` failure reasons, oldest first."""
+        with self._lock:
+            entry = self._goals.get(goal_type)
+            return list(entry["reasons"])[-k:] if entry else []
@@ -27,6 +27,28 @@ class GSOAdapter:
         # This method accepts Goal/Strategy.
         return []
 
+    @staticmethod
+    def convert_to_plan(goal: Goal, strategy: Strategy):
+        """
+        convert_to_commands as a Planner-shaped plan, so it can go through the
+        Verifier and plan_to_commands unchanged. None when the strategy is not
+        covered (or its goal is incomplete) and the Planner is needed.
+        """
+        try:
+            commands = GSOAdapter.convert_to_commands(goal, strategy)
+        except ValueError:
+            return None
+        if not commands:
+            return None
+
+        steps = []
+        for command in commands:
+            action, _, target = command.partition(" ")
+            if target in ("", "None"):
+                return None
+            steps.append({"action": action, "target": target})
+        return {"plan": steps, "success_criteria": None}
+
     @staticmethod
     def plan_to_commands(plan: list[dict]) -> list[str]:
         """
@@ -13,6 +13,7 @@ from Backend.StrategySelector import StrategySelector
 from Backend.OutcomeManager import OutcomeManager
 from Backend.ImageGeneration import GenerateImages
 from Backend.GSOAdapter import GSOAdapter
+from Backend.PlanCache import PlanCache
 from Backend.outcomes import Outcome
 from Backend.GoalDecomposer import GoalDecomposer
 from Backend.Subgoal import Subgoal
@@ -37,6 +38,7 @@ class GoalManager:
         # v4.0 Context Engine (The New Brain)
         from Backend.ContextEngine import ContextEngine
         self.context_engine = ContextEngine()
+        self.plan_cache = PlanCache()
         
         # v4.0 Expectation Model (Updated)
         # Assuming Verifier has it, but we might need it for direct context updates or checking
@@ -66,7 +68,8 @@ class GoalManager:
     from Backend.GoalDecomposer import GoalDecomposer
     from Backend.Subgoal import Subgoal
     
-    def execute_goal(self, goal_id):
+    def execute_goal(self, goal_id, prepared=None):
+        """`prepared` is an optional (goal, strategy) already derived from the description."""
         goal_record = self.active_goals.get(goal_id)
         if not goal_record:
             return "Goal not found"
@@ -75,7 +78,11 @@ class GoalManager:
         
         from Backend.contracts import Goal # Import if not top-level
         
-        derived_goal = self.goal_extractor.extract_goal(goal_record["description"])
+        prepared_strategy = None
+        if prepared:
+            derived_goal, prepared_strategy = prepared
+        else:
+            derived_goal = self.goal_extractor.extract_goal(goal_record["description"])
         print(f"[GSO] Goal Extracted: {derived_goal}")
 
         # --- PART 2: CONTENT GOALS BYPASS AUTOMATION ENTIRELY ---
@@ -177,8 +184,11 @@ class GoalManager:
             # Treat Subgoal as a mini-Goal for Strategy Selection
             sub_derived_goal = self.goal_extractor.extract_goal(subgoal.description)
             
-            # Strategy Selection
-            strategy = self.strategy_selector.select_strategy(sub_derived_goal)
+            # Strategy Selection (selection only depends on the goal name)
+            if prepared_strategy and len(subgoals) == 1 and sub_derived_goal.name == derived_goal.name:
+                strategy = prepared_strategy
+            else:
+                strategy = self.strategy_selector.select_strategy(sub_derived_goal)
             
             if strategy.confidence < 0.3:
                  print(f"[GoalManager] Low confidence for subgoal '{subgoal.description}'.")
@@ -192,6 +202,7 @@ class GoalManager:
             while attempts <= max_retries:
                 attempts += 1
                 outcome = None
+                context = None
                 
                 try:
                     # Execute using Strategy
@@ -199,18 +210,10 @@ class GoalManager:
                     # Planner takes Goal/Strategy.
                     context = self.context_engine.get_context()
                     
-                    # We skip full "Planner.py" for simple subgoals? 
-                    # Prompt says "Execute".
-                    # Existing pipeline: Plan -> Automate.
-                    # We should maintain it for consistency.
-                    
-                    plan = generate_plan(
-                        subgoal.description,
-                        context=context,
-                        goal_obj=sub_derived_goal,
-                        strategy_obj=strategy
-                    )
-                    
+                    # Existing pipeline: Plan -> Verify -> Automate.
+                    # Strict strategies get their plan from GSOAdapter, the rest from the plan cache or Planner.
+                    plan = self._plan_subgoal(subgoal, sub_derived_goal, strategy, context)
+
                     # Verify Plan (Quick check)
                     # Skip full verification for speed? Or keep safety?
                     # Keep safety.
@@ -236,6 +239,7 @@ class GoalManager:
 
                 except Exception as e:
                     print(f"[GoalManager] Subgoal Failed: {e}")
+                    self.plan_cache.invalidate(sub_derived_goal, strategy, context)
                     
                     # DIAGNOSIS & CORRECTION
                     analysis = self.failure_analyzer.analyze_failure(
@@ -291,6 +295,13 @@ class GoalManager:
         goal_record["state"] = "completed" if overall_success else "failed"
         return "Goal Completed" if overall_success else "Goal Failed"
 
+    def _plan_subgoal(self, subgoal, goal, strategy, context):
+        """Deterministic GSO plan if the strategy is covered, else cached or freshly generated Planner output."""
+        return self.plan_cache.plan(
+            goal, strategy, context,
+            lambda: generate_plan(subgoal.description, context=context, goal_obj=goal, strategy_obj=strategy)
+        )
+
     def _log_failure(self, goal, strategy, outcome, retries):
         import json
         import os
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+LLMCassette = env_vars.get("LLMCassette", "off")                       # off | record | replay
+LLMCassetteDir = env_vars.get("LLMCassetteDir", os.path.join("Data", "llm_cassette"))
+CassetteLatencyMs = env_vars.get("CassetteLatencyMs", "recorded")      # "recorded" or a fixed number of ms
+CassetteChunkMs = env_vars.get("CassetteChunkMs", "recorded")          # gap between streamed chunks
+
+# Prompt fragments that change on every call (clock, date) and must not change the key
+VOLATILE_PATTERNS = [
+    re.compile(r"^(Day|Date|Month|Year|Time):.*$", re.MULTILINE),
+]
+
+
+class CassetteMiss(KeyError):
+    """Replay mode and nothing was recorded for this request."""
+
+
+def _stable(text):
+    for pattern in VOLATILE_PATTERNS:
+        text = pattern.sub(r"\1: *", text)
+    return text
+
+
+def cassette_key(provider, kwargs):
+    """sha256 of the provider, model and messages (volatile clock lines masked)."""
+    if provider == "groq":
+        payload = [{"role": m["role"], "content": _stable(m.get("content") or "")} for m in kwargs.get("messages", [])]
+    else:
+        payload = {"message": _stable(kwargs.get("message", "")), "preamble": _stable(kwargs.get("preamble") or ""),
+                   "chat_history": kwargs.get("chat_history")}
+    blob = json.dumps([provider, kwargs.get("model"), payload], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _as_ms(value):
+    return None if value in (None, "", "recorded") else float(value)
+
+
+class Cassette:
+    """
+    Record/replay store for LLM responses, used by LLMGateway.
+
+    In record mode every successful Groq / Cohere call is written to
+    `<dir>/<key>.json` with its text, streamed chunks, token usage and
+    timings. In replay mode the same request is answered from disk without
+    touching the network: `latency_ms` (time to the response, or to the
+    first chunk when streaming) and `chunk_ms` (gap between chunks) are
+    either fixed or, when None, the recorded timings. A request that was
+    never recorded raises CassetteMiss.
+    """
+
+    def __init__(self, path=LLMCassetteDir, mode=LLMCassette, latency_ms=_as_ms(CassetteLatencyMs),
+                 chunk_ms=_as_ms(CassetteChunkMs)):
+        self.path = path
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.chunk_ms = chunk_ms
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "recorded": 0}
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.json")
+
+    def load(self, provider, kwargs):
+        key = cassette_key(provider, kwargs)
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            with self._lock:
+                self.stats["misses"] += 1
+            raise CassetteMiss(f"no {provider} recording for model {kwargs.get('model')} ({key[:12]})")
+        with self._lock:
+            self.stats["hits"] += 1
+        return entry
+
+    def save(self, provider, kwargs, entry):
+        key = cassette_key(provider, kwargs)
+        entry = {"provider": provider, "model": kwargs.get("model"), "recorded_at": time.time(), **entry}
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            tmp = self._file(key) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self._file(key))
+        except OSError as e:
+            print(f"[LLMCassette] Could not record {key[:12]}: {e}")
+            return
+        with self._lock:
+            self.stats["recorded"] += 1
+
+    # --- Recording -------------------------------------------------------
+
+    def record_completion(self, kwargs, completion, latency):
+        usage = getattr(completion, "usage", None)
+        self.save("groq", kwargs, {
+            "content": completion.choices[0].message.content,
+            "chunks": None,
+            "usage": {"prompt_tokens": getattr(usage, "prompt_tokens", 0),
+                      "completion_tokens": getattr(usage, "completion_tokens", 0)},
+            "latency": latency, "ttft": None, "chunk_offsets": None,
+        })
+
+    def record_stream(self, kwargs, chunks, offsets, usage, latency):
+        """`offsets` are the arrival times of `chunks`, in seconds from the start of the call."""
+        self.save("groq", kwargs, {
+            "content": "".join(chunks),
+            "chunks": chunks,
+            "usage": {"prompt_tokens": getattr(usage, "prompt_tokens", 0),
+                      "completion_tokens": getattr(usage, "completion_tokens", 0)},
+            "latency": latency, "ttft": offsets[0] if offsets else None, "chunk_offsets": offsets,
+        })
+
+    def record_cohere(self, kwargs, response, latency):
+        units = getattr(getattr(response, "meta", None), "billed_units", None)
+        self.save("cohere", kwargs, {
+            "content": response.text,
+            "chunks": None,
+            "usage": {"prompt_tokens": int(getattr(units, "input_tokens", 0) or 0),
+                      "completion_tokens": int(getattr(units, "output_tokens", 0) or 0)},
+            "latency": latency, "ttft": None, "chunk_offsets": None,
+        })
+
+    # --- Replay ----------------------------------------------------------
+
+    def _delay(self, configured_ms, recorded_s):
+        if configured_ms is not None:
+            return configured_ms / 1000
+        return recorded_s or 0.0
+
+    def replay_completion(self, kwargs):
+        """A ChatCompletion look-alike, or a chunk iterator when kwargs has stream=True."""
+        entry = self.load("groq", kwargs)
+        usage = SimpleNamespace(**entry["usage"])
+        if kwargs.get("stream"):
+            return self._replay_stream(entry, usage)
+
+        time.sleep(self._delay(self.latency_ms, entry.get("latency")))
+        message = SimpleNamespace(role="assistant", content=entry["content"])
+        return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")],
+                               usage=usage, model=entry.get("model"))
+
+    def _replay_stream(self, entry, usage):
+        chunks = entry.get("chunks") or [entry["content"]]
+        offsets = entry.get("chunk_offsets") or [entry.get("latency") or 0.0] * len(chunks)
+        previous = 0.0
+        for i, (text, offset) in enumerate(zip(chunks, offsets)):
+            if i == 0:
+                time.sleep(self._delay(self.latency_ms, offset))
+            else:
+                time.sleep(self._delay(self.chunk_ms, max(offset - previous, 0.0)))
+            previous = offset
+            last = i == len(chunks) - 1
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(index=0, delta=SimpleNamespace(content=text),
+                                         finish_reason="stop" if last else None)],
+                x_groq=SimpleNamespace(usage=usage if last else None),
+            )
+
+    def replay_cohere(self, kwargs):
+        entry = self.load("cohere", kwargs)
+        time.sleep(self._delay(self.latency_ms, entry.get("latency")))
+        units = SimpleNamespace(input_tokens=entry["usage"]["prompt_tokens"],
+                                output_tokens=entry["usage"]["completion_tokens"])
+        return SimpleNamespace(text=entry["content"], meta=SimpleNamespace(billed_units=units))
+
+
+def cassette_from_env():
+    """The Cassette configured in .env, or None when LLMCassette is off."""
+    if LLMCassette not in ("record", "replay"):
+        return None
+    print(f"[LLMCassette] {LLMCassette} mode ({LLMCassetteDir})")
+    return Cassette()
@@ -0,0 +1,397 @@
+import hashlib
+import json
+import random
+import statistics
+import threading
+import time
+from collections import deque
+
+import httpx
+from dotenv import dotenv_values
+from groq import Groq, APIConnectionError
+
+from Backend.LLMCassette import cassette_from_env
+from Backend.LLMTelemetry import get_telemetry
+
+env_vars = dotenv_values(".env")
+GroqAPIKey = env_vars.get("GroqAPIKey")
+CohereAPIKey = env_vars.get("CohereAPIKey")
+GroqBaseURL = env_vars.get("GroqBaseURL")        # Override for a local stub server
+CohereBaseURL = env_vars.get("CohereBaseURL")
+LLMTimeout = float(env_vars.get("LLMTimeout", 30))           # Default per-call deadline (seconds)
+LLMMaxRetries = int(env_vars.get("LLMMaxRetries", 2))
+LLMMaxConcurrency = int(env_vars.get("LLMMaxConcurrency", 4))
+LLMRetryBackoff = float(env_vars.get("LLMRetryBackoff", 0.5))
+LLMSingleflight = env_vars.get("LLMSingleflight", "on") == "on"
+
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+LATENCY_WINDOW = 1000  # Samples kept per call site
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call (including retries) did not finish within its deadline."""
+
+
+def _retryable(error):
+    if isinstance(error, (APIConnectionError, httpx.TransportError)):
+        return True
+    status = getattr(error, "status_code", None)
+    return status in RETRY_STATUS
+
+
+class CallMetrics:
+    """
+    Latency, token and error counters per call site ("classifier", "chat", ...).
+    Every record is also written to `log` (an LLMTelemetry session log) if given.
+    """
+
+    def __init__(self, log=None):
+        self._lock = threading.Lock()
+        self._sites = {}
+        self.log = log
+
+    def _site(self, site):
+        if site not in self._sites:
+            self._sites[site] = {
+                "calls": 0, "errors": 0, "retries": 0, "coalesced": 0,
+                "prompt_tokens": 0, "completion_tokens": 0,
+                "latency": deque(maxlen=LATENCY_WINDOW), "ttft": deque(maxlen=LATENCY_WINDOW),
+            }
+        return self._sites[site]
+
+    def record(self, site, latency, retries=0, error=False, prompt_tokens=0, completion_tokens=0, ttft=None,
+               model=None, cache="miss"):
+        if self.log is not None:
+            self.log.record(site, model=model, latency=latency, ttft=ttft, prompt_tokens=prompt_tokens,
+                            completion_tokens=completion_tokens, retries=retries, error=error, cache=cache)
+        with self._lock:
+            s = self._site(site)
+            if cache == "coalesced":
+                s["coalesced"] += 1
+                return
+            s["calls"] += 1
+            s["errors"] += int(error)
+            s["retries"] += retries
+            s["prompt_tokens"] += prompt_tokens or 0
+            s["completion_tokens"] += completion_tokens or 0
+            s["latency"].append(latency)
+            if ttft is not None:
+                s["ttft"].append(ttft)
+
+    def summary(self):
+        def pct(samples, p):
+            ordered = sorted(samples)
+            return ordered[min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)] * 1000
+
+        with self._lock:
+            out = {}
+            for site, s in self._sites.items():
+                out[site] = {k: v for k, v in s.items() if not isinstance(v, deque)}
+                if s["latency"]:
+                    out[site]["p50_ms"] = statistics.median(s["latency"]) * 1000
+                    out[site]["p95_ms"] = pct(s["latency"], 95)
+                if s["ttft"]:
+                    out[site]["ttft_p50_ms"] = statistics.median(s["ttft"]) * 1000
+            return out
+
+
+def request_key(provider, kwargs):
+    """Identity of a request: provider, model, messages and every other parameter."""
+    blob = json.dumps([provider, kwargs], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Collapses identical concurrent calls: the first caller for a key runs
+    fn(), everyone who asks for the same key while it is in flight waits for
+    and shares its result (or exception). Nothing is cached afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.collapsed = 0
+
+    def do(self, key, fn, timeout=None):
+        """Returns (result, shared); shared is True for callers that did not run fn()."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise DeadlineExceeded(f"identical in-flight request did not finish within {timeout:.1f}s")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+
+class LLMGateway:
+    """
+    The one way out to Groq and Cohere.
+
+    All call sites share a single pooled keep-alive HTTP client and a global
+    concurrency semaphore. Every call gets a deadline that covers all of its
+    attempts; transient failures (connection errors, 429, 5xx) are retried a
+    bounded number of times with full-jitter exponential backoff. The SDKs'
+    own retries are disabled so the policy lives in one place.
+
+    chat(site, **kwargs) takes the arguments of client.chat.completions.create
+    and returns what it returns; with stream=True the returned iterator holds
+    the concurrency slot until it is exhausted or closed.
+
+    With a `cassette` (see LLMCassette) calls are either recorded to disk or
+    answered from it instead of the network, under the same slot and metrics.
+
+    Identical non-streaming requests (same model, messages and parameters)
+    made while one is already in flight share that upstream call
+    (singleflight); they are counted as "coalesced" per call site.
+    """
+
+    def __init__(self, api_key=GroqAPIKey, base_url=GroqBaseURL, cohere_api_key=CohereAPIKey,
+                 cohere_base_url=CohereBaseURL, timeout=LLMTimeout, max_retries=LLMMaxRetries,
+                 max_concurrency=LLMMaxConcurrency, backoff=LLMRetryBackoff, cassette=None, telemetry=None,
+                 singleflight=LLMSingleflight):
+        self.timeout = timeout
+        self.singleflight = SingleFlight() if singleflight else None
+        self.cassette = cassette
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.metrics = CallMetrics(log=telemetry)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._http = httpx.Client(
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            limits=httpx.Limits(max_connections=max_concurrency * 2, max_keepalive_connections=max_concurrency,
+                                keepalive_expiry=120),
+        )
+        self.groq = Groq(api_key=api_key or "missing", base_url=base_url, http_client=self._http, max_retries=0)
+        self._cohere_api_key = cohere_api_key
+        self._cohere_base_url = cohere_base_url
+        self._cohere = None
+
+    @property
+    def cohere(self):
+        if self._cohere is None:
+            import cohere
+            kwargs = {"base_url": self._cohere_base_url} if self._cohere_base_url else {}
+            self._cohere = cohere.Client(api_key=self._cohere_api_key, httpx_client=self._http, **kwargs)
+        return self._cohere
+
+    def _call(self, site, fn, deadline, model=None):
+        """Runs fn(timeout) under the semaphore with retries. Returns (result, retries, start)."""
+        deadline = deadline or self.timeout
+        start = time.perf_counter()
+        end = start + deadline
+        retries = 0
+
+        if not self._semaphore.acquire(timeout=deadline):
+            self.metrics.record(site, time.perf_counter() - start, error=True, model=model, cache=self._cache_outcome())
+            raise DeadlineExceeded(f"[{site}] no LLM slot free within {deadline:.1f}s")
+        acquired = False    # True once the slot belongs to the caller (released after the result is used)
+        try:
+            while True:
+                remaining = end - time.perf_counter()
+                if remaining <= 0:
+                    raise DeadlineExceeded(f"[{site}] deadline of {deadline:.1f}s exceeded")
+                try:
+                    result = fn(remaining)
+                    acquired = True
+                    return result, retries, start
+                except Exception as e:
+                    if retries >= self.max_retries or not _retryable(e):
+                        raise
+                    pause = random.uniform(0, self.backoff * (2 ** retries))
+                    if time.perf_counter() + pause >= end:
+                        raise
+                    retries += 1
+                    print(f"[LLM] {site}: {type(e).__name__}, retry {retries}/{self.max_retries} in {pause:.2f}s")
+                    time.sleep(pause)
+        finally:
+            if not acquired:
+                self._semaphore.release()
+                self.metrics.record(site, time.perf_counter() - start, retries=retries, error=True, model=model,
+                                    cache=self._cache_outcome())
+
+    def _replaying(self):
+        return self.cassette is not None and self.cassette.mode == "replay"
+
+    def _recording(self):
+        return self.cassette is not None and self.cassette.mode == "record"
+
+    def _cache_outcome(self):
+        return "replay" if self._replaying() else "miss"
+
+    def _coalesced(self, site, provider, kwargs, deadline, call):
+        """call() directly, or through the singleflight group for identical in-flight requests."""
+        if self.singleflight is None:
+            return call()
+        start = time.perf_counter()
+        result, shared = self.singleflight.do(request_key(provider, kwargs), call, deadline or self.timeout)
+        if shared:
+            self.metrics.record(site, time.perf_counter() - start, model=kwargs.get("model"), cache="coalesced")
+        return result
+
+    def chat(self, site, deadline=None, **kwargs):
+        """Groq chat completion for call site `site` (see class docstring)."""
+        if kwargs.get("stream"):
+            return self._chat(site, deadline, kwargs)
+        return self._coalesced(site, "groq", kwargs, deadline, lambda: self._chat(site, deadline, kwargs))
+
+    def _chat(self, site, deadline, kwargs):
+        if self._replaying():
+            create = lambda remaining: self.cassette.replay_completion(kwargs)
+        else:
+            create = lambda remaining: self.groq.chat.completions.create(timeout=remaining, **kwargs)
+        completion, retries, start = self._call(site, create, deadline, kwargs.get("model"))
+        if kwargs.get("stream"):
+            return self._stream(site, completion, retries, start, kwargs)
+
+        self._semaphore.release()
+        latency = time.perf_counter() - start
+        usage = getattr(completion, "usage", None)
+        self.metrics.record(site, latency, retries=retries,
+                            prompt_tokens=getattr(usage, "prompt_tokens", 0),
+                            completion_tokens=getattr(usage, "completion_tokens", 0),
+                            model=kwargs.get("model"), cache=self._cache_outcome())
+        if self._recording():
+            self.cassette.record_completion(kwargs, completion, latency)
+        return completion
+
+    def _stream(self, site, stream, retries, start, kwargs):
+        recorder = None
+        if self._recording():
+            recorder = lambda *args: self.cassette.record_stream(kwargs, *args)
+        return _GatewayStream(self, site, stream, retries, start, recorder, kwargs.get("model"))
+
+    def cohere_chat(self, site, deadline=None, **kwargs):
+        """Cohere co.chat() for call site `site`, same policy as chat()."""
+        return self._coalesced(site, "cohere", kwargs, deadline, lambda: self._cohere_chat(site, deadline, kwargs))
+
+    def _cohere_chat(self, site, deadline, kwargs):
+        def call(remaining):
+            if self._replaying():
+                return self.cassette.replay_cohere(kwargs)
+            return self.cohere.chat(request_options={"timeout_in_seconds": max(int(remaining), 1), "max_retries": 0},
+                                    **kwargs)
+
+        response, retries, start = self._call(site, call, deadline, kwargs.get("model"))
+        self._semaphore.release()
+        latency = time.perf_counter() - start
+        units = getattr(getattr(response, "meta", None), "billed_units", None)
+        self.metrics.record(site, latency, retries=retries,
+                            prompt_tokens=int(getattr(units, "input_tokens", 0) or 0),
+                            completion_tokens=int(getattr(units, "output_tokens", 0) or 0),
+                            model=kwargs.get("model"), cache=self._cache_outcome())
+        if self._recording():
+            self.cassette.record_cohere(kwargs, response, latency)
+        return response
+
+    def warm_up(self):
+        """Open a pooled connection ahead of the first real call."""
+        if self._replaying():
+            return
+        self.groq.models.list(timeout=min(self.timeout, 5.0))
+
+    def close(self):
+        self._http.close()
+
+
+class _GatewayStream:
+    """Streamed completion that gives its concurrency slot back exactly once: when exhausted, closed or collected."""
+
+    def __init__(self, gateway, site, stream, retries, start, recorder=None, model=None):
+        self._gateway = gateway
+        self._model = model
+        self._recorder = recorder       # recorder(chunks, offsets, usage, latency) once fully streamed
+        self._chunks = []
+        self._offsets = []
+        self._site = site
+        self._stream = stream
+        self._retries = retries
+        self._start = start
+        self._ttft = None
+        self._usage = None
+        self._closed = False
+
+    def __iter__(self):
+        error = True
+        try:
+            for chunk in self._stream:
+                if self._ttft is None:
+                    self._ttft = time.perf_counter() - self._start
+                x_groq = getattr(chunk, "x_groq", None)
+                self._usage = getattr(x_groq, "usage", None) or getattr(chunk, "usage", None) or self._usage
+                if self._recorder is not None:
+                    content = chunk.choices[0].delta.content if chunk.choices else None
+                    if content:
+                        self._chunks.append(content)
+                        self._offsets.append(time.perf_counter() - self._start)
+                yield chunk
+            error = False
+        except GeneratorExit:   # Consumer stopped early
+            error = False
+            self._close_stream()
+            raise
+        finally:
+            self._finish(error=error)
+        if self._recorder is not None:
+            self._recorder(self._chunks, self._offsets, self._usage, time.perf_counter() - self._start)
+
+    def _finish(self, error=False):
+        if self._closed:
+            return
+        self._closed = True
+        self._gateway._semaphore.release()
+        self._gateway.metrics.record(
+            self._site, time.perf_counter() - self._start, retries=self._retries, error=error, ttft=self._ttft,
+            prompt_tokens=getattr(self._usage, "prompt_tokens", 0),
+            completion_tokens=getattr(self._usage, "completion_tokens", 0),
+            model=self._model, cache=self._gateway._cache_outcome())
+
+    def close(self):
+        self._finish()
+        self._close_stream()
+
+    def _close_stream(self):
+        close = getattr(self._stream, "close", None)
+        if close:
+            close()
+
+    def __del__(self):
+        self._finish()
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    """The process-wide gateway (configured from .env)."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(cassette=cassette_from_env(), telemetry=get_telemetry())
+        return _gateway
@@ -0,0 +1,198 @@
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+LLMTelemetry = env_vars.get("LLMTelemetry", "off")                    # on | off
+LLMTelemetryDir = env_vars.get("LLMTelemetryDir", os.path.join("Data", "llm_telemetry"))
+LLMTelemetryKeep = int(env_vars.get("LLMTelemetryKeep", 20))          # Session logs kept (oldest removed first)
+
+# USD per million (prompt, completion) tokens, list prices
+PRICING = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama3-70b-8192": (0.59, 0.79),
+    "mixtral-8x7b-32768": (0.24, 0.24),
+    "command-r-08-2024": (0.15, 0.60),
+}
+
+# Cache outcomes: "miss" (went upstream), "replay" (cassette), "hit" (call-site cache),
+# "local" (rules / deterministic bypass answered instead of the model),
+# "coalesced" (shared an identical in-flight request)
+AVOIDED = ("hit", "local", "coalesced")
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    prices = PRICING.get(model)
+    if prices is None:
+        return None
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class TelemetryLog:
+    """
+    One JSON line per model call (or avoided call), tagged by call site.
+
+    The file lives for one session; aggregate it with report() or
+    `python -m Backend.LLMTelemetry [session.jsonl]`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def record(self, site, model=None, latency=0.0, ttft=None, prompt_tokens=0, completion_tokens=0,
+               retries=0, error=False, cache="miss"):
+        event = {
+            "ts": time.time(), "site": site, "model": model, "cache": cache,
+            "latency_ms": round(latency * 1000, 2), "ttft_ms": round(ttft * 1000, 2) if ttft is not None else None,
+            "prompt_tokens": prompt_tokens or 0, "completion_tokens": completion_tokens or 0,
+            "retries": retries, "error": bool(error),
+            "cost_usd": estimate_cost(model, prompt_tokens or 0, completion_tokens or 0),
+        }
+        line = json.dumps(event) + "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(line)
+                self._file.flush()
+            except OSError as e:
+                print(f"[LLMTelemetry] Could not write {self.path}: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class _NullLog:
+    def record(self, *args, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+def _percentile(ordered, p):
+    return ordered[int(round(p / 100 * (len(ordered) - 1)))]
+
+
+def report(path):
+    """Per call site: counts, cache outcomes, tokens, cost and latency / TTFT percentiles for one session log."""
+    sites = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            s = sites.setdefault(event["site"], {"events": [], "cache": {}})
+            s["events"].append(event)
+            s["cache"][event["cache"]] = s["cache"].get(event["cache"], 0) + 1
+
+    out = {}
+    for site, s in sorted(sites.items()):
+        events = s["events"]
+        upstream = [e for e in events if e["cache"] not in AVOIDED]
+        latency = sorted(e["latency_ms"] for e in upstream)
+        ttft = sorted(e["ttft_ms"] for e in upstream if e["ttft_ms"] is not None)
+        costs = [e["cost_usd"] for e in upstream if e["cost_usd"] is not None]
+        entry = {
+            "requests": len(events),
+            "model_calls": len(upstream),
+            "cache": s["cache"],
+            "avoided_rate": (len(events) - len(upstream)) / len(events),
+            "errors": sum(e["error"] for e in events),
+            "retries": sum(e["retries"] for e in events),
+            "prompt_tokens": sum(e["prompt_tokens"] for e in upstream),
+            "completion_tokens": sum(e["completion_tokens"] for e in upstream),
+            "cost_usd": sum(costs) if costs else None,
+        }
+        if latency:
+            entry.update({f"latency_p{p}_ms": _percentile(latency, p) for p in (50, 90, 99)})
+        if ttft:
+            entry.update({f"ttft_p{p}_ms": _percentile(ttft, p) for p in (50, 90)})
+        out[site] = entry
+    return out
+
+
+def _sessions(directory):
+    return sorted(glob.glob(os.path.join(directory, "session-*.jsonl")))
+
+
+def latest_session(directory=LLMTelemetryDir):
+    sessions = _sessions(directory)
+    return sessions[-1] if sessions else None
+
+
+def prune_sessions(directory=LLMTelemetryDir, keep=LLMTelemetryKeep):
+    """Delete all but the newest `keep` session logs; returns the removed paths."""
+    stale = _sessions(directory)[:-keep] if keep > 0 else _sessions(directory)
+    for path in stale:
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"[LLMTelemetry] Could not remove {path}: {e}")
+    return stale
+
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+
+def get_telemetry():
+    """This process's session log (a no-op unless LLMTelemetry=on); older sessions beyond LLMTelemetryKeep are pruned."""
+    global _telemetry
+    with _telemetry_lock:
+        if _telemetry is None:
+            if LLMTelemetry != "on":
+                _telemetry = _NullLog()
+            else:
+                prune_sessions(LLMTelemetryDir, max(LLMTelemetryKeep - 1, 0))  # Room for this session
+                name = f"session-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}.jsonl"
+                _telemetry = TelemetryLog(os.path.join(LLMTelemetryDir, name))
+        return _telemetry
+
+
+def _print_report(path):
+    columns = ["requests", "model_calls", "avoided_rate", "errors", "retries", "prompt_tokens",
+               "completion_tokens", "cost_usd", "latency_p50_ms", "latency_p90_ms", "latency_p99_ms", "ttft_p50_ms"]
+    rows = report(path)
+    print(f"Session: {path}\n")
+    print(f"{'site':<12}" + "".join(f"{c:>18}" for c in columns))
+    for site, entry in rows.items():
+        cells = []
+        for c in columns:
+            value = entry.get(c)
+            if value is None:
+                cells.append(f"{'-':>18}")
+            elif isinstance(value, float):
+                cells.append(f"{value:>18.4f}" if c in ("cost_usd", "avoided_rate") else f"{value:>18.1f}")
+            else:
+                cells.append(f"{value:>18}")
+        print(f"{site:<12}" + "".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate an LLM telemetry session log into per-call-site percentiles.")
+    parser.add_argument("session", nargs="?", help="Session .jsonl (default: the latest in LLMTelemetryDir)")
+    parser.add_argument("--json", action="store_true", help="Print the raw report as JSON")
+    args = parser.parse_args()
+
+    path = args.session or latest_session()
+    if not path:
+        raise SystemExit(f"No telemetry sessions in {LLMTelemetryDir}")
+    if args.json:
+        print(json.dumps(report(path), indent=2))
+    else:
+        _print_report(path)
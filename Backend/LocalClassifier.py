@@ -0,0 +1,110 @@
+import re
+import threading
+import time
+
+from dotenv import dotenv_values
+
+from Backend.GoalExtractor import GoalExtractor
+from Backend.LLMTelemetry import get_telemetry
+
+env_vars = dotenv_values(".env")
+LocalClassifierThreshold = float(env_vars.get("LocalClassifierThreshold", 0.9))
+
+# Goals GoalExtractor only returns when a strict pattern matched
+ACTION_CONFIDENCE = {
+    "open_application": 0.95,
+    "play_media": 0.95,
+    "search_web": 0.95,
+    "generate_image": 0.95,
+    "send_message": 0.9,
+}
+
+# Short conversational turns the LLM classifier always calls 'general' (whole words only)
+GENERAL_PATTERNS = [
+    ("greeting", re.compile(r"^(hi|hello|hey|good (morning|afternoon|evening))( (friday|jarvis|there))?$")),
+    ("smalltalk", re.compile(r"^(how are you|who are you|what is your name|whats your name|thank you|thanks)( \w+)?$")),
+    ("time_date", re.compile(r"^(what|whats|tell me)( is)? (the )?(time|date|day)( (is it|today|now))?$")),
+]
+
+# A message is only sent without asking the LLM when the prompt is phrased as a command
+SEND_COMMAND = re.compile(r"^(send|message|msg|text|whatsapp)\b")
+
+_extractor = GoalExtractor()
+
+
+def classify_locally(prompt):
+    """
+    Deterministic pre-classifier for FirstLayerDMM.
+    `prompt` is already normalized. Returns (label, confidence, request_class);
+    label is 'general', 'realtime' or None when the rules have no opinion.
+    """
+    for request_class, pattern in GENERAL_PATTERNS:
+        if pattern.match(prompt):
+            return "general", 0.9, request_class
+
+    goal = _extractor.extract_goal(prompt)
+    if goal.response_mode == "ACTION" and goal.name in ACTION_CONFIDENCE:
+        confidence = ACTION_CONFIDENCE[goal.name]
+        # "tell me a joke" also parses as tell <contact> <message>, and questions
+        # like "how do i send a message on whatsapp" as a send: the LLM decides those
+        if goal.name == "send_message" and not SEND_COMMAND.match(prompt):
+            confidence = 0.5
+        return "realtime", confidence, goal.name
+    return None, 0.0, goal.name
+
+
+class FastPathStats:
+    """LLM classifier calls avoided, and latency saved, per request class."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.classes = {}
+
+    def record_llm(self, request_class, seconds):
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+            self.classes.setdefault(request_class, {"avoided": 0, "llm": 0, "local_seconds": 0.0})["llm"] += 1
+
+    def record_local(self, request_class, seconds):
+        with self._lock:
+            entry = self.classes.setdefault(request_class, {"avoided": 0, "llm": 0, "local_seconds": 0.0})
+            entry["avoided"] += 1
+            entry["local_seconds"] += seconds
+
+    def report(self):
+        """Per class: LLM calls avoided/made and estimated ms saved (at the observed mean LLM latency)."""
+        with self._lock:
+            mean_llm = self.llm_seconds / self.llm_calls if self.llm_calls else None
+            out = {}
+            for request_class, entry in self.classes.items():
+                saved = None
+                if mean_llm is not None:
+                    saved = (entry["avoided"] * mean_llm - entry["local_seconds"]) * 1000
+                out[request_class] = {"avoided": entry["avoided"], "llm": entry["llm"], "saved_ms": saved}
+            return {"mean_llm_ms": mean_llm * 1000 if mean_llm is not None else None, "classes": out}
+
+
+fast_path_stats = FastPathStats()
+
+
+def classify_with_fast_path(prompt, llm_classify, threshold=LocalClassifierThreshold):
+    """
+    Local rules first; `llm_classify(prompt)` only when they are below `threshold`.
+    Returns the label ('general' / 'realtime', or whatever the LLM replied).
+    """
+    start = time.perf_counter()
+    label, confidence, request_class = classify_locally(prompt)
+    if label is not None and confidence >= threshold:
+        elapsed = time.perf_counter() - start
+        fast_path_stats.record_local(request_class, elapsed)
+        get_telemetry().record("classifier", latency=elapsed, cache="local")
+        print(f"[Classifier] Local rules: {label} ({request_class}, {confidence:.2f}) - LLM skipped")
+        return label
+
+    llm_start = time.perf_counter()
+    label = llm_classify(prompt)
+    fast_path_stats.record_llm(request_class, time.perf_counter() - llm_start)
+    return label
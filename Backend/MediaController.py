@@ -5,18 +5,23 @@ from rich import print
 from core.intents import MediaIntent
 from Backend.MediaVerifier import MediaVerifier
 from Backend.TextToSpeech import TTS
+from Backend.MemoryStore import default_store
 # Executors will be imported dynamically or statically
 # from automation import spotify, youtube_playback, local_media
 
 class MediaController:
-    def __init__(self):
+    def __init__(self, store=None):
         self.verifier = MediaVerifier()
+        # With MemoryBackend=sqlite the play history is the store's media_history table
+        self.store = store or default_store()
         self.memory_path = "memory/media_preferences.json"
         self.calibration_path = "config/media_ui_map.json"
         self._load_memory()
         
     def _load_memory(self):
-        if os.path.exists(self.memory_path):
+        if self.store is not None:
+            self.memory = {"history": [], "preferences": self.store.items("media_preferences")}
+        elif os.path.exists(self.memory_path):
             with open(self.memory_path, 'r') as f:
                 self.memory = json.load(f)
         else:
@@ -109,13 +114,16 @@ class MediaController:
         # 2. History (Last successful for this song?)
         # Clean query for key lookup
         key = intent.query.lower().strip()
-        history = self.memory.get("history", [])
-        
-        # Find last entry for this song
-        last_entry = next((item for item in reversed(history) if item["song"] == key), None)
+        if self.store is not None:
+            best = self.store.last_platform(key)
+        else:
+            history = self.memory.get("history", [])
+
+            # Find last entry for this song
+            last_entry = next((item for item in reversed(history) if item["song"] == key), None)
+            best = last_entry["best_platform"] if last_entry else None
         
-        if last_entry:
-            best = last_entry["best_platform"]
+        if best:
             print(f"[GMC] Found learned preference for '{key}': {best}")
             return [best] + self._get_fallbacks(best)
         
@@ -168,6 +176,11 @@ class MediaController:
                 "timestamp": time.time()
             }
             
+            if self.store is not None:
+                self.store.append_media(entry["song"], platform, entry["timestamp"], keep=100)
+                print(f"[GMC] Learned: {song} -> {platform}")
+                return
+
             # Update history
             if "history" not in self.memory:
                 self.memory["history"] = []
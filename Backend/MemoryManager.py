@@ -1,8 +1,31 @@
+import copy
 import json
 import os
+import threading
+from types import MappingProxyType
+
+from Backend.MemoryStore import default_store
+
+MEMORY_DEFAULTS = {
+    "contacts": {},
+    "preferences": {"browser": "chrome", "theme": "dark"},
+    "user_profile": {"name": "User", "relationships": {}},
+    "failures": []
+}
+
+
+def _freeze(value):
+    """Read-only view of a parsed JSON value (dicts become mappingproxies, lists tuples)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
 
 class MemoryManager:
-    def __init__(self):
+    def __init__(self, store=None):
+        # With MemoryBackend=sqlite everything below goes to the shared MemoryStore
+        self.store = store or default_store()
         self.memory_dir = "memory"
         self.files = {
             "contacts": os.path.join(self.memory_dir, "contacts.json"),
@@ -10,36 +33,97 @@ class MemoryManager:
             "user_profile": os.path.join(self.memory_dir, "user_profile.json"),
             "failures": os.path.join(self.memory_dir, "failures.json")
         }
+        # New failures are appended here; failures.json is the legacy list, still read but never rewritten
+        self.failure_log = os.path.join(self.memory_dir, "failures.jsonl")
+        # Parsed JSON documents, keyed by file_key and valid while the file's (mtime, size) is unchanged
+        self._cache = {}
+        self._frozen = {}   # file_key -> read-only view of the cached document, built on first use
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
         self._initialize_memory()
 
     def _initialize_memory(self):
         """Create memory directory and default files if they don't exist."""
+        if self.store is not None:
+            for name in ("preferences", "user_profile"):
+                self.store.seed(name, MEMORY_DEFAULTS[name])
+            return
+
         if not os.path.exists(self.memory_dir):
             os.makedirs(self.memory_dir)
             print(f"Created memory directory: {self.memory_dir}")
 
-        defaults = {
-            "contacts": {},
-            "preferences": {"browser": "chrome", "theme": "dark"},
-            "user_profile": {"name": "User", "relationships": {}},
-            "failures": []
-        }
-
         for name, path in self.files.items():
             if not os.path.exists(path):
                 with open(path, "w", encoding="utf-8") as f:
-                    json.dump(defaults[name], f, indent=4)
+                    json.dump(MEMORY_DEFAULTS[name], f, indent=4)
                 print(f"Initialized memory file: {path}")
 
     def _load_json(self, file_key):
-        try:
-            with open(self.files[file_key], "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading {file_key}: {e}")
-            return {}
+        """Parsed document, re-read only when the file changed. Shared with the cache: copy before handing it out."""
+        with self._lock:
+            signature = self._signature(file_key)
+            cached = self._cache.get(file_key)
+            if cached is not None and signature is not None and cached[0] == signature:
+                self.stats["hits"] += 1
+                return cached[1]
+
+            self.stats["misses"] += 1
+            self._frozen.pop(file_key, None)
+            try:
+                data = self._read(file_key)
+            except Exception as e:
+                print(f"Error loading {file_key}: {e}")
+                self._cache.pop(file_key, None)
+                return {}
+            self._cache[file_key] = (signature, data)
+            return data
+
+    def _signature(self, file_key):
+        """(mtime_ns, size) of the document's file(s); None if the main file is missing."""
+        paths = [self.files[file_key]] + ([self.failure_log] if file_key == "failures" else [])
+        signature = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature) if signature[0] is not None else None
+
+    def _read(self, file_key):
+        with open(self.files[file_key], "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if file_key == "failures":
+            data = (data if isinstance(data, list) else []) + self._read_failure_log()
+        return data
+
+    def _read_failure_log(self):
+        if not os.path.exists(self.failure_log):
+            return []
+        failures = []
+        with open(self.failure_log, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    failures.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass  # Torn line from a crash mid-write
+        return failures
+
+    def _load_frozen(self, file_key):
+        """Read-only view of the cached document, shared by all callers until the file changes."""
+        with self._lock:
+            data = self._load_json(file_key)
+            frozen = self._frozen.get(file_key)
+            if frozen is None or frozen[0] is not data:
+                frozen = self._frozen[file_key] = (data, _freeze(data))
+            return frozen[1]
 
     def _save_json(self, file_key, data):
+        self._invalidate(file_key)
         try:
             with open(self.files[file_key], "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=4)
@@ -48,22 +132,43 @@ class MemoryManager:
             print(f"Error saving {file_key}: {e}")
             return False
 
+    def _invalidate(self, file_key):
+        with self._lock:
+            self._frozen.pop(file_key, None)
+            if self._cache.pop(file_key, None) is not None:
+                self.stats["invalidations"] += 1
+
+    def cache_stats(self):
+        """Read-cache hits, misses, invalidations and hit rate."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {**self.stats, "hit_rate": self.stats["hits"] / lookups if lookups else 0.0}
+
     def get_contact(self, name):
         """Retrieve contact details by name (case-insensitive)."""
-        contacts = self._load_json("contacts")
-        name_lower = name.lower()
-        return contacts.get(name_lower)
+        if self.store is not None:
+            return self.store.get("contacts", name.lower())
+        with self._lock:
+            contacts = self._load_json("contacts")
+            return copy.deepcopy(contacts.get(name.lower()))
 
     def add_contact(self, name, details):
         """Add or update a contact."""
-        contacts = self._load_json("contacts")
-        contacts[name.lower()] = details
-        return self._save_json("contacts", contacts)
+        if self.store is not None:
+            self.store.put("contacts", name.lower(), details)
+            return True
+        with self._lock:
+            contacts = self._load_json("contacts")
+            contacts[name.lower()] = details
+            return self._save_json("contacts", contacts)
 
     def get_preference(self, key):
         """Get a specific user preference."""
-        prefs = self._load_json("preferences")
-        return prefs.get(key)
+        if self.store is not None:
+            return self.store.get("preferences", key)
+        with self._lock:
+            prefs = self._load_json("preferences")
+            return copy.deepcopy(prefs.get(key))
 
     def record_failure(self, failure_data):
         """
@@ -76,22 +181,54 @@ class MemoryManager:
           "timestamp": str,
           "user_aborted": bool
         }
+        One appended line (memory/failures.jsonl) or row, whatever the history size.
         """
-        failures = self._load_json("failures")
-        # Ensure it's a list
-        if not isinstance(failures, list):
-            failures = []
-            
-        failures.append(failure_data)
-        self._save_json("failures", failures)
+        if self.store is not None:
+            self.store.append_failure("memory", failure_data, goal_type=failure_data.get("goal_type"))
+            return
+
+        line = json.dumps(failure_data) + "\n"
+        with self._lock:
+            self._invalidate("failures")
+            try:
+                with open(self.failure_log, "a", encoding="utf-8") as f:
+                    if f.tell() and not self._ends_with_newline(self.failure_log):
+                        line = "\n" + line  # Seal a torn last line
+                    f.write(line)
+            except OSError as e:
+                print(f"Error saving failures: {e}")
+
+    @staticmethod
+    def _ends_with_newline(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
 
     def get_failures(self):
-        return self._load_json("failures")
+        if self.store is not None:
+            return self.store.failures("memory")
+        with self._lock:
+            failures = self._load_json("failures")
+            return copy.deepcopy(failures) if isinstance(failures, list) else []
+
+    def _failures_view(self):
+        """
+        All recorded failures, read-only (a tuple of mappingproxies) and shared
+        until the file changes, for bulk readers such as FailureIndex.bootstrap
+        that would otherwise copy the whole log.
+        """
+        if self.store is not None:
+            return tuple(self.store.failures("memory"))
+        failures = self._load_frozen("failures")
+        return failures if isinstance(failures, tuple) else ()
 
     def get_failures_by_goal(self, goal_type):
         """Retrieve all failures matching a specific goal type."""
-        entry_list = self._load_json("failures")
-        if not isinstance(entry_list, list):
-            return []
-        
-        return [f for f in entry_list if f.get("goal_type") == goal_type]
+        if self.store is not None:
+            return self.store.failures("memory", goal_type=goal_type)
+        with self._lock:
+            entry_list = self._load_json("failures")
+            if not isinstance(entry_list, list):
+                return []
+
+            return [copy.deepcopy(f) for f in entry_list if f.get("goal_type") == goal_type]
@@ -0,0 +1,381 @@
+import argparse
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+MemoryBackend = env_vars.get("MemoryBackend", "json")                    # json | sqlite
+MemoryDB = env_vars.get("MemoryDB", os.path.join("memory", "friday.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key       TEXT NOT NULL,
+    value     TEXT NOT NULL,
+    updated   REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS failures (
+    id        INTEGER PRIMARY KEY,
+    source    TEXT NOT NULL,
+    goal_type TEXT,
+    data      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS failures_by_goal ON failures (source, goal_type, id);
+
+CREATE TABLE IF NOT EXISTS outcomes (
+    id         INTEGER PRIMARY KEY,
+    goal_id    TEXT,
+    strategy   TEXT,
+    target     TEXT,
+    success    INTEGER NOT NULL,
+    time_taken REAL,
+    retries    INTEGER,
+    confidence REAL,
+    data       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outcomes_by_goal ON outcomes (goal_id, id);
+CREATE INDEX IF NOT EXISTS outcomes_by_strategy ON outcomes (strategy);
+CREATE INDEX IF NOT EXISTS outcomes_by_target ON outcomes (target);
+
+CREATE TABLE IF NOT EXISTS media_history (
+    id       INTEGER PRIMARY KEY,
+    song     TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    ts       REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS media_by_song ON media_history (song, id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# JSON files the importer knows about, relative to the project root
+LEGACY_FILES = {
+    "contacts": os.path.join("memory", "contacts.json"),
+    "preferences": os.path.join("memory", "preferences.json"),
+    "user_profile": os.path.join("memory", "user_profile.json"),
+    "failures": os.path.join("memory", "failures.json"),
+    "failure_log": os.path.join("memory", "failures.jsonl"),
+    "outcomes": os.path.join("memory", "outcomes.json"),
+    "outcome_journal": os.path.join("memory", "outcomes.jsonl"),
+    "strategy_health": os.path.join("memory", "strategy_health.json"),
+    "media": os.path.join("memory", "media_preferences.json"),
+    "learning_preferences": os.path.join("FRIDAY", "memory", "preferences.json"),
+    "plan_stats": os.path.join("FRIDAY", "memory", "plan_stats.json"),
+    "learning_failures": os.path.join("FRIDAY", "memory", "failures.json"),
+    "contact_aliases": os.path.join("FRIDAY", "memory", "contacts.json"),
+}
+# Data/trusted_contacts.json is not imported: the send-confirmation allow-list
+# stays file-backed so edits to it (including removals) apply immediately.
+
+
+class MemoryStore:
+    """
+    One SQLite database (WAL) for the assistant's persistent memory.
+
+    Small keyed records (contacts, preferences, strategy health, plan stats)
+    live in `kv` under a namespace per owner; append-only
+    histories (failures, outcomes, media plays) get their own tables,
+    indexed on the columns they are queried by. Values are JSON. Every call
+    is one short transaction on a shared connection.
+    """
+
+    def __init__(self, path=MemoryDB):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def transaction(self):
+        """`with store.transaction():` groups several writes into one commit."""
+        return _Transaction(self)
+
+    # --- Keyed records ---------------------------------------------------
+
+    def get(self, namespace, key, default=None):
+        rows = self._execute("SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+        return json.loads(rows[0][0]) if rows else default
+
+    def put(self, namespace, key, value):
+        self._execute(
+            "INSERT INTO kv (namespace, key, value, updated) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+            (namespace, key, json.dumps(value), time.time()))
+
+    def put_many(self, namespace, mapping, replace=False):
+        """Upsert every key of `mapping`; with replace=True the namespace ends up holding exactly `mapping`."""
+        now = time.time()
+        with self.transaction():
+            if replace:
+                self._conn.execute("DELETE FROM kv WHERE namespace = ?", (namespace,))
+            self._conn.executemany(
+                "INSERT INTO kv (namespace, key, value, updated) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+                [(namespace, key, json.dumps(value), now) for key, value in mapping.items()])
+
+    def seed(self, namespace, mapping):
+        """Insert keys that do not exist yet (defaults)."""
+        now = time.time()
+        with self.transaction():
+            self._conn.executemany("INSERT OR IGNORE INTO kv (namespace, key, value, updated) VALUES (?, ?, ?, ?)",
+                                   [(namespace, key, json.dumps(value), now) for key, value in mapping.items()])
+
+    def delete(self, namespace, key):
+        self._execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def items(self, namespace):
+        rows = self._execute("SELECT key, value FROM kv WHERE namespace = ? ORDER BY key", (namespace,))
+        return {key: json.loads(value) for key, value in rows}
+
+    # --- Failures --------------------------------------------------------
+
+    def append_failure(self, source, record, goal_type=None, keep=None):
+        """Append a failure record; `keep` trims `source` to its newest `keep` records."""
+        with self.transaction():
+            self._conn.execute("INSERT INTO failures (source, goal_type, data) VALUES (?, ?, ?)",
+                               (source, goal_type, json.dumps(record)))
+            if keep is not None:
+                self._conn.execute(
+                    "DELETE FROM failures WHERE source = ? AND id <= "
+                    "(SELECT id FROM failures WHERE source = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (source, source, keep))
+
+    def failures(self, source, goal_type=None, limit=None):
+        """Failure records of `source` (optionally one goal type), oldest first; `limit` keeps the newest."""
+        sql = "SELECT data FROM failures WHERE source = ?"
+        params = [source]
+        if goal_type is not None:
+            sql += " AND goal_type = ?"
+            params.append(goal_type)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self._execute(sql, params)
+        return [json.loads(data) for (data,) in reversed(rows)]
+
+    # --- Outcomes --------------------------------------------------------
+
+    def append_outcome(self, outcome):
+        self.append_outcomes([outcome])
+
+    def append_outcomes(self, outcomes):
+        with self.transaction():
+            self._conn.executemany(
+                "INSERT INTO outcomes (goal_id, strategy, target, success, time_taken, retries, confidence, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(o.get("goal_id"), o.get("strategy") or o.get("strategy_id"), o.get("target"),
+                  int(bool(o.get("success", False))), o.get("time_taken") or 0.0, o.get("retries") or 0,
+                  o.get("confidence") or 0.0, json.dumps(o)) for o in outcomes])
+
+    def outcomes(self, goal_id, limit=None):
+        """Outcomes of one goal, oldest first; `limit` keeps the newest."""
+        sql = "SELECT data FROM outcomes WHERE goal_id = ? ORDER BY id DESC"
+        params = [goal_id]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(data) for (data,) in reversed(self._execute(sql, params))]
+
+    def outcome_totals(self, column):
+        """{strategy or target: count/successes/time_taken/retries/confidence sums}, as OutcomeManager keeps them."""
+        if column not in ("strategy", "target"):
+            raise ValueError(f"Cannot group outcomes by {column!r}")
+        rows = self._execute(
+            f"SELECT {column}, COUNT(*), SUM(success), SUM(time_taken), SUM(retries), SUM(confidence) "
+            f"FROM outcomes WHERE {column} IS NOT NULL GROUP BY {column}")
+        return {key: {"count": count, "successes": successes, "time_taken": time_taken, "retries": retries,
+                      "confidence": confidence}
+                for key, count, successes, time_taken, retries, confidence in rows}
+
+    # --- Media -----------------------------------------------------------
+
+    def append_media(self, song, platform, ts=None, keep=None):
+        with self.transaction():
+            self._conn.execute("INSERT INTO media_history (song, platform, ts) VALUES (?, ?, ?)",
+                               (song, platform, ts if ts is not None else time.time()))
+            if keep is not None:
+                self._conn.execute(
+                    "DELETE FROM media_history WHERE id <= "
+                    "(SELECT id FROM media_history ORDER BY id DESC LIMIT 1 OFFSET ?)", (keep,))
+
+    def last_platform(self, song):
+        rows = self._execute("SELECT platform FROM media_history WHERE song = ? ORDER BY id DESC LIMIT 1", (song,))
+        return rows[0][0] if rows else None
+
+    # --- Meta ------------------------------------------------------------
+
+    def get_meta(self, key):
+        rows = self._execute("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def set_meta(self, key, value):
+        self._execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class _Transaction:
+    def __init__(self, store):
+        self.store = store
+        self.owner = False
+
+    def __enter__(self):
+        self.store._lock.acquire()
+        if not self.store._conn.in_transaction:
+            self.store._conn.execute("BEGIN")
+            self.owner = True
+        return self.store
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self.owner:
+                self.store._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.store._lock.release()
+
+
+# --- One-shot JSON import ------------------------------------------------
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[MemoryStore] Skipping {path}: {e}")
+        return None
+
+
+def _read_jsonl(path):
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def import_json(store, root=".", force=False):
+    """
+    Copy the legacy JSON memory files under `root` into `store`, once.
+
+    Returns {file key: records imported}. The files are left in place; a
+    second call is a no-op unless force=True.
+    """
+    if store.get_meta("json_imported") and not force:
+        return {}
+    counts = {}
+
+    def load(name, kind):
+        path = os.path.join(root, LEGACY_FILES[name])
+        if not os.path.exists(path):
+            return None
+        data = _read_json(path)
+        return data if isinstance(data, kind) else None
+
+    with store.transaction():
+        for name, namespace in (("contacts", "contacts"), ("preferences", "preferences"),
+                                ("user_profile", "user_profile"), ("strategy_health", "strategy_health"),
+                                ("learning_preferences", "learning_preferences"), ("plan_stats", "plan_stats"),
+                                ("contact_aliases", "contact_aliases")):
+            data = load(name, dict)
+            if data:
+                store.put_many(namespace, data)
+                counts[name] = len(data)
+
+        # History rows already in the store are skipped, so force=True never duplicates them
+        for name, source in (("failures", "memory"), ("learning_failures", "learning")):
+            data = load(name, list) or []
+            failure_log = os.path.join(root, LEGACY_FILES["failure_log"])
+            if name == "failures" and os.path.exists(failure_log):
+                data += _read_jsonl(failure_log)  # Appended by MemoryManager since the list stopped growing
+            if not data:
+                continue
+            seen = {row for (row,) in store._execute("SELECT data FROM failures WHERE source = ?", (source,))}
+            added = 0
+            for record in data:
+                if json.dumps(record) in seen:
+                    continue
+                goal_type = record.get("goal_type") if isinstance(record, dict) else None
+                store.append_failure(source, record, goal_type=goal_type)
+                added += 1
+            counts[name] = added
+
+        outcomes = load("outcomes", list) or []
+        journal = os.path.join(root, LEGACY_FILES["outcome_journal"])
+        if os.path.exists(journal):
+            outcomes = _read_jsonl(journal)  # The journal already holds the imported legacy list
+        if outcomes:
+            seen = {row for (row,) in store._execute("SELECT data FROM outcomes")}
+            outcomes = [o for o in outcomes if json.dumps(o) not in seen]
+            store.append_outcomes(outcomes)
+            counts["outcomes"] = len(outcomes)
+
+        media = load("media", dict)
+        if media:
+            seen = set(store._execute("SELECT song, platform, ts FROM media_history"))
+            added = 0
+            for entry in media.get("history", []):
+                row = (entry["song"], entry["best_platform"], entry.get("timestamp") or 0.0)
+                if row not in seen:
+                    store.append_media(*row)
+                    added += 1
+            store.put_many("media_preferences", media.get("preferences", {}))
+            counts["media"] = added
+
+        store.set_meta("json_imported", str(time.time()))
+    return counts
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_memory_store():
+    """The process-wide store (imports the JSON files on first open)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MemoryStore()
+            counts = import_json(_store)
+            if counts:
+                print(f"[MemoryStore] Imported JSON memory: {counts}")
+            atexit.register(_store.close)
+        return _store
+
+
+def default_store():
+    """The shared store when MemoryBackend=sqlite, else None (the JSON files are used)."""
+    return get_memory_store() if MemoryBackend == "sqlite" else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the legacy JSON memory files into the SQLite store.")
+    parser.add_argument("--db", default=MemoryDB, help="Database file (default: MemoryDB from .env)")
+    parser.add_argument("--root", default=".", help="Project root holding memory/, FRIDAY/memory/ and Data/")
+    parser.add_argument("--force", action="store_true", help="Import again even if this database already did")
+    args = parser.parse_args()
+
+    counts = import_json(MemoryStore(args.db), root=args.root, force=args.force)
+    print(json.dumps(counts, indent=2) if counts else "Nothing imported (already done; use --force).")
@@ -1,13 +1,8 @@
 from Backend.GoalManager import GoalManager
 from rich import print
-from groq import Groq
-from dotenv import dotenv_values
+from Backend.LLMGateway import get_gateway
 import os
 
-env_vars = dotenv_values(".env")
-GroqAPIKey = env_vars.get("GroqAPIKey")
-
-client = Groq(api_key=GroqAPIKey)
 goal_manager = GoalManager()
 
 def Classify(prompt):
@@ -17,7 +12,7 @@ def Classify(prompt):
     ]
     
     try:
-        completion = client.chat.completions.create(
+        completion = get_gateway().chat("classifier",
             model="llama-3.3-70b-versatile",
             messages=messages,
             max_tokens=10,
@@ -29,9 +24,24 @@ def Classify(prompt):
         return "general" # Default to chat if classifier fails
 
 from Backend.normalize import normalize_text
+from Backend.LocalClassifier import classify_with_fast_path
+from Backend.Orchestration import OrchestrationMode, classify_and_prepare, orchestration_stats
+import time
+
+def prepare_goal(prompt):
+    """Local goal extraction + strategy selection, run alongside the classifier in concurrent mode."""
+    goal = goal_manager.goal_extractor.extract_goal(prompt)
+    return goal, goal_manager.strategy_selector.select_strategy(goal)
 
 # Supervisor Logic (v3 Adapter)
 def FirstLayerDMM(prompt: str = "test"):
+    start = time.perf_counter()
+    try:
+        return _first_layer(prompt)
+    finally:
+        orchestration_stats.record(OrchestrationMode, time.perf_counter() - start)
+
+def _first_layer(prompt):
     # STEP 3: APPLY NORMALIZATION AT THE ENTRY POINT
     normalized_prompt = normalize_text(prompt)
     
@@ -41,15 +51,16 @@ def FirstLayerDMM(prompt: str = "test"):
     # Use normalized prompt for all downstream logic
     prompt = normalized_prompt
     
-    # 1. Classify Intent
-    intent = Classify(prompt)
+    # 1. Classify Intent (local rules first, LLM only when they are not confident)
+    #    In concurrent mode the goal/strategy are prepared while the classifier runs
+    intent, prepared = classify_and_prepare(prompt, lambda p: classify_with_fast_path(p, Classify), prepare_goal)
     print(f"[Supervisor v3] Intent Detected: {intent}")
     
     # 2. Automation Logic
     if "realtime" in intent.lower():
         # Execute Goal
         goal_id = goal_manager.create_goal(prompt)
-        result_message = goal_manager.execute_goal(goal_id)
+        result_message = goal_manager.execute_goal(goal_id, prepared=prepared)
         
         # Check for failure/recommendation language
         if "Failed" in result_message or "Recommendation" in result_message:
@@ -64,4 +75,6 @@ def FirstLayerDMM(prompt: str = "test"):
 
 if __name__ == "__main__":
     print(FirstLayerDMM("open chrome"))
-    print(FirstLayerDMM("how are you?"))
\ No newline at end of file
+    print(FirstLayerDMM("how are you?"))
+    print(orchestration_stats.report())
+    print(goal_manager.plan_cache.report())  # Plan sources (GSO / cache / LLM), on demand
\ No newline at end of file
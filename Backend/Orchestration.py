@@ -0,0 +1,75 @@
+import statistics
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+OrchestrationMode = env_vars.get("OrchestrationMode", "sequential")  # sequential | concurrent
+
+LATENCY_WINDOW = 1000
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="orchestration")
+
+
+class OrchestrationStats:
+    """End-to-end request latency per orchestration mode, and how often the speculative work paid off."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latency = {}
+        self.speculation = {"used": 0, "discarded": 0, "failed": 0}
+
+    def record(self, mode, seconds):
+        with self._lock:
+            self._latency.setdefault(mode, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+
+    def count(self, outcome):
+        with self._lock:
+            self.speculation[outcome] += 1
+
+    def report(self):
+        def pct(ordered, p):
+            return ordered[int(round(p / 100 * (len(ordered) - 1)))] * 1000
+
+        with self._lock:
+            out = {"speculation": dict(self.speculation)}
+            for mode, samples in self._latency.items():
+                ordered = sorted(samples)
+                out[mode] = {"requests": len(ordered), "p50_ms": statistics.median(ordered) * 1000,
+                             "p90_ms": pct(ordered, 90), "p99_ms": pct(ordered, 99)}
+            return out
+
+
+orchestration_stats = OrchestrationStats()
+
+
+def classify_and_prepare(prompt, classify, prepare, mode=OrchestrationMode, stats=orchestration_stats):
+    """
+    Returns (intent, prepared) for FirstLayerDMM.
+
+    sequential: classify(prompt) only; prepared is None and GoalManager does
+    its own goal extraction later.
+    concurrent: prepare(prompt) (local goal extraction + strategy selection)
+    runs on a worker thread while classify(prompt) waits on the LLM. Its
+    result is returned only when the intent is 'realtime'; for 'general' it
+    is discarded. A failing prepare() just yields None.
+    """
+    if mode != "concurrent":
+        return classify(prompt), None
+
+    future = _executor.submit(prepare, prompt)
+    intent = classify(prompt)
+    if "realtime" not in intent.lower():
+        future.cancel()
+        stats.count("discarded")
+        return intent, None
+    try:
+        prepared = future.result()
+    except Exception as e:
+        print(f"[Orchestration] Speculative goal extraction failed: {e}")
+        stats.count("failed")
+        return intent, None
+    stats.count("used")
+    return intent, prepared
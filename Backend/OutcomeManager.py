@@ -1,16 +1,167 @@
+import atexit
 import json
 import os
+import threading
+from collections import OrderedDict, deque
 from datetime import datetime
 
-OUTCOME_FILE = "memory/outcomes.json"
+from Backend.MemoryStore import default_store
+
+OUTCOME_FILE = "memory/outcomes.json"               # Legacy whole-file list, imported once
+OUTCOME_JOURNAL = "memory/outcomes.jsonl"           # Append-only, one outcome per line
+OUTCOME_CHECKPOINT = "memory/outcomes.checkpoint.json"
+CHECKPOINT_EVERY = 1000      # Records between checkpoints
+RECENT_PER_GOAL = 20         # Outcomes kept in memory per goal_id
+RECENT_GOALS = 2048          # goal_ids kept in memory (LRU)
+
+
+def _empty_stats():
+    return {"count": 0, "successes": 0, "time_taken": 0.0, "retries": 0, "confidence": 0.0}
+
 
 class OutcomeManager:
-    def __init__(self, memory_dir=None):
+    """
+    Outcomes are appended to a JSONL journal; per-strategy and per-target
+    aggregates (and the last few outcomes per goal) live in memory, so
+    record() and the stats queries cost the same at 10 or 10 million
+    outcomes. At startup the aggregates come from the checkpoint plus the
+    journal lines written after it. With MemoryBackend=sqlite the outcomes
+    table of the MemoryStore replaces the journal and checkpoint.
+    """
+
+    def __init__(self, memory_dir=None, journal_path=OUTCOME_JOURNAL, checkpoint_path=OUTCOME_CHECKPOINT,
+                 legacy_path=OUTCOME_FILE, checkpoint_every=CHECKPOINT_EVERY, store=None,
+                 health_manager=None):
         # Allow memory_dir argument for compatibility but force strict outcome file path
-        os.makedirs("memory", exist_ok=True)
-        if not os.path.exists(OUTCOME_FILE):
-            with open(OUTCOME_FILE, "w") as f:
-                json.dump([], f)
+        self.journal_path = journal_path
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._lock = threading.Lock()
+        self._strategies = {}
+        self._targets = {}
+        self._recent = OrderedDict()   # goal_id -> deque of outcomes
+        self._since_checkpoint = 0
+        self.store = store or default_store()
+        self.health_manager = health_manager   # None: the process-wide registry
+        self._journal = None
+        if self.store is not None:
+            self._strategies = self.store.outcome_totals("strategy")
+            self._targets = self.store.outcome_totals("target")
+            return
+        os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+
+        if not os.path.exists(journal_path) and legacy_path and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+        self._rebuild()
+        self._journal = open(journal_path, "a", encoding="utf-8")
+        if self._journal.tell() and not self._ends_with_newline():
+            self._journal.write("\n")  # Seal a torn last line so the next record starts clean
+        atexit.register(self.close)
+
+    # --- Startup ---------------------------------------------------------
+
+    def _import_legacy(self, legacy_path):
+        try:
+            with open(legacy_path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[OutcomeManager] Could not import {legacy_path}: {e}")
+            return
+        tmp = self.journal_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for outcome in data if isinstance(data, list) else []:
+                f.write(json.dumps(outcome) + "\n")
+        os.replace(tmp, self.journal_path)
+        print(f"[OutcomeManager] Imported {len(data)} outcomes from {legacy_path}")
+
+    def _rebuild(self):
+        offset = 0
+        if os.path.exists(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path) as f:
+                    checkpoint = json.load(f)
+                size = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+                if checkpoint["offset"] <= size:
+                    offset = checkpoint["offset"]
+                    self._strategies = checkpoint["strategies"]
+                    self._targets = checkpoint["targets"]
+                    for goal_id, outcomes in checkpoint["recent"]:
+                        self._recent[goal_id] = deque(outcomes, maxlen=RECENT_PER_GOAL)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"[OutcomeManager] Ignoring checkpoint: {e}")
+                self._strategies, self._targets, self._recent = {}, {}, OrderedDict()
+
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn last line: not counted, overwritten by the next append
+                try:
+                    self._apply(json.loads(line))
+                except ValueError:
+                    continue
+                self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    def _ends_with_newline(self):
+        with open(self.journal_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _apply(self, outcome):
+        strategy = outcome.get("strategy") or outcome.get("strategy_id")
+        success = bool(outcome.get("success", False))
+        for table, key in ((self._strategies, strategy), (self._targets, outcome.get("target"))):
+            if key is None:
+                continue
+            stats = table.get(key)
+            if stats is None:
+                stats = table[key] = _empty_stats()
+            stats["count"] += 1
+            stats["successes"] += int(success)
+            stats["time_taken"] += outcome.get("time_taken") or 0.0
+            stats["retries"] += outcome.get("retries") or 0
+            stats["confidence"] += outcome.get("confidence") or 0.0
+
+        goal_id = outcome.get("goal_id")
+        recent = self._recent.get(goal_id)
+        if recent is None:
+            recent = self._recent[goal_id] = deque(maxlen=RECENT_PER_GOAL)
+            if len(self._recent) > RECENT_GOALS:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(goal_id)
+        recent.append(outcome)
+
+    def checkpoint(self):
+        """Persist the aggregates and the journal offset they cover (atomic replace)."""
+        if self.store is not None:
+            return  # Every record is already committed to the store
+        with self._lock:
+            journal = getattr(self, "_journal", None)
+            if journal is not None:
+                journal.flush()
+                os.fsync(journal.fileno())
+            offset = os.path.getsize(self.journal_path) if os.path.exists(self.journal_path) else 0
+            data = {"offset": offset, "strategies": self._strategies, "targets": self._targets,
+                    "recent": [[goal_id, list(outcomes)] for goal_id, outcomes in self._recent.items()]}
+            tmp = self.checkpoint_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.checkpoint_path)
+            self._since_checkpoint = 0
+
+    def close(self):
+        if getattr(self, "_journal", None) is None or self._journal.closed:
+            return
+        if self._since_checkpoint:
+            self.checkpoint()
+        self._journal.close()
+
+    # --- Hot path --------------------------------------------------------
 
     def record(self, goal_id, target, strategy, primary_success, time_taken, retries, fallback_used):
         # PART 1: Fix Outcome Semantics
@@ -18,8 +169,8 @@ class OutcomeManager:
         success = primary_success 
 
         # PART 2 Integration: Update Strategy Health
-        from Backend.StrategyHealth import StrategyHealthManager
-        health_mgr = StrategyHealthManager()
+        from Backend.StrategyHealth import get_health_manager
+        health_mgr = self.health_manager or get_health_manager()
         
         if success:
             health_mgr.record_success(strategy)
@@ -39,11 +190,23 @@ class OutcomeManager:
             "confidence": self._calculate_confidence(success, time_taken, retries)
         }
 
-        with open(OUTCOME_FILE, "r+") as f:
-            data = json.load(f)
-            data.append(outcome)
-            f.seek(0)
-            json.dump(data, f, indent=2)
+        with self._lock:
+            if self.store is not None:
+                if goal_id not in self._recent:
+                    # Start the goal's in-memory window from what earlier sessions stored
+                    self._recent[goal_id] = deque(self.store.outcomes(goal_id, limit=RECENT_PER_GOAL),
+                                                  maxlen=RECENT_PER_GOAL)
+                    if len(self._recent) > RECENT_GOALS:
+                        self._recent.popitem(last=False)
+                self.store.append_outcome(outcome)
+            else:
+                self._journal.write(json.dumps(outcome) + "\n")
+                self._journal.flush()
+            self._apply(outcome)
+            self._since_checkpoint += 1
+            due = self.store is None and self._since_checkpoint >= self.checkpoint_every
+        if due:
+            self.checkpoint()
 
         return outcome["confidence"]
 
@@ -56,15 +219,34 @@ class OutcomeManager:
         )
 
     def recent_outcomes(self, goal_id, target=None, limit=5):
-        with open(OUTCOME_FILE) as f:
-            data = json.load(f)
+        with self._lock:
+            outcomes = list(self._recent.get(goal_id, ()))
+        if not outcomes and goal_id not in self._recent:
+            outcomes = self._scan_goal(goal_id)
 
         filtered = [
-            o for o in reversed(data)
-            if o["goal_id"] == goal_id and (target is None or o["target"] == target)
+            o for o in reversed(outcomes)
+            if target is None or o.get("target") == target
         ]
 
         return filtered[:limit]
+
+    def _scan_goal(self, goal_id):
+        """Slow path for goal_ids that fell out of the in-memory LRU."""
+        if self.store is not None:
+            return self.store.outcomes(goal_id, limit=RECENT_PER_GOAL)
+        with self._lock:
+            self._journal.flush()
+        outcomes = deque(maxlen=RECENT_PER_GOAL)
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    outcome = json.loads(line)
+                except ValueError:
+                    continue
+                if outcome.get("goal_id") == goal_id:
+                    outcomes.append(outcome)
+        return list(outcomes)
     
     # Keeping compatibility methods if referenced elsewhere, but prioritizing strict implementation above.
     # Previous code referenced get_strategy_stats and save_outcome.
@@ -97,18 +279,24 @@ class OutcomeManager:
     
     def get_strategy_stats(self, strategy_id):
         # Compatibility method for existing StrategySelector logic
-        with open(OUTCOME_FILE) as f:
-            data = json.load(f)
-        
-        relevant = [x for x in data if x.get("strategy") == strategy_id or x.get("strategy_id") == strategy_id]
-        if not relevant:
-            return {"count": 0, "success_rate": 0.0}
-        
-        success_count = sum(1 for x in relevant if x.get("success", False))
-        return {
-            "count": len(relevant),
-            "success_rate": success_count / len(relevant)
-        }
+        return self._stats(self._strategies, strategy_id)
+
+    def get_target_stats(self, target):
+        return self._stats(self._targets, target)
+
+    def _stats(self, table, key):
+        with self._lock:
+            stats = table.get(key)
+            if not stats:
+                return {"count": 0, "success_rate": 0.0}
+            count = stats["count"]
+            return {
+                "count": count,
+                "success_rate": stats["successes"] / count,
+                "avg_time_taken": stats["time_taken"] / count,
+                "avg_retries": stats["retries"] / count,
+                "avg_confidence": stats["confidence"] / count,
+            }
     
     def save_outcome(self, outcome):
         # Compatibility wrapper for Outcome object if needed until GoalManager is fully updated
@@ -0,0 +1,123 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import dotenv_values
+
+from Backend.GSOAdapter import GSOAdapter
+from Backend.LLMTelemetry import get_telemetry
+from Backend.normalize import normalize_text
+
+env_vars = dotenv_values(".env")
+PlanCacheSize = int(env_vars.get("PlanCacheSize", 200))
+PlanCacheTTL = float(env_vars.get("PlanCacheTTL", 3600))
+
+
+def context_bucket(context):
+    """
+    Coarse ContextEngine state, split at the same thresholds generate_plan
+    uses to add directives: plans from the same bucket got the same prompt.
+    """
+    if not context:
+        return "default"
+    flags = []
+    if context.get("autonomy_level", 0.5) < 0.4:
+        flags.append("control")
+    if context.get("interaction_speed", 0.5) > 0.7:
+        flags.append("fast")
+    if context.get("surprise_tolerance", 0.5) < 0.3:
+        flags.append("cautious")
+    return "+".join(flags) or "default"
+
+
+class PlanCache:
+    """
+    LRU (+ TTL) cache of Planner output for one GoalManager.
+
+    Keyed by (goal name, strategy name, normalized target, exact content,
+    context bucket). Content (a message body, an image prompt) ends up in
+    the plan verbatim, so it is never normalized or dropped from the key.
+    Plans are stored and handed out as deep copies because the Verifier
+    annotates steps in place.
+    """
+
+    def __init__(self, max_entries=PlanCacheSize, ttl=PlanCacheTTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (plan, created)
+        self._lock = threading.Lock()
+        self.stats = {"deterministic": 0, "hits": 0, "misses": 0, "planner_calls": 0,
+                      "invalidations": 0, "evictions": 0}
+
+    @staticmethod
+    def key(goal, strategy, context=None):
+        content = (goal.content or "").strip()
+        return (goal.name, strategy.name, normalize_text(goal.target or ""), content, context_bucket(context))
+
+    def get(self, goal, strategy, context=None):
+        key = self.key(goal, strategy, context)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[1] >= self.ttl:
+                self._entries.pop(key, None)
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return copy.deepcopy(entry[0])
+
+    def put(self, goal, strategy, context, plan):
+        """Only non-empty plans are kept; the Planner returns [] on errors."""
+        steps = plan.get("plan") if isinstance(plan, dict) else plan
+        if not steps:
+            return
+        key = self.key(goal, strategy, context)
+        with self._lock:
+            self._entries[key] = (copy.deepcopy(plan), time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, goal, strategy, context=None):
+        """Drop the entry after its plan failed, so the retry asks the Planner again."""
+        with self._lock:
+            if self._entries.pop(self.key(goal, strategy, context), None) is not None:
+                self.stats["invalidations"] += 1
+
+    def plan(self, goal, strategy, context, planner):
+        """
+        The plan for (goal, strategy): GSOAdapter's deterministic plan when the
+        strategy is covered, else a cached one, else planner() (cached if valid).
+        """
+        plan = GSOAdapter.convert_to_plan(goal, strategy)
+        if plan is not None:
+            self._count("deterministic")
+            get_telemetry().record("planner", cache="local")
+            print(f"[PlanCache] Deterministic plan for '{strategy.name}' (Planner skipped)")
+            return plan
+
+        plan = self.get(goal, strategy, context)
+        if plan is not None:
+            get_telemetry().record("planner", cache="hit")
+            print(f"[PlanCache] Cached plan for '{goal.name}' / '{strategy.name}'")
+            return plan
+
+        self._count("planner_calls")
+        plan = planner()
+        self.put(goal, strategy, context, plan)
+        return plan
+
+    def _count(self, source):
+        with self._lock:
+            self.stats[source] += 1
+
+    def report(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            served = self.stats["deterministic"] + self.stats["hits"]
+            total = served + self.stats["planner_calls"]
+            return {**self.stats, "entries": len(self._entries),
+                    "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                    "planner_avoided": served / total if total else 0.0}
@@ -1,11 +1,10 @@
 import json
-import cohere
+from Backend.LLMGateway import get_gateway
 from dotenv import dotenv_values
 from rich import print
 
 env_vars = dotenv_values(".env")
 CohereAPIKey = env_vars.get("CohereAPIKey")
-co = cohere.Client(api_key=CohereAPIKey)
 
 planner_preamble = """
 You are the PLANNER for JARVIS. Your job is to convert user requests into a structured JSON plan.
@@ -100,7 +99,8 @@ def generate_plan(user_query, failure_context=None, context=None, goal_obj=None,
                 current_message += f"\n[INSTRUCTION] Goal is unclear. Use 'content' action to Ask the user for clarification."
 
 
-        response = co.chat(
+        response = get_gateway().cohere_chat(
+            "planner",
             model='command-r-08-2024',
             message=current_message,
             temperature=0,
@@ -1,6 +1,7 @@
 from googlesearch import search
-from groq import Groq
-from json import load, dump
+from Backend.LLMGateway import get_gateway
+from Backend.ChatStore import get_chat_store
+from Backend.SpeechStream import strip_tag
 import datetime
 from dotenv import dotenv_values
 
@@ -8,21 +9,12 @@ env_vars = dotenv_values(".env")
 
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
-GroqAPIKey = env_vars.get("GroqAPIKey")
 
-client = Groq(api_key=GroqAPIKey)
 
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which has real-time up-to-date information from the internet.
 *** Provide Answers In a Professional Way, make sure to add full stops, commas, question marks, and use proper grammar.***
 *** Just answer the question from the provided data in a professional way. ***"""
 
-try:
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-except:
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump([], f)
-
 def GoogleSearch(query):
     results = list(search(query, advanced=True, num_results=5))
     Answer = f"The search results for '{query}' are :\n[start]\n"
@@ -63,38 +55,40 @@ def Information():
     data += f"Time: {hour} hours: {minute} minutes: {second} seconds.\n"
     return data
 
-def RealtimeSearchEngine(prompt):
-    global SystemChatBot, messages
+def RealtimeSearchEngineStream(prompt):
+    """Yields the answer chunk by chunk as it is generated; the chat log is saved once it is complete."""
+    global SystemChatBot
 
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-    messages.append({"role": "user", "content": f"{prompt}"})
+    messages = get_chat_store().messages()
+    question = {"role": "user", "content": f"{prompt}"}
+    messages.append(question)
 
     SystemChatBot.append({"role": "system", "content": GoogleSearch(prompt)})
 
-    completion = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=SystemChatBot + [{"role": "system", "content": Information()}] + messages,
-        max_tokens=2048,
-        temperature=0.7,
-        top_p=1,
-        stream=True,
-        stop=None
-    )
+    try:
+        completion = get_gateway().chat("search",
+            model="llama-3.3-70b-versatile",
+            messages=SystemChatBot + [{"role": "system", "content": Information()}] + messages,
+            max_tokens=2048,
+            temperature=0.7,
+            top_p=1,
+            stream=True,
+            stop=None
+        )
 
-    Answer = ""
+        Answer = ""
 
-    for chunk in completion:
-        if chunk.choices[0].delta.content:
-            Answer += chunk.choices[0].delta.content
+        for content in strip_tag(chunk.choices[0].delta.content or "" for chunk in completion):
+            Answer += content
+            yield content
 
-    Answer = Answer.strip().replace("</s>", "")
-    messages.append({"role": "assistant", "content": Answer})
+        Answer = Answer.strip()
+        get_chat_store().append(question, {"role": "assistant", "content": Answer})
+    finally:
+        SystemChatBot.pop()
 
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump(messages, f, indent=4)
-
-    SystemChatBot.pop()
+def RealtimeSearchEngine(prompt):
+    Answer = "".join(RealtimeSearchEngineStream(prompt)).strip()
     return AnswerModifier(Answer=Answer)
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import speech_recognition as sr
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+DefaultEngine = env_vars.get("STTEngine", "google")
+ConfirmationEngine = env_vars.get("ConfirmationSTTEngine", DefaultEngine)
+WhisperModel = env_vars.get("WhisperModel", "base.en")
+
+
+@dataclass
+class Hypothesis:
+    """A transcript from a streaming listener: partial while speaking, then one final."""
+    text: str
+    final: bool = False
+
+
+class STTEngine:
+    """
+    Speech-to-text backend used by the listeners.
+
+    transcribe() takes an sr.AudioData and a BCP-47 language tag ("en-US") and
+    returns the recognized text. Like speech_recognition itself, it raises
+    sr.UnknownValueError when nothing intelligible was heard and
+    sr.RequestError when the engine is unavailable.
+    """
+    name = "base"
+    offline = False
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio_data, language="en-US"):
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Load models ahead of the first turn. No-op for engines with nothing to load."""
+        pass
+
+
+class GoogleEngine(STTEngine):
+    """Google Web Speech API (network round-trip per utterance)."""
+    name = "google"
+
+    def transcribe(self, audio_data, language="en-US"):
+        return self.recognizer.recognize_google(audio_data, language=language)
+
+
+class SphinxEngine(STTEngine):
+    """CMU PocketSphinx: fully offline, CPU only, lower accuracy."""
+    name = "sphinx"
+    offline = True
+
+    def transcribe(self, audio_data, language="en-US"):
+        return self.recognizer.recognize_sphinx(audio_data, language=language)
+
+
+class FasterWhisperEngine(STTEngine):
+    """
+    Local Whisper via faster-whisper on CPU (int8).
+    The model is loaded once and reused; speech_recognition's own
+    recognize_faster_whisper reloads it on every call.
+    """
+    name = "faster_whisper"
+    offline = True
+
+    def __init__(self, model=WhisperModel):
+        super().__init__()
+        self.model_name = model
+        self._model = None
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        with self._lock:
+            if self._model is None:
+                try:
+                    from faster_whisper import WhisperModel as _WhisperModel
+                except ImportError:
+                    raise sr.RequestError("missing faster-whisper module: ensure that faster-whisper is set up correctly.")
+                self._model = _WhisperModel(self.model_name, device="cpu", compute_type="int8")
+        return self._model
+
+    def transcribe(self, audio_data, language="en-US"):
+        model = self.warm_up()
+        pcm = np.frombuffer(audio_data.get_raw_data(convert_rate=16000, convert_width=2), dtype=np.int16)
+        audio = pcm.astype(np.float32) / 32768.0
+
+        lang = language.split("-")[0].lower() if language else None
+        segments, _ = model.transcribe(audio, language=lang, beam_size=1)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+ENGINES = {
+    GoogleEngine.name: GoogleEngine,
+    SphinxEngine.name: SphinxEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_engine(name=None):
+    """Shared engine instance by name (defaults to STTEngine from .env)."""
+    name = (name or DefaultEngine).strip().lower()
+    if name not in ENGINES:
+        raise ValueError(f"Unknown STT engine '{name}'. Available: {', '.join(ENGINES)}")
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = ENGINES[name]()
+        return _instances[name]
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+TTSCacheDir = env_vars.get("TTSCacheDir", os.path.join("Data", "tts_cache"))
+TTSCacheMaxMB = float(env_vars.get("TTSCacheMaxMB", 50))       # On-disk budget
+TTSCacheMemoryMB = float(env_vars.get("TTSCacheMemoryMB", 8))  # Hot phrases kept as bytes
+
+
+def cache_key(voice: str, text: str) -> str:
+    return hashlib.sha256(f"{voice}\0{text}".encode("utf-8")).hexdigest()
+
+
+class _LRUBytes:
+    """Size-bounded LRU of key -> size (and optionally the bytes themselves)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total = 0
+        self.entries = OrderedDict()
+
+    def touch(self, key):
+        self.entries.move_to_end(key)
+
+    def add(self, key, size, value=None):
+        if key in self.entries:
+            self.total -= self.entries.pop(key)[0]
+        self.entries[key] = (size, value)
+        self.total += size
+
+    def pop_oldest(self):
+        key, (size, _) = self.entries.popitem(last=False)
+        self.total -= size
+        return key
+
+    def over_budget(self):
+        return self.total > self.max_bytes and len(self.entries) > 1
+
+
+class SpeechCache:
+    """
+    Content-addressed cache of synthesized speech, keyed by (voice, text).
+
+    Each clip is stored once as <sha256>.mp3 under `directory`; the disk tier
+    is evicted least-recently-used beyond `max_bytes`. Recently played clips
+    are also kept in memory so a repeated phrase costs a dict lookup, not a
+    file read. The disk index is built lazily from file mtimes on first use,
+    and hits refresh the mtime so LRU order survives restarts.
+    """
+
+    def __init__(self, directory=TTSCacheDir, max_bytes=TTSCacheMaxMB * 1024 * 1024,
+                 memory_bytes=TTSCacheMemoryMB * 1024 * 1024):
+        self.directory = directory
+        self._disk = _LRUBytes(max_bytes)
+        self._memory = _LRUBytes(memory_bytes)
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".mp3")
+
+    def _load_index(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.isdir(self.directory):
+            return
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".mp3") and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self._disk.add(key, size)
+        self._evict()
+
+    def _evict(self):
+        while self._disk.over_budget():
+            key = self._disk.pop_oldest()
+            self._memory.entries.pop(key, None)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.counters["evictions"] += 1
+        while self._memory.over_budget():
+            self._memory.pop_oldest()
+
+    def get(self, voice, text):
+        """Cached audio bytes, or None on a miss."""
+        key = cache_key(voice, text)
+        with self._lock:
+            self._load_index()
+            if key in self._memory.entries:
+                self._memory.touch(key)
+                self._disk.touch(key)
+                self.counters["memory_hits"] += 1
+                return self._memory.entries[key][1]
+            if key not in self._disk.entries:
+                self.counters["misses"] += 1
+                return None
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._disk.entries.pop(key, None)
+                self.counters["misses"] += 1
+            return None
+
+        with self._lock:
+            self.counters["disk_hits"] += 1
+            if key in self._disk.entries:
+                self._disk.touch(key)
+            self._memory.add(key, len(audio), audio)
+            self._evict()
+        return audio
+
+    def contains(self, voice, text):
+        key = cache_key(voice, text)
+        with self._lock:
+            self._load_index()
+            return key in self._disk.entries
+
+    def put(self, voice, text, audio):
+        key = cache_key(voice, text)
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(audio)
+        os.replace(tmp, path)  # Readers never see a partial clip
+
+        with self._lock:
+            self._load_index()
+            self._disk.add(key, len(audio))
+            self._memory.add(key, len(audio), audio)
+            self.counters["writes"] += 1
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            hits = self.counters["memory_hits"] + self.counters["disk_hits"]
+            lookups = hits + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._disk.entries),
+                "disk_bytes": self._disk.total,
+                "memory_bytes": self._memory.total,
+            }
@@ -0,0 +1,102 @@
+import re
+
+ABBREVIATIONS = ("mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "etc.", "e.g.", "i.e.")
+MIN_SENTENCE_CHARS = 12  # Don't send "Yes." and "Sure." to TTS as separate clips
+
+_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s+|\n+")
+
+
+def strip_tag(chunks, tag="</s>"):
+    """
+    Yields streamed text with every `tag` removed, including one split across
+    chunks: a tail that could still turn into the tag is held back until the
+    next chunk shows whether it does.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer = (buffer + chunk).replace(tag, "")
+        held = next((n for n in range(min(len(tag) - 1, len(buffer)), 0, -1) if tag.startswith(buffer[-n:])), 0)
+        if len(buffer) > held:
+            yield buffer[:len(buffer) - held]
+            buffer = buffer[len(buffer) - held:]
+    if buffer:
+        yield buffer
+
+
+class SentenceSplitter:
+    """Splits streamed text into sentences as soon as each one is complete."""
+
+    def __init__(self, min_chars=MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, chunk):
+        """Add a chunk of model output; returns the sentences it completed."""
+        self._buffer += chunk
+        sentences = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            candidate = self._buffer[start:match.end()].strip()
+            if not candidate:
+                start = match.end()
+                continue
+            last_word = candidate.split()[-1].lower()
+            if last_word in ABBREVIATIONS or (len(candidate) < self.min_chars and "\n" not in match.group()):
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self):
+        """Whatever is left once the stream has ended."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+class SpokenStream:
+    """
+    Speaks a token stream sentence by sentence while it is still being generated.
+
+    Iterating yields each sentence at the moment it is queued for speech, so a
+    display can show exactly what is being said; sentence 1 is already playing
+    while the model is producing sentence 2. `speak` is any callable that
+    queues text and returns a handle (TextToSpeech.speak by default).
+    """
+
+    def __init__(self, chunks, speak=None):
+        if speak is None:
+            from Backend.TextToSpeech import speak
+        self._chunks = iter(chunks)
+        self._speak = speak
+        self._splitter = SentenceSplitter()
+        self.sentences = []
+        self.handles = []
+
+    @property
+    def text(self):
+        return " ".join(self.sentences)
+
+    def _queue(self, sentence):
+        self.sentences.append(sentence)
+        handle = self._speak(sentence)
+        if handle is not None:
+            self.handles.append(handle)
+        return sentence
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            for sentence in self._splitter.feed(chunk):
+                yield self._queue(sentence)
+        for sentence in self._splitter.flush():
+            yield self._queue(sentence)
+
+    def wait(self, timeout=None):
+        """Consume the rest of the stream and block until everything has been spoken."""
+        for _ in self:
+            pass
+        return all(handle.wait(timeout) for handle in self.handles)
+
+    def cancel(self):
+        for handle in self.handles:
+            handle.cancel()
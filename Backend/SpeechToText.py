@@ -2,18 +2,38 @@ from dotenv import dotenv_values
 import speech_recognition as sr
 import os
 import mtranslate as mt
-import sounddevice as sd
-import numpy as np
-import scipy.io.wavfile as wav
 import time
-import queue
+from concurrent.futures import ThreadPoolExecutor
+from Backend.AudioCapture import get_capture_service, CaptureStallTimeout
+from Backend.audio_utils import UtteranceBuffer
+from Backend.STTEngines import get_engine, ConfirmationEngine, Hypothesis
+from Backend.VoiceActivity import AdaptiveVAD, VADMinThreshold, SPEECH_START, SPEECH_END, MAX_DURATION, WAIT_TIMEOUT
+from Backend.ConfirmationDecoder import (ConfirmationDecoder, ConfirmationResult, KeywordSpotter, ConfirmationMode,
+                                         classify_text, decision_stats)
 
 # Load environment variables
 env_vars = dotenv_values(".env")
 InputLanguage = env_vars.get("InputLanguage", "en")
-EnergyThreshold = int(env_vars.get("EnergyThreshold", 400)) # Amplitude threshold
 RecordTimeout = float(env_vars.get("RecordTimeout", 5))
 SeachTimeout = float(env_vars.get("SeachTimeout", 2)) # Silence time to stop recording
+PartialEngine = env_vars.get("PartialSTTEngine")  # Defaults to STTEngine
+PartialInterval = float(env_vars.get("PartialInterval", 0.7)) # Seconds of new audio between partial results
+
+# Partial hypotheses are recognized off the capture loop, one at a time
+_partial_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-partial")
+
+# One VAD per listener so each keeps its noise-floor estimate across turns
+_vads = {}
+
+def _get_vad(name, capture, **kwargs):
+    vad = _vads.get(name)
+    if vad is None or vad.samplerate != capture.samplerate:
+        vad = AdaptiveVAD(capture.samplerate, capture.blocksize, **kwargs)
+        _vads[name] = vad
+    for key, value in kwargs.items():
+        setattr(vad, key, value)
+    vad.reset()
+    return vad
 
 def QueryModifier(Query):
     new_query = Query.lower().strip()
@@ -47,231 +67,355 @@ def SetAssistantStatus(Status):
     with open(os.path.join(TempDirPath, "Status.data"), "w", encoding='utf-8') as file:
         file.write(Status)
 
-def SpeechRecognition():
-    recognizer = sr.Recognizer()
-    recognizer.energy_threshold = EnergyThreshold
-    recognizer.dynamic_energy_threshold = False 
-    recognizer.pause_threshold = 0.8  # Short pause before considering phrase complete
+def _partial_transcribe(engine, audio_data):
+    try:
+        return engine.transcribe(audio_data, language="en-US")
+    except (sr.UnknownValueError, sr.RequestError):
+        return ""
+
+def SpeechRecognitionStream(partials=True):
+    """
+    Generator version of SpeechRecognition().
+    While the user is speaking, the audio recorded so far is re-recognized in
+    the background every PartialInterval seconds and each new result is
+    yielded as a partial Hypothesis, so callers can start routing before the
+    silence timeout expires. The last item is always the final Hypothesis
+    (the same text SpeechRecognition() returns, "" on failure).
+    Partials are English only; translated input only yields the final result.
+    """
+    engine = get_engine()
+    partials = partials and "en" in InputLanguage.lower()
     
     print("Initializing microphone...")
     SetAssistantStatus("Initializing...")
     
-    # Queue to hold audio blocks
-    q = queue.Queue()
-    
-    def callback(indata, frames, time, status):
-        # This is called (from a separate thread) for each audio block.
-        if status:
-            print(status, flush=True)
-        q.put(indata.copy())
-
-    device_info = sd.query_devices(kind='input')
-    samplerate = int(device_info['default_samplerate'])
-    
-    # We will record raw audio
-    # State machine: 
-    # 0 = Waiting for speech (RMS < Threshold)
-    # 1 = Recording speech (RMS > Threshold)
-    # 2 = Silence timeout (RMS < Threshold for X seconds) -> OFF
-    
-    status_print = False
+    # We will record raw audio from the shared, always-open capture stream
+    # State machine (AdaptiveVAD): 
+    # WAITING = RMS below noise floor x start ratio
+    # SPEECH  = Recording until RMS stays below noise floor x end ratio for SeachTimeout
+    # DONE    = Silence timeout or RecordTimeout reached -> OFF
     
     try:
-        with sd.InputStream(samplerate=samplerate, channels=1, callback=callback, dtype='int16'):
-            print("Listening... (Speak now)")
-            SetAssistantStatus("Listening...")
+        capture = get_capture_service()
+        samplerate = capture.samplerate
+        turn_start = capture.flush()
+        vad = _get_vad("main", capture, silence_timeout=SeachTimeout, max_duration=RecordTimeout)
+
+        print("Listening... (Speak now)")
+        SetAssistantStatus("Listening...")
+        
+        # Sized for the longest utterance we accept, so blocks are copied in exactly once
+        frames = UtteranceBuffer(samplerate, capture.preroll_seconds + RecordTimeout + SeachTimeout)
+        
+        partial_engine = get_engine(PartialEngine) if partials else None
+        pending = None          # Future of the partial currently being recognized
+        snapshot_len = 0        # Samples covered by the last partial request
+        last_partial = ""
+        restarted = False
+        
+        while True:
+            seq, data = capture.read(timeout=CaptureStallTimeout)
+            if data is None:
+                # No audio at all for CaptureStallTimeout: the device stalled or vanished
+                if vad.triggered:
+                    print("Capture stalled mid-utterance. Processing what we have...")
+                    break
+                if restarted:
+                    raise RuntimeError("capture stream stalled after a restart")
+                turn_start = capture.restart()
+                restarted = True
+                continue
+            restarted = False
             
-            frames = []
-            recording = False
-            last_speech_time = 0
-            start_speech_time = 0
+            # RMS is computed on the int16 block directly and compared against
+            # thresholds derived from the rolling noise floor
+            event = vad.process(data)
             
-            while True:
-                data = q.get()
-                
-                # Calculate energy (RMS)
-                # int16 range is -32768 to 32767. 
-                # RMS can be large. 
-                # We need to convert to float for calculation or handle overflow
-                temp_data = data.astype(np.float64)
-                rms = np.sqrt(np.mean(temp_data**2))
-                
-                current_time = time.time()
-                
-                if rms > EnergyThreshold:
-                    if not recording:
-                        print("Speech Detected! Recording...")
-                        SetAssistantStatus("Listening (Speech Detected)...")
-                        recording = True
-                        start_speech_time = current_time
-                        
-                    last_speech_time = current_time
-                    frames.append(data)
-                
-                elif recording:
-                    # We are currently recording but instant energy is low.
-                    # Check if we have timed out (silence for X seconds)
-                    frames.append(data) # Keep recording silence briefly
-                    
-                    if current_time - last_speech_time > SeachTimeout:
-                        print("Silence detected. Processing...")
-                        break
-                        
-                    if current_time - start_speech_time > RecordTimeout:
-                        print("Max recording time reached. Processing...")
-                        break
-                        
-                else:
-                    # Waiting for speech, just discard (or keep a small buffer if we wanted pre-roll)
-                    pass
+            if event == SPEECH_START:
+                print(f"Speech Detected! Recording... (RMS {vad.last_rms:.0f}, floor {vad.noise_floor:.0f})")
+                SetAssistantStatus("Listening (Speech Detected)...")
+                # Pre-roll: the blocks just before onset hold the first syllable
+                frames.append(capture.preroll(seq, since=turn_start))
             
-            # End of loop, we have `frames` with audio
-            print("Finished recording.")
-            SetAssistantStatus("Recognizing...")
+            if vad.triggered:
+                # Keep recording through short pauses (hysteresis handles the end)
+                frames.append(data)
             
-            # Concatenate all blocks
-            recording_data = np.concatenate(frames, axis=0)
+            if partial_engine and vad.triggered:
+                if pending is not None and pending.done():
+                    text = pending.result()
+                    pending = None
+                    if text and text != last_partial:
+                        last_partial = text
+                        yield Hypothesis(QueryModifier(text))
+                # One partial in flight at a time; the recorded region is never
+                # rewritten, so the snapshot shares memory with `frames`
+                if pending is None and len(frames) - snapshot_len >= PartialInterval * samplerate:
+                    snapshot_len = len(frames)
+                    pending = _partial_executor.submit(_partial_transcribe, partial_engine, frames.to_audio_data())
             
-            # Save to temp wav
-            temp_wav = "temp_input.wav"
-            wav.write(temp_wav, samplerate, recording_data)
+            if event == SPEECH_END:
+                print("Silence detected. Processing...")
+                break
+                
+            if event == MAX_DURATION:
+                print("Max recording time reached. Processing...")
+                break
+        
+        # End of loop, we have `frames` with audio
+        print("Finished recording.")
+        SetAssistantStatus("Recognizing...")
+        
+        # Hand the recorded buffer to SpeechRecognition in memory (no temp wav)
+        audio_data = frames.to_audio_data()
+        
+        # Process with the configured STT engine (STTEngine in .env)
+        try:
+            text = engine.transcribe(audio_data, language="en-US" if "en" in InputLanguage else InputLanguage)
+            
+            print(f"User said ({engine.name}): {text}")
+            SetAssistantStatus("Processing...")
             
-            # Process with SpeechRecognition
-            try:
-                with sr.AudioFile(temp_wav) as source:
-                    audio_data = recognizer.record(source)
-                    # Use Google Speech Recognition
-                    text = recognizer.recognize_google(audio_data, language="en-US" if "en" in InputLanguage else InputLanguage)
-                    
-                    print(f"User said: {text}")
-                    SetAssistantStatus("Processing...")
-                    
-                    if InputLanguage.lower() == "en" or "en" in InputLanguage.lower():
-                        return QueryModifier(text)
-                    else:
-                        SetAssistantStatus("Translating...")
-                        return QueryModifier(UniversalTranslator(text))
-
-            except sr.UnknownValueError:
-                print("Could not understand audio")
-                return ""
-            except sr.RequestError as e:
-                print(f"Could not request results; {e}")
-                return ""
-            finally:
-                if os.path.exists(temp_wav):
-                    os.remove(temp_wav)
+            if InputLanguage.lower() == "en" or "en" in InputLanguage.lower():
+                yield Hypothesis(QueryModifier(text), final=True)
+            else:
+                SetAssistantStatus("Translating...")
+                yield Hypothesis(QueryModifier(UniversalTranslator(text)), final=True)
+
+        except sr.UnknownValueError:
+            print("Could not understand audio")
+            yield Hypothesis("", final=True)
+        except sr.RequestError as e:
+            print(f"Could not request results; {e}")
+            yield Hypothesis("", final=True)
 
     except Exception as e:
         print(f"Error in speech recognition: {e}")
-        return ""
+        yield Hypothesis("", final=True)
+
+
+def SpeechRecognition():
+    for hypothesis in SpeechRecognitionStream(partials=False):
+        if hypothesis.final:
+            return hypothesis.text
+    return ""
 
 
 def SpeechRecognitionConfirmation(timeout=5, energy_threshold_override=None):
     """
     Dedicated mode for capturing short Yes/No confirmations.
-    Uses sounddevice (Raw) to bypass PyAudio dependency.
+    Reads from the shared capture stream (sounddevice, no PyAudio dependency).
     """
-    recognizer = sr.Recognizer()
-    recognizer.energy_threshold = energy_threshold_override if energy_threshold_override else EnergyThreshold
-    recognizer.dynamic_energy_threshold = False 
-    recognizer.pause_threshold = 0.6 
+    engine = get_engine(ConfirmationEngine)
     
     print(f"Initializing confirmation listener (Timeout: {timeout}s)...")
     
-    q = queue.Queue()
-    
-    def callback(indata, frames, time, status):
-        # Callback for sounddevice
-        if status:
-            print(status, flush=True)
-        q.put(indata.copy())
-
     try:
-        device_info = sd.query_devices(kind='input')
-        samplerate = int(device_info['default_samplerate'])
+        capture = get_capture_service()
+        samplerate = capture.samplerate
+        turn_start = capture.flush()
+        # Silence timeout and max duration are shorter for confirmation
+        vad = _get_vad("confirmation", capture, silence_timeout=0.8, max_duration=3.0, wait_timeout=timeout,
+                       min_threshold=energy_threshold_override or VADMinThreshold)
         
-        with sd.InputStream(samplerate=samplerate, channels=1, callback=callback, dtype='int16'):
-            print("Confirmation Listening... (Say YES or NO)")
+        print("Confirmation Listening... (Say YES or NO)")
+        
+        frames = UtteranceBuffer(samplerate, capture.preroll_seconds + 4.0)
+        
+        start_time = time.time()
+        
+        while True:
+            # Global safety timeout
+            if time.time() - start_time > timeout + 2.0: 
+                print("Confirmation Timeout (Hard Limit).")
+                break
+
+            seq, data = capture.read(timeout=0.5)
+            if data is None:
+                # Check overall timeout if queue is empty
+                if time.time() - start_time > timeout and not vad.triggered:
+                     print("Confirmation Timeout (No speech).")
+                     break
+                continue
             
-            frames = []
-            recording = False
-            last_speech_time = 0
-            start_speech_time = 0
+            event = vad.process(data)
             
-            start_time = time.time()
+            if event == SPEECH_START:
+                print("Confirmation Speech Detected!")
+                frames.append(capture.preroll(seq, since=turn_start))
             
-            while True:
-                # Global safety timeout
-                if time.time() - start_time > timeout + 2.0: 
-                    print("Confirmation Timeout (Hard Limit).")
-                    break
-
-                try:
-                    data = q.get(timeout=0.5)
-                except queue.Empty:
-                    # Check overall timeout if queue is empty
-                    if time.time() - start_time > timeout and not recording:
-                         print("Confirmation Timeout (No speech).")
-                         break
-                    continue
-                
-                temp_data = data.astype(np.float64)
-                rms = np.sqrt(np.mean(temp_data**2))
-                current_time = time.time()
-                
-                if rms > recognizer.energy_threshold:
-                    if not recording:
-                        print("Confirmation Speech Detected!")
-                        recording = True
-                        start_speech_time = current_time
-                    last_speech_time = current_time
-                    frames.append(data)
-                
-                elif recording:
-                    frames.append(data)
-                    # Silence timeout (shorter for confirmation)
-                    if current_time - last_speech_time > 0.8:  # 0.8s silence
-                        print("Confirmation Silence detected. Stop.")
-                        break
-                    # Max duration for confirmation (short)
-                    if current_time - start_speech_time > 3.0: 
-                         print("Confirmation Max duration. Stop.")
-                         break
-                else:
-                    # Waiting... Check timeout
-                    if current_time - start_time > timeout:
-                        print("Confirmation Timeout (Wait expired).")
-                        break
+            if vad.triggered and event != WAIT_TIMEOUT:
+                frames.append(data)
             
-            if not frames:
-                return ""
-                
-            print("Processing Confirmation...")
-            recording_data = np.concatenate(frames, axis=0)
-            temp_wav = "temp_confirm.wav"
-            wav.write(temp_wav, samplerate, recording_data)
+            if event == SPEECH_END:
+                print("Confirmation Silence detected. Stop.")
+                break
+            if event == MAX_DURATION:
+                print("Confirmation Max duration. Stop.")
+                break
+            if event == WAIT_TIMEOUT:
+                print("Confirmation Timeout (Wait expired).")
+                break
+        
+        if not frames:
+            return ""
             
-            try:
-                with sr.AudioFile(temp_wav) as source:
-                    audio_data = recognizer.record(source)
-                    text = recognizer.recognize_google(audio_data, language="en-US")
-                    print(f"Confirmation Heard: {text}")
-                    return text.lower().strip()
-            except sr.UnknownValueError:
-                print("Confirmation: Audio not understood.")
-                return ""
-            except Exception as e:
-                print(f"Confirmation Error: {e}")
-                return ""
-            finally:
-                if os.path.exists(temp_wav):
-                    os.remove(temp_wav)
-                    
+        print("Processing Confirmation...")
+        audio_data = frames.to_audio_data()
+        
+        try:
+            text = engine.transcribe(audio_data, language="en-US")
+            print(f"Confirmation Heard ({engine.name}): {text}")
+            return text.lower().strip()
+        except sr.UnknownValueError:
+            print("Confirmation: Audio not understood.")
+            return ""
+        except Exception as e:
+            print(f"Confirmation Error: {e}")
+            return ""
+                
     except Exception as e:
         print(f"Confirmation Microphone Error: {e}")
         return ""
 
+_spotter = None
+
+def _get_spotter():
+    global _spotter
+    if _spotter is None:
+        _spotter = KeywordSpotter()
+    return _spotter
+
+def _finish_spotter(spotter):
+    """End the spotter's utterance; its final keywords, or [] if it failed."""
+    try:
+        return spotter.finish()
+    except Exception as e:
+        print(f"Keyword spotter failed, using full recognition: {e}")
+        return []
+
+def ConfirmationKeywordRecognition(timeout=5, mode=ConfirmationMode):
+    """
+    Yes/No confirmation with a keyword-spotting fast path.
+    Each block is fed to a small fixed-vocabulary decoder while the user is
+    still speaking, and the call returns as soon as any NO word is spotted.
+    Everything else, including every YES, is decided by the full
+    confirmation engine on the whole utterance (the same path as
+    SpeechRecognitionConfirmation), as is any utterance during which the
+    spotter fails. mode="transcribe" skips the spotter, for comparing
+    decision latency against the existing path.
+
+    Returns a ConfirmationResult; latency_ms runs from speech onset to decision.
+    """
+    print(f"Initializing confirmation listener (Timeout: {timeout}s, mode: {mode})...")
+
+    spotter = None
+    if mode == "keyword":
+        try:
+            spotter = _get_spotter()
+            spotter.warm_up()
+        except Exception as e:
+            print(f"Keyword spotter unavailable, using full recognition: {e}")
+            spotter = None
+
+    try:
+        capture = get_capture_service()
+        samplerate = capture.samplerate
+        turn_start = capture.flush()
+        vad = _get_vad("confirmation", capture, silence_timeout=0.8, max_duration=3.0, wait_timeout=timeout,
+                       min_threshold=VADMinThreshold)
+        decoder = ConfirmationDecoder()
+        words = []
+
+        print("Confirmation Listening... (Say YES or NO)")
+
+        frames = UtteranceBuffer(samplerate, capture.preroll_seconds + 4.0)
+        start_time = time.time()
+        speech_onset = None
+
+        while True:
+            if time.time() - start_time > timeout + 2.0:
+                print("Confirmation Timeout (Hard Limit).")
+                break
+
+            seq, data = capture.read(timeout=0.5)
+            if data is None:
+                if time.time() - start_time > timeout and not vad.triggered:
+                    print("Confirmation Timeout (No speech).")
+                    break
+                continue
+
+            event = vad.process(data)
+
+            if event == SPEECH_START:
+                print("Confirmation Speech Detected!")
+                speech_onset = time.perf_counter()
+                preroll = capture.preroll(seq, since=turn_start)
+                frames.append(preroll)
+                if spotter:
+                    try:
+                        spotter.start(samplerate)
+                        spotter.feed(preroll)
+                    except Exception as e:
+                        print(f"Keyword spotter failed, using full recognition: {e}")
+                        spotter = None
+
+            if vad.triggered and event != WAIT_TIMEOUT:
+                frames.append(data)
+                if spotter:
+                    try:
+                        words = spotter.feed(data)
+                    except Exception as e:
+                        print(f"Keyword spotter failed, using full recognition: {e}")
+                        spotter = None
+                        words = []
+                    decision, confidence, margin = decoder.update(words)
+                    if decision:
+                        _finish_spotter(spotter)
+                        result = ConfirmationResult(decision, "keyword", " ".join(words), confidence, margin,
+                                                    (time.perf_counter() - speech_onset) * 1000)
+                        decision_stats.record(result)
+                        return result
+
+            if event in (SPEECH_END, MAX_DURATION, WAIT_TIMEOUT):
+                print(f"Confirmation stop: {event}")
+                break
+
+        if not frames:
+            return ConfirmationResult(None, "timeout")
+
+        # No NO spotted: the utterance is over, a YES needs the full transcript to agree
+        if spotter and vad.triggered:
+            words = _finish_spotter(spotter)
+            decision, confidence, margin = decoder.update(words)
+            if decision:
+                result = ConfirmationResult(decision, "keyword", " ".join(words), confidence, margin,
+                                            (time.perf_counter() - speech_onset) * 1000)
+                decision_stats.record(result)
+                return result
+
+        engine = get_engine(ConfirmationEngine)
+        print("Processing Confirmation...")
+        try:
+            text = engine.transcribe(frames.to_audio_data(), language="en-US").lower().strip()
+            print(f"Confirmation Heard ({engine.name}): {text}")
+        except sr.UnknownValueError:
+            print("Confirmation: Audio not understood.")
+            text = ""
+        except Exception as e:
+            print(f"Confirmation Error: {e}")
+            text = ""
+
+        decision = classify_text(text)
+        result = ConfirmationResult(decision, "fallback", text, 1.0 if decision else 0.0, 1.0 if decision else 0.0,
+                                    (time.perf_counter() - speech_onset) * 1000 if speech_onset else 0.0)
+        decision_stats.record(result)
+        return result
+
+    except Exception as e:
+        print(f"Confirmation Microphone Error: {e}")
+        return ConfirmationResult(None, "timeout")
+
 if __name__ == "__main__":
     while True:
         Text = SpeechRecognition()
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+from collections import Counter
+
+from dotenv import dotenv_values
+
+env_vars = dotenv_values(".env")
+TTSUsageFile = env_vars.get("TTSUsageFile", os.path.join("Data", "tts_usage.json"))
+TTSWarmupTopN = int(env_vars.get("TTSWarmupTopN", 30))
+MAX_TRACKED_CHARS = 120  # Long answers never repeat verbatim; don't track them
+
+# Fixed phrases spoken by the orchestrator, feedback layer, confirmations and calibration
+PHRASE_INVENTORY = [
+    # FridayOrchestrator.start
+    "FRIDAY System Online. Waiting for command.",
+    "Shutting down.",
+    "I'm not sure what you mean. Could you clarify?",
+    "I couldn't understand that command.",
+    "I couldn't generate a plan for that.",
+    "Done.",
+    "A critical system error occurred.",
+    # FeedbackLayer.speak_error
+    "I encountered an issue:",
+    # wait_for_user_confirmation / secure_send_whatsapp
+    "Please say YES to send the message or NO to cancel.",
+    "Cancelled.",
+    "I didn't hear you. Please say Yes or No.",
+    "I didn't get a confirmation. Aborting safely.",
+    "I could not confirm that the chat switched. Aborting for safety.",
+    # MediaController.calibrate
+    "Starting Media Calibration. Please follow the instructions.",
+    "Please open Spotify and hover over the search bar. I will record the position in 5 seconds.",
+    "Recorded.",
+    "Now search for a song, and hover over the first track result. Recording in 5 seconds.",
+    "Please open YouTube in your browser, search for something, and hover over the first video thumbnail. Recording in 5 seconds.",
+    "Calibration complete. settings saved.",
+    "I couldn't reliably start playback on any platform.",
+]
+
+
+class PhraseUsage:
+    """How often each short phrase was spoken, persisted across sessions."""
+
+    def __init__(self, path=TTSUsageFile):
+        self.path = path
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._dirty = False
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.counts.update(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"[TTS] Could not load phrase usage: {e}")
+
+    def record(self, text):
+        if len(text) > MAX_TRACKED_CHARS:
+            return
+        with self._lock:
+            self.counts[text] += 1
+            self._dirty = True
+
+    def top(self, n):
+        with self._lock:
+            return [text for text, _ in self.counts.most_common(n)]
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = dict(self.counts)
+            self._dirty = False
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp, self.path)
+
+
+class SpeechWarmup:
+    """
+    Renders a phrase list into the speech cache on a background thread.
+
+    Runs at low priority: it waits whenever `is_busy()` reports live speech
+    in the pipeline and pauses `gap` seconds between phrases, so it never
+    sits in front of a real utterance.
+    """
+
+    def __init__(self, cache, synthesize, voice, phrases, is_busy=lambda: False, gap=0.1):
+        self.cache = cache
+        self.synthesize = synthesize
+        self.voice = voice
+        self.phrases = list(dict.fromkeys(phrases))  # Dedupe, keep priority order
+        self.is_busy = is_busy
+        self.gap = gap
+        self.stats = {"rendered": 0, "already_warm": 0, "failed": 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="tts-warmup", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def run(self):
+        for phrase in self.phrases:
+            if self._stop.is_set():
+                break
+            if self.cache.contains(self.voice, phrase):
+                self.stats["already_warm"] += 1
+                continue
+            while self.is_busy():
+                if self._stop.wait(0.2):
+                    return
+            try:
+                self.cache.put(self.voice, phrase, self.synthesize(phrase))
+                self.stats["rendered"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"[TTS] Warm-up failed for '{phrase}': {e}")
+            self._stop.wait(self.gap)
@@ -0,0 +1,170 @@
+import itertools
+import queue
+import statistics
+import threading
+import time
+
+
+class SpeechHandle:
+    """
+    Returned by SpeechWorker.speak(). Utterances are spoken in the order they
+    were queued; wait() blocks until this one has finished or was cancelled.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, text):
+        self.id = next(self._ids)
+        self.text = text
+        self.queued_at = time.perf_counter()
+        self.started_at = None     # First audio out
+        self.finished_at = None
+        self.cancelled = False
+        self.error = None
+        self._done = threading.Event()
+        self._stop = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    @property
+    def time_to_first_audio(self):
+        """Seconds from speak() to playback start, or None if it never played."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.queued_at
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        self.cancelled = True
+        self._stop.set()
+
+    def _finish(self):
+        self.finished_at = time.perf_counter()
+        self._done.set()
+
+    def __repr__(self):
+        state = "cancelled" if self.cancelled else "done" if self.done else "pending"
+        return f"SpeechHandle({self.id}, {self.text[:30]!r}, {state})"
+
+
+class SpeechWorker:
+    """
+    Long-lived two-stage speech pipeline: one thread synthesizes queued text,
+    another plays it, so utterance N+1 is rendered while N is playing and
+    nothing ever talks over anything else.
+
+    The audio backend is injected:
+      synthesize(text) -> audio           (raises on failure)
+      play(audio, stop_event) -> None     (blocks until done or stop_event is set)
+      fallback(text) -> None              (optional, used when synthesis fails)
+    """
+
+    def __init__(self, synthesize, play, fallback=None, max_ready=2):
+        self._synthesize = synthesize
+        self._play = play
+        self._fallback = fallback
+        self._pending = queue.Queue()
+        self._ready = queue.Queue(maxsize=max_ready)
+        self._lock = threading.Lock()
+        self._queued = []          # Handles not finished yet, in order
+        self._ttfa = []
+        self.counters = {"spoken": 0, "cancelled": 0, "failed": 0}
+        self._threads = []
+
+    @property
+    def running(self):
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        if self.running:
+            return self
+        self._threads = [
+            threading.Thread(target=self._synth_loop, name="tts-synth", daemon=True),
+            threading.Thread(target=self._play_loop, name="tts-play", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def speak(self, text):
+        """Queue `text` and return immediately with its SpeechHandle."""
+        handle = SpeechHandle(text)
+        with self._lock:
+            self._queued.append(handle)
+        self._pending.put(handle)
+        return handle
+
+    def cancel(self):
+        """Barge-in: stop the current utterance and drop everything queued."""
+        with self._lock:
+            handles = list(self._queued)
+        for handle in handles:
+            handle.cancel()
+        return len(handles)
+
+    def queue_depth(self):
+        with self._lock:
+            return len(self._queued)
+
+    def metrics(self):
+        with self._lock:
+            ttfa = list(self._ttfa)
+            depth = len(self._queued)
+        return {
+            "queue_depth": depth,
+            **self.counters,
+            "ttfa_p50_ms": statistics.median(ttfa) * 1000 if ttfa else None,
+            "ttfa_max_ms": max(ttfa) * 1000 if ttfa else None,
+        }
+
+    def _finish(self, handle, key):
+        with self._lock:
+            if handle in self._queued:
+                self._queued.remove(handle)
+            self.counters[key] += 1
+            if handle.started_at is not None:
+                self._ttfa.append(handle.time_to_first_audio)
+        handle._finish()
+
+    def _synth_loop(self):
+        while True:
+            handle = self._pending.get()
+            if handle.cancelled:
+                self._finish(handle, "cancelled")
+                continue
+            try:
+                audio = self._synthesize(handle.text)
+            except Exception as e:
+                handle.error = e
+                audio = None
+            self._ready.put((handle, audio))
+
+    def _play_loop(self):
+        while True:
+            handle, audio = self._ready.get()
+            if handle.cancelled:
+                self._finish(handle, "cancelled")
+                continue
+
+            if audio is None:
+                print(f"[TTS] Synthesis failed: {handle.error}")
+                if self._fallback is None:
+                    self._finish(handle, "failed")
+                    continue
+
+            handle.started_at = time.perf_counter()
+            try:
+                if audio is None:
+                    self._fallback(handle.text)
+                else:
+                    self._play(audio, handle._stop)
+            except Exception as e:
+                print(f"[TTS] Playback failed: {e}")
+                handle.error = e
+                self._finish(handle, "failed")
+                continue
+            self._finish(handle, "cancelled" if handle.cancelled else "spoken")
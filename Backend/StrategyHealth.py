@@ -1,8 +1,16 @@
+import atexit
 import json
 import os
+import threading
+import weakref
 from dataclasses import dataclass, asdict
 
+from Backend.MemoryStore import default_store
+
 HEALTH_FILE = "memory/strategy_health.json"
+HEALTH_FLUSH_DELAY = 1.0  # Seconds updates may sit in memory before the write-behind flush
+
+_live_managers = weakref.WeakSet()
 
 @dataclass
 class StrategyHealth:
@@ -21,31 +29,74 @@ class StrategyHealth:
         return self.success_count / total
 
 class StrategyHealthManager:
-    def __init__(self):
-        os.makedirs("memory", exist_ok=True)
+    """
+    Strategy health, held in memory and written behind.
+
+    record_success/record_failure update the map immediately and schedule
+    one atomic rewrite of the file `flush_delay` seconds later, so a burst
+    of updates costs one write; pending updates are also flushed at exit and
+    before any other manager in this process loads the same file.
+    With MemoryBackend=sqlite the flush upserts into the MemoryStore instead.
+    Use get_health_manager() for the shared process-wide instance.
+    """
+
+    def __init__(self, path=HEALTH_FILE, flush_delay=HEALTH_FLUSH_DELAY, store=None):
+        # Absolute, so timer and atexit flushes land in the same file whatever the cwd is by then
+        self.path = os.path.abspath(path)
+        self.store = store or default_store()
+        if self.store is not None:
+            # Registered after the store's own close, so this runs (LIFO) while the store is still open
+            atexit.register(self.flush)
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self._signature = None  # (mtime, size) of the file as last read or written
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _flush_pending(self.path)
         self.health_map = {} # Cache
         self._load()
+        _live_managers.add(self)
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
 
     def _load(self):
-        if not os.path.exists(HEALTH_FILE):
-             self.health_map = {}
+        self.health_map = {}
+        self._signature = self._file_signature()
+        if self.store is None and not os.path.exists(self.path):
              return
 
         try:
-            with open(HEALTH_FILE, "r") as f:
-                raw_data = json.load(f)
-                # Convert raw dicts to StrategyHealth objects
-                for strategy, stats in raw_data.items():
-                    self.health_map[strategy] = StrategyHealth(
-                        success_count=stats.get("success_count", 0),
-                        failure_count=stats.get("failure_count", 0),
-                        consecutive_failures=stats.get("consecutive_failures", 0),
-                        cooldown_remaining=stats.get("cooldown_remaining", 0)
-                    )
+            if self.store is not None:
+                raw_data = self.store.items("strategy_health")
+            else:
+                with open(self.path, "r") as f:
+                    raw_data = json.load(f)
+            # Convert raw dicts to StrategyHealth objects
+            for strategy, stats in raw_data.items():
+                self.health_map[strategy] = StrategyHealth(
+                    success_count=stats.get("success_count", 0),
+                    failure_count=stats.get("failure_count", 0),
+                    consecutive_failures=stats.get("consecutive_failures", 0),
+                    cooldown_remaining=stats.get("cooldown_remaining", 0)
+                )
         except Exception as e:
             print(f"[StrategyHealth] Load failed: {e}")
             self.health_map = {}
 
+    def reload_if_changed(self):
+        """Re-read the file if something else rewrote it (one stat; skipped while updates are pending)."""
+        if self.store is not None:
+            return
+        with self._lock:
+            if not self._dirty and self._file_signature() != self._signature:
+                self._load()
+
     def _save(self):
         try:
             # Convert objects back to dicts
@@ -58,34 +109,91 @@ class StrategyHealthManager:
                 }
                 for strategy, h in self.health_map.items()
             }
-            with open(HEALTH_FILE, "w") as f:
+            if self.store is not None:
+                self.store.put_many("strategy_health", data)
+                return True
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
                 json.dump(data, f, indent=2)
+            os.replace(tmp, self.path)
+            self._signature = self._file_signature()
+            return True
         except Exception as e:
             print(f"[StrategyHealth] Save failed: {e}")
+            return False
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending updates now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            if self._save():
+                self._dirty = False  # On failure stay dirty: the next update or exit retries
 
     def get_health(self, strategy_name: str) -> StrategyHealth:
-        if strategy_name not in self.health_map:
-             self.health_map[strategy_name] = StrategyHealth()
-        return self.health_map[strategy_name]
+        with self._lock:
+            if strategy_name not in self.health_map:
+                 self.health_map[strategy_name] = StrategyHealth()
+            return self.health_map[strategy_name]
 
     def record_success(self, strategy_name: str):
-        health = self.get_health(strategy_name)
-        health.success_count += 1
-        health.failure_count = 0 # failures = 0 requested, mapping to failure_count
-        health.consecutive_failures = 0
-        health.cooldown_remaining = 0
-        self._save()
+        with self._lock:
+            health = self.get_health(strategy_name)
+            health.success_count += 1
+            health.failure_count = 0 # failures = 0 requested, mapping to failure_count
+            health.consecutive_failures = 0
+            health.cooldown_remaining = 0
+            self._mark_dirty()
         print(f"[StrategyHealth] {strategy_name} SUCCESS. New Score: {health.score:.2f}")
 
     def record_failure(self, strategy_name: str):
-        health = self.get_health(strategy_name)
-        health.failure_count += 1 
-        health.consecutive_failures += 1
-        
-        if health.consecutive_failures >= 4: # Relaxed from 2 (Part C)
-            health.cooldown_remaining = 3
-            print(f"[StrategyHealth] {strategy_name} FROZEN (Cooldown: 3)")
+        with self._lock:
+            health = self.get_health(strategy_name)
+            health.failure_count += 1 
+            health.consecutive_failures += 1
             
-        self._save()
+            if health.consecutive_failures >= 4: # Relaxed from 2 (Part C)
+                health.cooldown_remaining = 3
+                print(f"[StrategyHealth] {strategy_name} FROZEN (Cooldown: 3)")
+                
+            self._mark_dirty()
         print(f"[StrategyHealth] {strategy_name} FAILURE. New Score: {health.score:.2f}")
 
+
+
+def _flush_pending(path=None):
+    """Flush every manager in this process with unwritten updates (for `path`, or all)."""
+    for manager in list(_live_managers):
+        if path is None or manager.path == os.path.abspath(path):
+            manager.flush()
+
+
+atexit.register(_flush_pending)
+
+_health_manager = None
+_health_lock = threading.Lock()
+
+
+def get_health_manager():
+    """
+    The process-wide manager shared by StrategySelector and OutcomeManager:
+    updates are visible to every reader at once, without touching disk.
+    """
+    global _health_manager
+    with _health_lock:
+        if _health_manager is None:
+            _health_manager = StrategyHealthManager()
+        else:
+            _health_manager.reload_if_changed()
+        return _health_manager
@@ -1,11 +1,11 @@
 import json
 import os
 from Backend.contracts import Strategy
-from Backend.StrategyHealth import StrategyHealthManager
+from Backend.StrategyHealth import get_health_manager
 
 class StrategySelector:
     def __init__(self, outcome_manager=None):
-        self.health_manager = StrategyHealthManager()
+        self.health_manager = get_health_manager()
         # outcome_manager kept for legacy compatibility if passed, but logic moved to HealthManager
 
     def _rank_candidates(self, candidates: list[Strategy]) -> list[Strategy]:
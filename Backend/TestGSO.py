@@ -65,18 +65,20 @@ def test_outcome_manager():
         fallback_used=False
     )
     
-    # Verify save
+    # Verify save (outcomes are journaled, one JSON object per line)
     import json
-    if os.path.exists("memory/outcomes.json"):
-        with open("memory/outcomes.json", "r") as f:
-            data = json.load(f)
+    om.checkpoint()
+    if os.path.exists("memory/outcomes.jsonl"):
+        with open("memory/outcomes.jsonl", "r") as f:
+            data = [json.loads(line) for line in f if line.strip()]
             assert len(data) > 0
             assert data[-1]["goal_id"] == "test_goal"
+    assert om.get_strategy_stats("test_strategy")["count"] > 0
     
     print("Outcome Manager Passed!\n")
     
     # Cleanup (Clean up both memory and test_memory if confused)
-    # Current OutcomeManager forces "memory/outcomes.json" regardless of arg
+    # Current OutcomeManager forces "memory/outcomes.jsonl" regardless of arg
     pass
 
 
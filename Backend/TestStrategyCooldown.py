@@ -2,26 +2,19 @@ from Backend.StrategyHealth import StrategyHealthManager
 import unittest
 import os
 import shutil
+import tempfile
 
 class TestStrategyCooldown(unittest.TestCase):
     def setUp(self):
-        # Use a temporary memory dir or just ensure we don't break prod?
-        # StrategyHealthManager uses "memory/strategy_health.json" directly.
-        # I should back it up.
-        self.health_file = "memory/strategy_health.json"
-        self.backup_file = "memory/strategy_health.json.bak"
-        if os.path.exists(self.health_file):
-            shutil.copy(self.health_file, self.backup_file)
-            
-        self.mgr = StrategyHealthManager()
-        # Reset health for test strategy
-        if "test_strat" in self.mgr.health_map:
-            del self.mgr.health_map["test_strat"]
+        # An isolated health file, so neither the records nor the
+        # write-behind / atexit flush ever touch memory/strategy_health.json
+        self.tmp_dir = tempfile.mkdtemp()
+        self.health_file = os.path.join(self.tmp_dir, "strategy_health.json")
+        self.mgr = StrategyHealthManager(path=self.health_file)
 
     def tearDown(self):
-        # Restore backup
-        if os.path.exists(self.backup_file):
-            shutil.move(self.backup_file, self.health_file)
+        self.mgr.flush()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
 
     def test_cooldown_logic(self):
         strat = "test_strat"
@@ -1,10 +1,14 @@
 import asyncio
-import tempfile
-import os
+import atexit
+import io
+import threading
 
-import pygame
 import edge_tts
 
+from Backend.SpeechWorker import SpeechWorker
+from Backend.SpeechCache import SpeechCache
+from Backend.SpeechWarmup import PHRASE_INVENTORY, TTSWarmupTopN, PhraseUsage, SpeechWarmup
+
 # Optional offline fallback
 try:
     import pyttsx3
@@ -12,28 +16,54 @@ try:
 except ImportError:
     PYTTSX3_AVAILABLE = False
 
+VOICE = "en-US-AriaNeural"
 
-async def _edge_tts_async(text: str):
-    communicate = edge_tts.Communicate(
-        text=text,
-        voice="en-US-AriaNeural"
-    )
+speech_cache = SpeechCache()
+phrase_usage = PhraseUsage()
+# How much of this session's speech was already cached when it was queued
+session_speech = {"warm": 0, "cold": 0}
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f:
-        audio_path = f.name
 
-    await communicate.save(audio_path)
+def _synthesize_edge(text: str) -> bytes:
+    # Streamed straight into memory: no temp mp3 to write and delete
+    communicate = edge_tts.Communicate(text=text, voice=VOICE)
+    audio = bytearray()
+    for chunk in communicate.stream_sync():
+        if chunk["type"] == "audio":
+            audio.extend(chunk["data"])
+    if not audio:
+        raise RuntimeError("edge-tts returned no audio")
+    return bytes(audio)
 
-    pygame.mixer.init()
-    pygame.mixer.music.load(audio_path)
-    pygame.mixer.music.play()
 
-    while pygame.mixer.music.get_busy():
-        await asyncio.sleep(0.1)
+def _synthesize(text: str) -> bytes:
+    # Repeated phrases skip the edge-tts round-trip entirely
+    audio = speech_cache.get(VOICE, text)
+    if audio is None:
+        audio = _synthesize_edge(text)
+        speech_cache.put(VOICE, text, audio)
+    return audio
 
-    try:
-        os.remove(audio_path)
-    except Exception:
+
+_mixer_lock = threading.Lock()
+
+def _init_mixer():
+    import pygame
+    with _mixer_lock:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+    return pygame
+
+
+def _play_pygame(audio: bytes, stop_event: threading.Event):
+    pygame = _init_mixer()
+    sound = pygame.mixer.Sound(file=io.BytesIO(audio))
+    channel = sound.play()
+    # Sleep for the clip length instead of polling get_busy(); wakes early on cancel()
+    if stop_event.wait(sound.get_length()):
+        channel.stop()
+        return
+    while channel.get_busy() and not stop_event.wait(0.02):
         pass
 
 
@@ -51,20 +81,79 @@ def _fallback_pyttsx3(text: str):
         print(f"[TTS] pyttsx3 fallback failed: {e}")
 
 
-def TTS(text: str):
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_speech_worker() -> SpeechWorker:
+    """The process-wide speech worker (started on first use)."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = SpeechWorker(_synthesize, _play_pygame, fallback=_fallback_pyttsx3)
+        return _worker.start()
+
+
+def speak(text: str):
+    """Queue `text` for speech and return its SpeechHandle without waiting (None for empty text)."""
     if not text or not text.strip():
-        return
+        return None
 
     print(f"[TTS] CALLED with text: {text}")
+    phrase_usage.record(text)
+    session_speech["warm" if speech_cache.contains(VOICE, text) else "cold"] += 1
+    return get_speech_worker().speak(text)
 
-    try:
-        # If an event loop already exists, schedule task
-        try:
-            loop = asyncio.get_running_loop()
-            loop.create_task(_edge_tts_async(text))
-        except RuntimeError:
-            asyncio.run(_edge_tts_async(text))
 
-    except Exception as e:
-        print(f"[TTS] edge-tts failed: {e}")
-        _fallback_pyttsx3(text)
\ No newline at end of file
+def cancel_speech():
+    """Barge-in: stop what is playing and drop everything queued."""
+    return get_speech_worker().cancel()
+
+
+_warmup = None
+
+def start_speech_warmup(top_n=TTSWarmupTopN):
+    """
+    Pre-synthesize the fixed phrase inventory plus the most used phrases in
+    the background. Returns immediately; live speech always goes first.
+    """
+    global _warmup
+    if _warmup is None:
+        worker = get_speech_worker()
+        phrases = PHRASE_INVENTORY + phrase_usage.top(top_n)
+        _warmup = SpeechWarmup(speech_cache, _synthesize_edge, VOICE, phrases,
+                               is_busy=lambda: worker.queue_depth() > 0).start()
+    return _warmup
+
+
+def tts_metrics():
+    spoken = session_speech["warm"] + session_speech["cold"]
+    return {
+        **get_speech_worker().metrics(),
+        "cache": speech_cache.stats(),
+        "session_warm_fraction": session_speech["warm"] / spoken if spoken else None,
+        "warmup": dict(_warmup.stats) if _warmup else None,
+    }
+
+
+def _report_session():
+    phrase_usage.save()
+    spoken = session_speech["warm"] + session_speech["cold"]
+    if spoken:
+        print(f"[TTS] Session speech served warm: {session_speech['warm']}/{spoken} "
+              f"({100 * session_speech['warm'] / spoken:.0f}%)")
+
+atexit.register(_report_session)
+
+
+def TTS(text: str):
+    handle = speak(text)
+    if handle is None:
+        return
+
+    # Blocking as before, except inside a running event loop where the old
+    # behaviour was fire-and-forget; the worker keeps those calls in order.
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        handle.wait()
+    return handle
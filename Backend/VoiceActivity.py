@@ -0,0 +1,171 @@
+import math
+
+import numpy as np
+from dotenv import dotenv_values
+
+from Backend.audio_utils import read_wav_pcm
+
+env_vars = dotenv_values(".env")
+# Absolute RMS floor for speech start; a hand-tuned EnergyThreshold (the old static threshold) seeds it
+VADMinThreshold = float(env_vars.get("VADMinThreshold", env_vars.get("EnergyThreshold", 150)))
+VADStartRatio = float(env_vars.get("VADStartRatio", 3.0))         # Speech starts at noise floor x ratio
+VADEndRatio = float(env_vars.get("VADEndRatio", 1.8))             # ...and ends below noise floor x ratio
+VADFloorPercentile = float(env_vars.get("VADFloorPercentile", 20))
+VADFloorWindow = float(env_vars.get("VADFloorWindow", 3.0))       # Seconds of non-speech history
+
+# Events returned by AdaptiveVAD.process()
+SPEECH_START = "speech_start"
+SPEECH_END = "speech_end"
+MAX_DURATION = "max_duration"
+WAIT_TIMEOUT = "wait_timeout"
+
+
+class AdaptiveVAD:
+    """
+    Energy VAD with an adaptive noise floor and hysteresis.
+
+    The noise floor is a rolling percentile of block RMS measured while nobody
+    is speaking. Speech starts when RMS rises above floor * start_ratio and
+    ends after `silence_timeout` seconds below floor * end_ratio, so a noisy
+    room raises both thresholds instead of triggering on the background.
+
+    Time is measured in captured samples, not wall-clock, so a WAV fixture fed
+    block by block drives exactly the same state machine as the live stream.
+    The noise history survives reset(), letting a long-lived listener keep its
+    floor estimate across turns; only the very first `calibration` seconds are
+    spent learning the floor before speech can trigger.
+    """
+
+    WAITING = "waiting"
+    SPEECH = "speech"
+    DONE = "done"
+
+    def __init__(self, samplerate, blocksize, silence_timeout=2.0, max_duration=5.0, wait_timeout=None,
+                 min_threshold=VADMinThreshold, start_ratio=VADStartRatio, end_ratio=VADEndRatio,
+                 floor_percentile=VADFloorPercentile, floor_window=VADFloorWindow, calibration=0.25):
+        if end_ratio >= start_ratio:
+            raise ValueError("end_ratio must be below start_ratio for hysteresis")
+
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.silence_timeout = silence_timeout
+        self.max_duration = max_duration
+        self.wait_timeout = wait_timeout
+        self.min_threshold = min_threshold
+        self.start_ratio = start_ratio
+        self.end_ratio = end_ratio
+        self.floor_percentile = floor_percentile
+
+        # Reused for every block: squares of int16 samples fit in int32
+        self._scratch = np.empty(blocksize, dtype=np.int32)
+
+        window_blocks = max(int(floor_window * samplerate / blocksize), 1)
+        self._history = np.empty(window_blocks, dtype=np.float64)
+        self._history_len = 0
+        self._history_pos = 0
+        self.noise_floor = min_threshold / start_ratio
+        # Blocks observed before the first speech start is allowed (first turn only)
+        self._calibration_blocks = min(int(calibration * samplerate / blocksize), window_blocks)
+
+        self.reset()
+
+    def reset(self):
+        """Start a new turn. The noise floor estimate is kept."""
+        self.state = self.WAITING
+        self.samples_seen = 0
+        self.speech_start_time = None
+        self.last_speech_time = None
+        self.last_rms = 0.0
+
+    @property
+    def elapsed(self):
+        return self.samples_seen / self.samplerate
+
+    @property
+    def triggered(self):
+        """True from the speech-start block up to and including the block that ended the utterance."""
+        return self.state != self.WAITING
+
+    @property
+    def start_threshold(self):
+        return max(self.min_threshold, self.noise_floor * self.start_ratio)
+
+    @property
+    def end_threshold(self):
+        return self.start_threshold * self.end_ratio / self.start_ratio
+
+    def block_rms(self, block):
+        """RMS of an int16 block without widening it to float64."""
+        n = len(block)
+        if n == 0:
+            return 0.0
+        if n > len(self._scratch):
+            self._scratch = np.empty(n, dtype=np.int32)
+        squares = self._scratch[:n]
+        np.multiply(block, block, out=squares, dtype=np.int32)
+        return math.sqrt(squares.sum(dtype=np.int64) / n)
+
+    def _update_floor(self, rms):
+        self._history[self._history_pos] = rms
+        self._history_pos = (self._history_pos + 1) % len(self._history)
+        self._history_len = min(self._history_len + 1, len(self._history))
+        self.noise_floor = float(np.percentile(self._history[:self._history_len], self.floor_percentile))
+
+    def process(self, block):
+        """Feed one int16 block. Returns one of the event constants, or None."""
+        block = block.reshape(-1)
+        rms = self.block_rms(block)
+        self.last_rms = rms
+        self.samples_seen += len(block)
+        now = self.elapsed
+
+        if self.state == self.WAITING:
+            calibrated = self._history_len >= self._calibration_blocks
+            if calibrated and rms > self.start_threshold:
+                self.state = self.SPEECH
+                self.speech_start_time = now
+                self.last_speech_time = now
+                return SPEECH_START
+
+            self._update_floor(rms)
+            if self.wait_timeout is not None and now > self.wait_timeout:
+                self.state = self.DONE
+                return WAIT_TIMEOUT
+            return None
+
+        if self.state == self.SPEECH:
+            if rms > self.end_threshold:
+                self.last_speech_time = now
+
+            if now - self.last_speech_time > self.silence_timeout:
+                self.state = self.DONE
+                return SPEECH_END
+
+            if now - self.speech_start_time > self.max_duration:
+                self.state = self.DONE
+                return MAX_DURATION
+
+        return None
+
+
+def run_vad(samples, vad, blocksize=None):
+    """
+    Drives `vad` over a whole int16 signal, block by block.
+    Returns a list of (event, time_in_seconds) tuples; stops at the first terminal event.
+    """
+    blocksize = blocksize or vad.blocksize
+    events = []
+    for offset in range(0, len(samples), blocksize):
+        event = vad.process(samples[offset:offset + blocksize])
+        if event:
+            events.append((event, vad.elapsed))
+        if vad.state == vad.DONE:
+            break
+    return events
+
+
+def run_vad_on_wav(path, blocksize=1024, **vad_kwargs):
+    """Offline harness: feeds a WAV fixture through the same state machine the listeners use."""
+    samples, samplerate = read_wav_pcm(path)
+    vad = AdaptiveVAD(samplerate, blocksize, **vad_kwargs)
+    return run_vad(samples, vad), vad
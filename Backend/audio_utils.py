@@ -0,0 +1,65 @@
+import wave
+
+import numpy as np
+import speech_recognition as sr
+
+
+class UtteranceBuffer:
+    """
+    Growable int16 buffer that a single utterance is recorded into.
+    Each captured block is copied in exactly once; the filled region is then
+    handed to speech_recognition without a temp WAV file or a second copy.
+    """
+
+    def __init__(self, samplerate, seconds):
+        self.samplerate = samplerate
+        self._data = np.empty(max(int(samplerate * seconds), 1), dtype=np.int16)
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def duration(self):
+        return self.length / self.samplerate
+
+    @property
+    def samples(self):
+        return self._data[:self.length]
+
+    def append(self, block):
+        block = np.asarray(block, dtype=np.int16).reshape(-1)
+        end = self.length + len(block)
+        if end > len(self._data):
+            # Rare: utterance outgrew the estimate. Grow geometrically.
+            grown = np.empty(max(end, 2 * len(self._data)), dtype=np.int16)
+            grown[:self.length] = self._data[:self.length]
+            self._data = grown
+        self._data[self.length:end] = block
+        self.length = end
+
+    def to_audio_data(self):
+        return pcm_to_audio_data(self.samples, self.samplerate)
+
+
+def pcm_to_audio_data(samples, samplerate):
+    """
+    Wraps mono int16 PCM as sr.AudioData.
+    The AudioData references the array's memory directly (no file, no copy),
+    so the array must not be modified until recognition has finished.
+    """
+    samples = np.ascontiguousarray(samples, dtype=np.int16).reshape(-1)
+    return sr.AudioData(memoryview(samples).cast("B"), int(samplerate), 2)
+
+
+def read_wav_pcm(path):
+    """Loads a 16-bit WAV fixture as (mono int16 samples, samplerate)."""
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM, got {8 * wf.getsampwidth()}-bit")
+        channels = wf.getnchannels()
+        samplerate = wf.getframerate()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels)[:, 0]
+    return np.ascontiguousarray(samples, dtype=np.int16), samplerate
@@ -0,0 +1,101 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from Backend.normalize import normalize_text
+
+DEFAULT_CACHE_FILE = os.path.join("FRIDAY", "memory", "intent_cache.json")
+
+
+def prompt_hash(system_prompt: str) -> str:
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class IntentCache:
+    """
+    Persistent TTL + LRU cache of parsed intents.
+
+    Keys are normalize_text(utterance) under a hash of the system prompt, so
+    editing the prompt invalidates every entry (stale ones are dropped on
+    load). Values are the JSON the model returned, not Intent objects, so
+    each hit builds a fresh Intent that callers are free to mutate.
+    """
+
+    def __init__(self, system_prompt, path=DEFAULT_CACHE_FILE, ttl=24 * 3600, max_entries=500):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prompt_hash = prompt_hash(system_prompt)
+        self._entries = OrderedDict()  # normalized text -> {"data": ..., "created": ts}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidated": 0}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[IntentCache] Could not load cache: {e}")
+            return
+
+        entries = stored.get("entries", {})
+        if stored.get("prompt_hash") != self.prompt_hash:
+            # SYSTEM_PROMPT changed: everything cached was parsed under the old rules
+            self.stats["invalidated"] = len(entries)
+            return
+        now = time.time()
+        for key, entry in sorted(entries.items(), key=lambda kv: kv[1].get("last_used", 0)):
+            if now - entry.get("created", 0) < self.ttl:
+                self._entries[key] = entry
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"prompt_hash": self.prompt_hash, "entries": self._entries}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def get(self, text):
+        """Cached intent JSON for `text` (a deep copy), or None."""
+        key = normalize_text(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            if time.time() - entry["created"] >= self.ttl:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            entry["last_used"] = time.time()
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return copy.deepcopy(entry["data"])
+
+    def put(self, text, data):
+        key = normalize_text(text)
+        now = time.time()
+        with self._lock:
+            self._entries[key] = {"data": copy.deepcopy(data), "created": now, "last_used": now}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            try:
+                self._save()
+            except OSError as e:
+                print(f"[IntentCache] Could not save cache: {e}")
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {**self.stats, "entries": len(self._entries),
+                    "hit_rate": self.stats["hits"] / lookups if lookups else 0.0}
@@ -1,13 +1,18 @@
 import json
 import os
 
+from Backend.MemoryStore import default_store
+
 CONTACTS_FILE = "FRIDAY/memory/contacts.json"
 
 class ContactResolver:
-    def __init__(self):
+    def __init__(self, store=None):
+        self.store = store or default_store()
         self.contacts = self._load_contacts()
 
     def _load_contacts(self):
+        if self.store is not None:
+            return self.store.items("contact_aliases")
         if not os.path.exists(CONTACTS_FILE):
             return {}
         try:
@@ -31,6 +36,9 @@ class ContactResolver:
 
     def add_contact(self, nickname: str, real_name: str):
         self.contacts[nickname.lower()] = real_name
+        if self.store is not None:
+            self.store.put("contact_aliases", nickname.lower(), real_name)
+            return
         self._save_contacts()
 
     def _save_contacts(self):
@@ -1,4 +1,5 @@
-from Backend.TextToSpeech import TTS
+from Backend.TextToSpeech import TTS, speak, cancel_speech
+from Backend.SpeechStream import SpokenStream
 
 class FeedbackLayer:
     """
@@ -16,6 +17,19 @@ class FeedbackLayer:
         print(f"[Feedback] Speaking: {text}")
         TTS(text)
 
+    def speak_stream(self, chunks) -> SpokenStream:
+        """
+        Speak streamed model output sentence by sentence as it arrives.
+        Iterate the result to get each sentence as it starts being spoken.
+        """
+        return SpokenStream(chunks)
+
     def speak_error(self, message: str):
         print(f"[Feedback] Error: {message}")
-        TTS(f"I encountered an issue: {message}")
+        # Fixed prefix as its own clip so it comes from the speech cache
+        speak("I encountered an issue:")
+        TTS(message)
+
+    def cancel(self):
+        """Barge-in: stop speaking immediately and drop queued speech."""
+        cancel_speech()
@@ -1,4 +1,4 @@
-from Backend.SpeechToText import SpeechRecognition
+from Backend.SpeechToText import SpeechRecognition, SpeechRecognitionStream
 
 def get_user_input() -> str:
     """
@@ -18,3 +18,16 @@ def get_user_input() -> str:
     if text:
         return text.strip()
     return ""
+
+
+def get_user_input_stream():
+    """
+    Streaming Input Layer:
+    Yields partial Hypothesis objects while the user is still speaking,
+    followed by exactly one with final=True carrying the normalized text
+    (the same text get_user_input() would return).
+    """
+    for hypothesis in SpeechRecognitionStream():
+        if hypothesis.final:
+            hypothesis.text = hypothesis.text.strip()
+        yield hypothesis
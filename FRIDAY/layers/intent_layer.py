@@ -1,13 +1,15 @@
 import json
 import os
 from dotenv import dotenv_values
-from groq import Groq
+from Backend.LLMGateway import get_gateway
 from FRIDAY.core.models import Intent, ActionDomain
+from FRIDAY.core.intent_cache import IntentCache
+from Backend.LLMTelemetry import get_telemetry
 
 # Load Env
 env_vars = dotenv_values(".env")
-GroqAPIKey = env_vars.get("GroqAPIKey")
-client = Groq(api_key=GroqAPIKey)
+IntentCacheTTL = float(env_vars.get("IntentCacheTTL", 24 * 3600))
+IntentCacheSize = int(env_vars.get("IntentCacheSize", 500))
 
 SYSTEM_PROMPT = """
 You are the Intent Parsing Layer for the FRIDAY AI Assistant.
@@ -62,6 +64,9 @@ Input: "Play my last song"
 Output: {"domain": "MEDIA", "action": "play", "parameters": {"special": "last_song"}}
 """
 
+# Repeated commands ("pause music") skip the LLM; keyed on normalized text + SYSTEM_PROMPT hash
+intent_cache = IntentCache(SYSTEM_PROMPT, ttl=IntentCacheTTL, max_entries=IntentCacheSize)
+
 def parse_intent(text: str) -> Intent:
     """
     Converts raw text into a structured Intent object.
@@ -69,8 +74,20 @@ def parse_intent(text: str) -> Intent:
     if not text:
         raise ValueError("Input text cannot be empty")
 
+    data = intent_cache.get(text)
+    if data is not None:
+        get_telemetry().record("intent", cache="hit")
+        print(f"[IntentLayer] Cache hit: {data}")
+        return Intent(
+            domain=ActionDomain[data["domain"].upper()],
+            action=data.get("action", "unknown"),
+            parameters=data.get("parameters", {}),
+            original_query=text,
+            confidence=data.get("confidence", 0.0)
+        )
+
     try:
-        completion = client.chat.completions.create(
+        completion = get_gateway().chat("intent",
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -101,6 +118,9 @@ def parse_intent(text: str) -> Intent:
             confidence=data.get("confidence", 0.0)
         )
         
+        # Only well-formed, confident parses are worth repeating
+        if intent.action not in ("unknown", "error") and intent.confidence >= 0.6:
+            intent_cache.put(text, data)
         return intent
 
     except Exception as e:
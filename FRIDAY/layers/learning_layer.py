@@ -3,11 +3,20 @@ import json
 import time
 from typing import Dict, List, Optional
 from FRIDAY.core.models import Intent, IntentHints, ActionDomain, ExecutionPlan, ActionResult
+from Backend.MemoryStore import default_store
 
 MEMORY_DIR = os.path.join(os.getcwd(), "FRIDAY", "memory")
+FAILURE_LOG_SIZE = 50
 
 class LearningAdvisoryLayer:
-    def __init__(self):
+    def __init__(self, store=None):
+        # With MemoryBackend=sqlite, state lives in the shared MemoryStore instead of FRIDAY/memory/*.json
+        self.store = store or default_store()
+        if self.store is not None:
+            self.preferences = self.store.items("learning_preferences")
+            self.plan_stats = self.store.items("plan_stats")
+            self.failures = self.store.failures("learning", limit=FAILURE_LOG_SIZE)
+            return
         self._ensure_memory_dir()
         self.preferences = self._load_json("preferences.json", {})
         self.plan_stats = self._load_json("plan_stats.json", {})
@@ -39,6 +48,12 @@ class LearningAdvisoryLayer:
         except Exception as e:
             print(f"[Learning] Error saving {filename}: {e}")
 
+    def _save_preference(self, key: str):
+        if self.store is not None:
+            self.store.put("learning_preferences", key, self.preferences[key])
+        else:
+            self._save_json("preferences.json", self.preferences)
+
     # ------------------------------------------------------------------
     # 1. ADVISE (Read-Only)
     # ------------------------------------------------------------------
@@ -95,7 +110,10 @@ class LearningAdvisoryLayer:
             else:
                 stats["failure"] += 1
             
-            self._save_json("plan_stats.json", self.plan_stats)
+            if self.store is not None:
+                self.store.put("plan_stats", plan_id, stats)
+            else:
+                self._save_json("plan_stats.json", self.plan_stats)
 
             # Record Failure details if failed
             if not result.success:
@@ -109,9 +127,12 @@ class LearningAdvisoryLayer:
                 }
                 self.failures.append(failure_record)
                 # Keep log manageable (last 50)
-                if len(self.failures) > 50:
-                    self.failures = self.failures[-50:]
-                self._save_json("failures.json", self.failures)
+                if len(self.failures) > FAILURE_LOG_SIZE:
+                    self.failures = self.failures[-FAILURE_LOG_SIZE:]
+                if self.store is not None:
+                    self.store.append_failure("learning", failure_record, keep=FAILURE_LOG_SIZE)
+                else:
+                    self._save_json("failures.json", self.failures)
                 
         except Exception as e:
             print(f"[Learning] Learning update failed: {e}")
@@ -121,7 +142,7 @@ class LearningAdvisoryLayer:
     # ------------------------------------------------------------------
     def set_preference(self, key: str, value: str):
         self.preferences[key] = value
-        self._save_json("preferences.json", self.preferences)
+        self._save_preference(key)
 
     # ------------------------------------------------------------------
     # 4. MEDIA LEARNING (GMC Specific)
@@ -142,7 +163,7 @@ class LearningAdvisoryLayer:
         if song_name:
             key = f"media_history_{song_name.lower().strip()}"
             self.preferences[key] = platform
-            self._save_json("preferences.json", self.preferences)
+            self._save_preference(key)
         
         # Update global stats
         # (covered by generic learn() if we pass the plan, but specific helps)
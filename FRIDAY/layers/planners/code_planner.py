@@ -1,17 +1,11 @@
 from FRIDAY.core.models import Intent, ExecutionPlan, AutomationAction
 from FRIDAY.layers.handlers.code_handler import CodeHandler
-from groq import Groq
-from dotenv import dotenv_values
+from Backend.LLMGateway import get_gateway
 import os
 import time
 import re
 import ast
 
-# Load Env (Duplicate load - could be in core.config)
-env_vars = dotenv_values(".env")
-GroqAPIKey = env_vars.get("GroqAPIKey")
-client = Groq(api_key=GroqAPIKey)
-
 class CodePlanner:
     def __init__(self):
         self.code_handler = CodeHandler()
@@ -69,7 +63,7 @@ class CodePlanner:
         5. Do not use input() unless explicitly asked. Hardcode example values if needed to demonstrate the logic.
         """
         try:
-            completion = client.chat.completions.create(
+            completion = get_gateway().chat("codegen",
                 model="llama-3.3-70b-versatile",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.1
@@ -1,13 +1,7 @@
 from FRIDAY.core.models import Intent, ExecutionPlan, AutomationAction
-from groq import Groq
-from dotenv import dotenv_values
+from Backend.LLMGateway import get_gateway
 import os
 
-# Load Env
-env_vars = dotenv_values(".env")
-GroqAPIKey = env_vars.get("GroqAPIKey")
-client = Groq(api_key=GroqAPIKey)
-
 class GeneralPlanner:
     def plan(self, intent: Intent) -> ExecutionPlan:
         # For general questions, the "Action" is to "Speak the Answer".
@@ -25,7 +19,7 @@ class GeneralPlanner:
 
     def generate_answer(self, query: str) -> str:
         try:
-            completion = client.chat.completions.create(
+            completion = get_gateway().chat("general",
                 model="llama-3.3-70b-versatile",
                 messages=[
                     {"role": "system", "content": "You are a helpful AI assistant. Answer briefly and concisely in 1-2 sentences."},
@@ -8,8 +8,11 @@ sys.path.append(os.getcwd())
 
 from FRIDAY.core.models import Intent, ActionDomain
 from FRIDAY.core.router import DomainRouter
-from FRIDAY.layers.input_layer import get_user_input
+from FRIDAY.layers.input_layer import get_user_input_stream
 from FRIDAY.layers.intent_layer import parse_intent
+from Backend.LLMGateway import get_gateway
+from core.speculation import SpeculativeRouter, warm_up_client
+from Backend.TextToSpeech import start_speech_warmup
 from FRIDAY.layers.feedback_layer import FeedbackLayer
 from FRIDAY.layers.automation_engine import AutomationEngine
 from FRIDAY.layers.verification_engine import VerificationEngine
@@ -45,9 +48,14 @@ class FridayOrchestrator:
             # Add others as needed
         }
         
+        # parse_intent always hits the LLM: warm its connection while the user is still speaking
+        self.speculation = SpeculativeRouter({}, warmups=[lambda results: warm_up_client(get_gateway())])
+        
         self.running = True
 
     def start(self):
+        # Background, low priority: never delays the greeting or the first "Listening..."
+        start_speech_warmup()
         self.feedback.speak("FRIDAY System Online. Waiting for command.")
         print("[System] FRIDAY Online.")
         
@@ -55,7 +63,13 @@ class FridayOrchestrator:
             try:
                 # 1. INPUT LAYER
                 print("\n[Input] Listening...")
-                text = get_user_input()
+                text = ""
+                for hypothesis in get_user_input_stream():
+                    if hypothesis.final:
+                        text = hypothesis.text
+                    else:
+                        self.speculation.feed(hypothesis)
+                self.speculation.resolve(text)
                 if not text:
                     continue
                     
@@ -1,5 +1,10 @@
-from stt.listener import listen
+from stt.listener import listen_stream
 from core.supervisor import supervise
+from core.classifier import classify
+from core.modes import RequestMode
+from core.speculation import SpeculativeRouter, warm_up_client
+from Backend.LLMGateway import get_gateway
+from Backend.TextToSpeech import start_speech_warmup
 from Frontend.GUI import GraphicalUserInterface, SetAsssistantStatus
 import threading
 import sys
@@ -7,23 +12,37 @@ import sys
 # Ensure we are running from the correct directory context
 sys.path.append('d:\\JARVIS 2\\jarvis-ai-assistant')
 
+def warm_chat_client(results):
+    # GENERAL requests go to the ChatBot LLM: open a connection during the utterance tail
+    if results.get("mode") == RequestMode.GENERAL:
+        warm_up_client(get_gateway())
+
 def AssistantLoop():
     print("JARVIS Refactored Main Loop Started (Strict Domain Routing)")
     
-    # Optional: Warmup or Init checks?
+    # Routing runs speculatively on partial transcripts while the user is still speaking
+    router = SpeculativeRouter({"mode": classify}, warmups=[warm_chat_client])
+    start_speech_warmup()  # Fills the speech cache in the background
     
     while True:
         try:
             print("\nListening...")
             SetAsssistantStatus("Listening...")
-            text = listen()
+            text = ""
+            for hypothesis in listen_stream():
+                if hypothesis.final:
+                    text = hypothesis.text
+                else:
+                    router.feed(hypothesis)
             
             if not text:
+                router.reset()
                 continue
                 
             print(f"[Main] User said: {text}")
             SetAsssistantStatus("Thinking...")
-            supervise(text)
+            speculative = router.resolve(text)
+            supervise(text, mode=speculative["mode"])
             SetAsssistantStatus("Ready")
             
         except KeyboardInterrupt:
@@ -0,0 +1,69 @@
+"""
+Per-turn chat log cost: rewriting ChatLog.json (the old ChatBot behaviour)
+vs appending to the JSONL ChatStore, at several history lengths.
+
+Usage:
+    python bench_chat_log.py --sizes 100 1000 10000 --turns 20
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from Backend.ChatStore import ChatStore
+
+
+def message(i):
+    return {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " + "lorem ipsum " * 20}
+
+
+def json_rewrite_turn(path):
+    with open(path, "r") as f:
+        messages = json.load(f)
+    messages.append(message(len(messages)))
+    messages.append(message(len(messages)))
+    with open(path, "w") as f:
+        json.dump(messages, f, indent=4)
+
+
+def bench(size, turns):
+    history = [message(i) for i in range(size)]
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "ChatLog.json")
+        with open(legacy, "w") as f:
+            json.dump(history, f, indent=4)
+
+        rewrite = []
+        for _ in range(turns):
+            start = time.perf_counter()
+            json_rewrite_turn(legacy)
+            rewrite.append((time.perf_counter() - start) * 1000)
+
+        store = ChatStore(path=os.path.join(tmp, "ChatLog.jsonl"), legacy_path=None, max_messages=size * 10)
+        store.append(*history)
+        append = []
+        for _ in range(turns):
+            start = time.perf_counter()
+            _, messages = store.snapshot()
+            store.append(message(len(messages)), message(len(messages) + 1))
+            append.append((time.perf_counter() - start) * 1000)
+        store.close()
+    return statistics.median(rewrite), statistics.median(append)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="History lengths (messages)")
+    parser.add_argument("--turns", type=int, default=20, help="Turns timed per size")
+    args = parser.parse_args()
+
+    print(f"{'messages':>10}{'rewrite p50':>14}{'append p50':>14}")
+    for size in args.sizes:
+        rewrite, append = bench(size, args.turns)
+        print(f"{size:>10}{rewrite:>12.2f}ms{append:>12.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Per-operation latency of MemoryManager on the JSON files vs the SQLite
+MemoryStore, as the number of stored contacts and failures grows.
+
+For each size both backends are pre-filled with the same contacts and
+failure records, then add_contact, get_contact, record_failure and
+get_failures_by_goal are timed (median ms per call). Runs in a temporary
+directory.
+
+Usage:
+    python bench_memory_store.py --sizes 100 1000 10000 --ops 200
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from Backend.MemoryManager import MemoryManager
+from Backend.MemoryStore import MemoryStore
+
+GOAL_TYPES = ["send_message", "open_app", "play_media", "web_search"]
+OPERATIONS = ["add_contact", "get_contact", "record_failure", "failures_by_goal"]
+
+
+def failure(i):
+    return {"goal_type": GOAL_TYPES[i % len(GOAL_TYPES)], "context": f"ctx {i}", "failure_stage": "execution",
+            "failure_reason": "timeout", "timestamp": "2026-01-01T00:00:00", "user_aborted": False}
+
+
+def timed(fn, ops):
+    samples = []
+    for i in range(ops):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def prefill(memory, size):
+    if memory.store is not None:
+        memory.store.put_many("contacts", {f"contact{i}": {"phone": str(i)} for i in range(size)})
+        with memory.store.transaction():
+            for i in range(size):
+                memory.store.append_failure("memory", failure(i), goal_type=failure(i)["goal_type"])
+    else:
+        with open(memory.files["contacts"], "w") as f:
+            json.dump({f"contact{i}": {"phone": str(i)} for i in range(size)}, f, indent=4)
+        with open(memory.files["failures"], "w") as f:
+            json.dump([failure(i) for i in range(size)], f, indent=4)
+
+
+def bench(memory, size, ops):
+    prefill(memory, size)
+    return {
+        "add_contact": timed(lambda i: memory.add_contact(f"new{i}", {"phone": str(i)}), ops),
+        "get_contact": timed(lambda i: memory.get_contact(f"contact{i % size}"), ops),
+        "record_failure": timed(lambda i: memory.record_failure(failure(i)), ops),
+        "failures_by_goal": timed(lambda i: memory.get_failures_by_goal(GOAL_TYPES[i % 4]), ops),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--ops", type=int, default=200, help="Calls timed per operation")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    print(f"{'size':>8}{'backend':>10}" + "".join(f"{op:>20}" for op in OPERATIONS))
+    try:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                os.chdir(tmp)
+                store = MemoryStore(os.path.join(tmp, "friday.db"))
+                for backend, memory in (("json", MemoryManager()), ("sqlite", MemoryManager(store=store))):
+                    row = bench(memory, size, args.ops)
+                    print(f"{size:>8}{backend:>10}" + "".join(f"{row[op]:>20.3f}" for op in OPERATIONS))
+                store.close()
+                os.chdir(cwd)
+    finally:
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
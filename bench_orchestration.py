@@ -0,0 +1,74 @@
+"""
+End-to-end routing latency, sequential vs concurrent orchestration.
+
+The LLM classifier is a stub that sleeps for --classify-ms; goal extraction
+and strategy selection are the real GoalExtractor / StrategySelector, with
+--prepare-ms of extra latency to model a cold health store. The measured
+span is FirstLayerDMM up to the point GoalManager has (goal, strategy) in
+hand; execution itself is identical in both modes and left out.
+
+Usage:
+    python bench_orchestration.py --classify-ms 350 --prepare-ms 20 --runs 20
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from Backend.GoalExtractor import GoalExtractor
+from Backend.Orchestration import OrchestrationStats, classify_and_prepare
+from Backend.StrategySelector import StrategySelector
+
+PROMPTS = [
+    ("open chrome", "realtime"),
+    ("search for weather in pune", "realtime"),
+    ("send whatsapp message to mom saying on my way", "realtime"),
+    ("generate image of a lighthouse at dusk", "realtime"),
+    ("tell me something interesting about octopuses", "general"),
+    ("why is the sky blue", "general"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--classify-ms", type=float, default=350, help="Stub LLM classifier latency")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="Uniform jitter added to the classifier")
+    parser.add_argument("--prepare-ms", type=float, default=20, help="Extra latency of goal + strategy preparation")
+    parser.add_argument("--runs", type=int, default=20, help="Passes over the prompt set per mode")
+    args = parser.parse_args()
+
+    extractor = GoalExtractor()
+    selector = StrategySelector()
+    labels = dict(PROMPTS)
+
+    def classify(prompt):
+        time.sleep((args.classify_ms + random.uniform(0, args.jitter_ms)) / 1000)
+        return labels[prompt]
+
+    def prepare(prompt):
+        time.sleep(args.prepare_ms / 1000)
+        goal = extractor.extract_goal(prompt)
+        return goal, selector.select_strategy(goal)
+
+    stats = OrchestrationStats()
+    for mode in ("sequential", "concurrent"):
+        for _ in range(args.runs):
+            for prompt, _ in PROMPTS:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    intent, prepared = classify_and_prepare(prompt, classify, prepare, mode=mode, stats=stats)
+                    if intent == "realtime" and prepared is None:
+                        prepared = prepare(prompt)  # What GoalManager.execute_goal does on its own
+                    stats.record(mode, time.perf_counter() - start)
+
+    report = stats.report()
+    print(f"{'mode':<12}{'p50':>10}{'p90':>10}{'p99':>10}")
+    for mode in ("sequential", "concurrent"):
+        r = report[mode]
+        print(f"{mode:<12}{r['p50_ms']:>8.1f}ms{r['p90_ms']:>8.1f}ms{r['p99_ms']:>8.1f}ms")
+    print(f"\nSpeculation: {report['speculation']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+OutcomeManager cost vs history size: the old whole-file JSON list against
+the append-only journal with in-memory aggregates.
+
+For each size a synthetic history is written first, then we time startup
+(journal replay, and checkpoint + empty tail), record() and
+get_strategy_stats(). The legacy path is timed with the same read-all /
+rewrite-all code the old OutcomeManager used; pass --skip-legacy-above to
+avoid waiting on it for the largest sizes. Runs in a temporary directory.
+
+Usage:
+    python bench_outcomes.py --sizes 10000 100000 1000000 --ops 200
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from Backend.OutcomeManager import OutcomeManager
+from Backend.StrategyHealth import StrategyHealthManager
+
+STRATEGIES = ["send_whatsapp", "search_web", "open_app_direct", "generate_image_local"]
+
+
+def outcome(i):
+    return {"timestamp": "2026-01-01T00:00:00", "goal_id": f"g{i}", "target": f"t{i % 500}",
+            "strategy": STRATEGIES[i % len(STRATEGIES)], "success": random.random() < 0.8,
+            "fallback_used": False, "time_taken": 1.0, "retries": 0, "confidence": 0.9}
+
+
+def legacy_record(path, entry):
+    with open(path, "r+") as f:
+        data = json.load(f)
+        data.append(entry)
+        f.seek(0)
+        json.dump(data, f, indent=2)
+
+
+def legacy_stats(path, strategy):
+    with open(path) as f:
+        data = json.load(f)
+    relevant = [x for x in data if x.get("strategy") == strategy]
+    return sum(1 for x in relevant if x["success"]) / len(relevant)
+
+
+def timed(fn, ops):
+    samples = []
+    for i in range(ops):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(size, ops, legacy):
+    row = {"size": size}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        journal = os.path.join(tmp, "outcomes.jsonl")
+        checkpoint = os.path.join(tmp, "outcomes.checkpoint.json")
+        health = StrategyHealthManager(path=os.path.join(tmp, "strategy_health.json"))
+        with open(journal, "w") as f:
+            for i in range(size):
+                f.write(json.dumps(outcome(i)) + "\n")
+
+        start = time.perf_counter()
+        om = OutcomeManager(journal_path=journal, checkpoint_path=checkpoint, legacy_path=None,
+                            checkpoint_every=10 ** 9, health_manager=health)
+        row["replay_ms"] = (time.perf_counter() - start) * 1000
+        om.checkpoint()
+        om.close()
+        start = time.perf_counter()
+        om = OutcomeManager(journal_path=journal, checkpoint_path=checkpoint, legacy_path=None,
+                            checkpoint_every=10 ** 9, health_manager=health)
+        row["checkpoint_start_ms"] = (time.perf_counter() - start) * 1000
+
+        with contextlib.redirect_stdout(io.StringIO()):  # StrategyHealth prints per record
+            row["record_ms"] = timed(lambda i: om.record(f"b{i}", "t1", STRATEGIES[i % 4], True, 1.0, 0, False), ops)
+        row["stats_ms"] = timed(lambda i: om.get_strategy_stats(STRATEGIES[i % 4]), ops)
+        om.close()
+
+        if legacy:
+            legacy_path = os.path.join(tmp, "outcomes.json")
+            with open(legacy_path, "w") as f:
+                json.dump([outcome(i) for i in range(size)], f, indent=2)
+            legacy_ops = max(1, min(ops, 20))
+            row["legacy_record_ms"] = timed(lambda i: legacy_record(legacy_path, outcome(i)), legacy_ops)
+            row["legacy_stats_ms"] = timed(lambda i: legacy_stats(legacy_path, STRATEGIES[i % 4]), legacy_ops)
+        os.chdir(os.path.dirname(tmp))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=200, help="record()/stats calls timed per size")
+    parser.add_argument("--skip-legacy-above", type=int, default=100_000,
+                        help="Do not time the legacy JSON path for larger histories")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    columns = ["size", "replay_ms", "checkpoint_start_ms", "record_ms", "stats_ms", "legacy_record_ms",
+               "legacy_stats_ms"]
+    print("".join(f"{c:>20}" for c in columns))
+    try:
+        for size in args.sizes:
+            row = bench(size, args.ops, legacy=size <= args.skip_legacy_above)
+            print("".join(f"{row[c]:>20.3f}" if isinstance(row.get(c), float) else f"{row.get(c, '-'):>20}"
+                          for c in columns))
+    finally:
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
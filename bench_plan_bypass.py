@@ -0,0 +1,68 @@
+"""
+Per-goal planning latency: always calling the Planner vs the deterministic
+GSO bypass + plan cache used by GoalManager.
+
+The Planner is replaced by a stub that sleeps for a fixed round trip, so
+the numbers isolate how many planner calls each path makes.
+
+Usage:
+    python bench_plan_bypass.py --planner-ms 900 --repeats 5
+"""
+import argparse
+import statistics
+import time
+
+from Backend.contracts import Goal, Strategy
+from Backend.PlanCache import PlanCache
+
+WORKLOAD = [
+    (Goal(name="send_message", target="Mom", content="on my way"), "send_whatsapp"),
+    (Goal(name="search_web", target="weather in pune"), "search_web"),
+    (Goal(name="open_application", target="chrome"), "open_app_direct"),
+    (Goal(name="generate_image", content="a lighthouse at dusk"), "generate_image_local"),
+    (Goal(name="system_control", target="volume up"), "system_action"),
+    (Goal(name="close_application", target="notepad"), "close_app"),
+]
+
+
+def make_planner(planner_ms):
+    def planner():
+        time.sleep(planner_ms / 1000)
+        return {"plan": [{"action": "system", "target": "stub"}], "success_criteria": None}
+    return planner
+
+
+def run(repeats, planner_ms, bypass):
+    cache = PlanCache()
+    planner = make_planner(planner_ms)
+    latencies = {}
+    for _ in range(repeats):
+        for goal, strategy_name in WORKLOAD:
+            strategy = Strategy(name=strategy_name, confidence=0.9, reason="bench")
+            start = time.perf_counter()
+            if bypass:
+                cache.plan(goal, strategy, {}, planner)
+            else:
+                planner()
+            latencies.setdefault(goal.name, []).append((time.perf_counter() - start) * 1000)
+    return latencies, cache.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--planner-ms", type=float, default=900, help="Stub Planner round trip")
+    parser.add_argument("--repeats", type=int, default=5, help="Times each goal is planned")
+    args = parser.parse_args()
+
+    before, _ = run(args.repeats, args.planner_ms, bypass=False)
+    after, report = run(args.repeats, args.planner_ms, bypass=True)
+
+    print(f"{'goal':<20}{'before p50':>12}{'after p50':>12}{'after mean':>12}")
+    for goal_name in before:
+        print(f"{goal_name:<20}{statistics.median(before[goal_name]):>10.1f}ms"
+              f"{statistics.median(after[goal_name]):>10.1f}ms{statistics.mean(after[goal_name]):>10.1f}ms")
+    print(f"\nPlan sources: {report}")
+
+
+if __name__ == "__main__":
+    main()
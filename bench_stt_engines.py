@@ -0,0 +1,136 @@
+"""
+Batch STT benchmark.
+
+Transcribes every WAV in a directory through each engine and reports
+real-time factor, p50/p95 latency and word error rate. A reference
+transcript is read from the .txt file next to each WAV (clip.wav -> clip.txt);
+clips without one are timed but excluded from WER.
+
+Usage:
+    python bench_stt_engines.py --wav-dir fixtures/stt --engines google,sphinx,faster_whisper
+"""
+import argparse
+import glob
+import os
+import statistics
+import time
+
+import speech_recognition as sr
+
+from Backend.STTEngines import ENGINES, get_engine
+from Backend.audio_utils import pcm_to_audio_data, read_wav_pcm
+from Backend.normalize import normalize_text
+
+
+def word_error_rate(reference, hypothesis):
+    """Returns (edit_distance, reference_word_count) over normalized words."""
+    ref = normalize_text(reference).split()
+    hyp = normalize_text(hypothesis).split()
+
+    # Single-row Levenshtein over words
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,                              # deletion
+                current[j - 1] + 1,                           # insertion
+                previous[j - 1] + (ref_word != hyp_word)      # substitution
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def load_clips(wav_dir):
+    clips = []
+    for path in sorted(glob.glob(os.path.join(wav_dir, "*.wav"))):
+        samples, samplerate = read_wav_pcm(path)
+        reference = None
+        ref_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(ref_path):
+            with open(ref_path, "r", encoding="utf-8") as f:
+                reference = f.read().strip()
+        clips.append({
+            "name": os.path.basename(path),
+            "audio": pcm_to_audio_data(samples, samplerate),
+            "duration": len(samples) / samplerate,
+            "reference": reference,
+        })
+    return clips
+
+
+def benchmark_engine(engine, clips, language, verbose=False):
+    latencies, errors, ref_words, failures = [], 0, 0, 0
+    audio_seconds = 0.0
+
+    engine.warm_up()  # Model load is a one-off cost, not per-utterance latency
+    for clip in clips:
+        start = time.perf_counter()
+        try:
+            text = engine.transcribe(clip["audio"], language=language)
+        except sr.UnknownValueError:
+            text = ""
+        except sr.RequestError as e:
+            print(f"[{engine.name}] {clip['name']}: request failed: {e}")
+            failures += 1
+            continue
+        elapsed = time.perf_counter() - start
+
+        latencies.append(elapsed)
+        audio_seconds += clip["duration"]
+        if clip["reference"] is not None:
+            e, n = word_error_rate(clip["reference"], text)
+            errors += e
+            ref_words += n
+        if verbose:
+            print(f"[{engine.name}] {clip['name']}: {elapsed * 1000:.0f} ms -> {text!r}")
+
+    if not latencies:
+        return None
+    return {
+        "engine": engine.name,
+        "clips": len(latencies),
+        "failures": failures,
+        "rtf": sum(latencies) / audio_seconds if audio_seconds else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "wer": errors / ref_words if ref_words else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--wav-dir", required=True)
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--language", default="en-US")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    clips = load_clips(args.wav_dir)
+    if not clips:
+        print(f"No WAV files found in {args.wav_dir}")
+        return
+
+    print(f"{len(clips)} clips, {sum(c['duration'] for c in clips):.1f}s of audio\n")
+    print(f"{'engine':<16}{'clips':>6}{'fail':>6}{'RTF':>8}{'p50':>10}{'p95':>10}{'WER':>8}")
+    for name in args.engines.split(","):
+        try:
+            result = benchmark_engine(get_engine(name), clips, args.language, args.verbose)
+        except (ValueError, sr.RequestError) as e:
+            print(f"{name:<16} unavailable: {e}")
+            continue
+        if result is None:
+            print(f"{name:<16} no successful transcriptions")
+            continue
+        wer = f"{result['wer'] * 100:.1f}%" if result["wer"] is not None else "n/a"
+        print(f"{result['engine']:<16}{result['clips']:>6}{result['failures']:>6}{result['rtf']:>8.2f}"
+              f"{result['p50_ms']:>8.0f}ms{result['p95_ms']:>8.0f}ms{wer:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Micro-benchmark: STT audio hand-off.
+
+Compares the old path (np.concatenate -> scipy wav.write -> sr.AudioFile ->
+recognizer.record -> os.remove) with the in-memory UtteranceBuffer path on
+recorded WAV fixtures. Recognition itself is not timed.
+
+Usage:
+    python bench_stt_handoff.py [fixture.wav ...] [--iterations N] [--blocksize N]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import scipy.io.wavfile as wav
+import speech_recognition as sr
+
+from Backend.audio_utils import UtteranceBuffer, read_wav_pcm
+
+DEFAULT_FIXTURES = ["debug_output.wav"]
+
+
+def file_round_trip(blocks, samplerate, recognizer, temp_wav):
+    recording_data = np.concatenate(blocks, axis=0)
+    wav.write(temp_wav, samplerate, recording_data)
+    try:
+        with sr.AudioFile(temp_wav) as source:
+            return recognizer.record(source)
+    finally:
+        if os.path.exists(temp_wav):
+            os.remove(temp_wav)
+
+
+def in_memory(blocks, samplerate):
+    buffer = UtteranceBuffer(samplerate, sum(len(b) for b in blocks) / samplerate)
+    for block in blocks:
+        buffer.append(block)
+    return buffer.to_audio_data()
+
+
+def _time(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(0.95 * (len(samples) - 1))]
+
+
+def run(fixtures, iterations, blocksize):
+    recognizer = sr.Recognizer()
+    temp_wav = os.path.join(tempfile.gettempdir(), f"bench_handoff_{os.getpid()}.wav")
+
+    print(f"{'fixture':<28}{'audio':>8}{'file p50':>12}{'file p95':>12}{'mem p50':>12}{'mem p95':>12}{'speedup':>10}")
+    for path in fixtures:
+        samples, samplerate = read_wav_pcm(path)
+        blocks = [samples[i:i + blocksize] for i in range(0, len(samples), blocksize)]
+
+        # Sanity: both paths must hand the recognizer identical PCM
+        reference = file_round_trip(blocks, samplerate, recognizer, temp_wav).get_raw_data()
+        assert in_memory(blocks, samplerate).get_raw_data() == reference, f"{path}: PCM mismatch"
+
+        file_p50, file_p95 = _time(lambda: file_round_trip(blocks, samplerate, recognizer, temp_wav), iterations)
+        mem_p50, mem_p95 = _time(lambda: in_memory(blocks, samplerate), iterations)
+
+        print(f"{os.path.basename(path):<28}{len(samples) / samplerate:>7.1f}s"
+              f"{file_p50:>10.3f}ms{file_p95:>10.3f}ms{mem_p50:>10.3f}ms{mem_p95:>10.3f}ms"
+              f"{file_p50 / mem_p50:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", nargs="*", default=DEFAULT_FIXTURES)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--blocksize", type=int, default=1024)
+    args = parser.parse_args()
+    run(args.fixtures, args.iterations, args.blocksize)
@@ -0,0 +1,89 @@
+"""
+Time-to-first-spoken-word benchmark: blocking answer vs sentence streaming.
+
+A stub LLM streams a canned answer at a fixed token rate and a stub TTS
+backend charges a fixed + per-character synthesis cost, so the result
+depends only on the pipeline, not on the network.
+
+Usage:
+    python bench_tts_streaming.py --tokens-per-second 40 --runs 5
+"""
+import argparse
+import statistics
+import time
+
+from Backend.SpeechStream import SpokenStream
+from Backend.SpeechWorker import SpeechWorker
+
+ANSWER = (
+    "The Eiffel Tower is located in Paris, France. "
+    "It was completed in 1889 for the World's Fair and is about 330 metres tall. "
+    "Today it is one of the most visited monuments in the world, "
+    "with roughly seven million visitors every year. "
+    "You can take the stairs or a lift up to the viewing platforms."
+)
+
+
+def stub_llm_stream(text, tokens_per_second):
+    """Yields word-sized chunks at the given rate, like a stream=True completion."""
+    delay = 1.0 / tokens_per_second
+    for word in text.split(" "):
+        time.sleep(delay)
+        yield word + " "
+
+
+def make_worker(synth_base_ms, synth_per_char_ms, play_ms):
+    def synthesize(text):
+        time.sleep((synth_base_ms + synth_per_char_ms * len(text)) / 1000)
+        return text
+
+    def play(audio, stop_event):
+        stop_event.wait(play_ms / 1000)
+
+    return SpeechWorker(synthesize, play).start()
+
+
+def first_audio(handles, start):
+    handles[0].wait()
+    return handles[0].started_at - start
+
+
+def run_blocking(worker, args):
+    start = time.perf_counter()
+    answer = "".join(stub_llm_stream(ANSWER, args.tokens_per_second))
+    handle = worker.speak(answer)
+    ttfa = first_audio([handle], start)
+    handle.wait()
+    return ttfa
+
+
+def run_streaming(worker, args):
+    start = time.perf_counter()
+    stream = SpokenStream(stub_llm_stream(ANSWER, args.tokens_per_second), speak=worker.speak)
+    iterator = iter(stream)
+    next(iterator)
+    ttfa = first_audio(stream.handles, start)
+    stream.wait()
+    return ttfa
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens-per-second", type=float, default=40)
+    parser.add_argument("--synth-base-ms", type=float, default=250)
+    parser.add_argument("--synth-per-char-ms", type=float, default=2)
+    parser.add_argument("--play-ms", type=float, default=50)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    worker = make_worker(args.synth_base_ms, args.synth_per_char_ms, args.play_ms)
+    print(f"{len(ANSWER.split())} tokens at {args.tokens_per_second:.0f} tok/s, "
+          f"synthesis {args.synth_base_ms:.0f} ms + {args.synth_per_char_ms:g} ms/char\n")
+    print(f"{'mode':<12}{'p50 ttfw':>12}{'min':>10}{'max':>10}")
+    for name, run in (("blocking", run_blocking), ("streaming", run_streaming)):
+        samples = [run(worker, args) * 1000 for _ in range(args.runs)]
+        print(f"{name:<12}{statistics.median(samples):>10.0f}ms{min(samples):>8.0f}ms{max(samples):>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Backend.normalize import normalize_text
+
+
+def stable_prefix(previous: str, current: str) -> str:
+    """Normalized words two consecutive partial hypotheses agree on."""
+    prev_words = normalize_text(previous).split()
+    cur_words = normalize_text(current).split()
+    common = []
+    for a, b in zip(prev_words, cur_words):
+        if a != b:
+            break
+        common.append(a)
+    return " ".join(common)
+
+
+def raw_prefix(text: str, prefix: str) -> str:
+    """The leading words of `text` whose normalized form is `prefix` (all of `text` if none match)."""
+    words = text.split()
+    for i in range(1, len(words) + 1):
+        if normalize_text(" ".join(words[:i])) == prefix:
+            return " ".join(words[:i])
+    return text
+
+
+class SpeculativeRouter:
+    """
+    Runs cheap routing work on the stable prefix of partial transcripts.
+
+    `analyzers` maps a name to a pure function of the transcript text
+    (e.g. core.classifier.classify), called with the raw words exactly as
+    the final path would pass them. Each time the stable prefix grows the
+    analyzers are re-run in the background, and `warmups` (callables taking
+    the analyzer results) are fired once per utterance so connections are
+    ready by the time the final transcript arrives.
+
+    resolve(final_text) reuses the speculative results only if the prefix
+    they were computed on normalizes to the same text as the final
+    transcript; otherwise they are discarded and the analyzers run on the
+    raw final text. Normalization is only used for that comparison.
+    """
+
+    def __init__(self, analyzers, warmups=()):
+        self.analyzers = dict(analyzers)
+        self.warmups = list(warmups)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculation")
+        self.stats = {"utterances": 0, "speculations": 0, "hits": 0, "rollbacks": 0, "saved_ms": 0.0}
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance."""
+        self._previous = ""
+        self._speculated = None   # normalized text the pending results belong to
+        self._future = None
+        self._warmed = False
+
+    def _analyze(self, text):
+        start = time.perf_counter()
+        results = {name: fn(text) for name, fn in self.analyzers.items()}
+        return results, (time.perf_counter() - start) * 1000
+
+    def _warm(self, results):
+        for warmup in self.warmups:
+            try:
+                warmup(results)
+            except Exception as e:
+                print(f"[Speculation] Warm-up failed: {e}")
+
+    def feed(self, hypothesis):
+        """Feed a partial Hypothesis. Never blocks the listener."""
+        if hypothesis.final or not hypothesis.text:
+            return
+        prefix = stable_prefix(self._previous, hypothesis.text)
+        self._previous = hypothesis.text
+        if not prefix or prefix == self._speculated:
+            return
+
+        self._speculated = prefix
+        self._future = self._executor.submit(self._analyze, raw_prefix(hypothesis.text, prefix))
+        self.stats["speculations"] += 1
+        if not self._warmed:
+            self._warmed = True
+            future = self._future
+            threading.Thread(target=lambda: self._warm(future.result()[0]), daemon=True).start()
+
+    def resolve(self, final_text):
+        """Results for the final transcript, reusing the speculation when it matches."""
+        self.stats["utterances"] += 1
+        key = normalize_text(final_text)
+        try:
+            if self._future is not None and self._speculated == key:
+                results, elapsed_ms = self._future.result()
+                self.stats["hits"] += 1
+                self.stats["saved_ms"] += elapsed_ms
+                return results
+            if self._future is not None:
+                # Rollback: the tail of the utterance changed the text
+                self.stats["rollbacks"] += 1
+                print(f"[Speculation] Rolled back '{self._speculated}' (final: '{key}')")
+            return self._analyze(final_text)[0]
+        finally:
+            self.reset()
+
+
+_last_warm = {}
+_warm_lock = threading.Lock()
+
+
+def warm_up_client(gateway, interval=60.0):
+    """
+    Opens a pooled HTTPS connection of the shared LLM gateway with a cheap
+    request, at most once per `interval` seconds.
+    """
+    now = time.monotonic()
+    with _warm_lock:
+        if now - _last_warm.get(id(gateway), float("-inf")) < interval:
+            return False
+        _last_warm[id(gateway)] = now
+    gateway.warm_up()
+    return True
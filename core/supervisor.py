@@ -7,8 +7,10 @@ from handlers.content import handle_content
 from handlers.action import handle_action
 from handlers.query import handle_query
 
-def supervise(user_text: str):
-    mode = classify(user_text)
+def supervise(user_text: str, mode: RequestMode = None):
+    # `mode` may be precomputed (speculatively, on the partial transcript)
+    if mode is None:
+        mode = classify(user_text)
 
     CTX.current_mode = mode
     CTX.raw_text = user_text
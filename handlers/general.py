@@ -1,10 +1,16 @@
 from core.context import CTX
 from core.modes import RequestMode
-from Backend.Chatbot import ChatBot  # Assuming ChatBot handles general/chitchat
+from Backend.Chatbot import ChatBotStream  # Assuming ChatBot handles general/chitchat
+from Backend.SpeechStream import SpokenStream
 
 def handle_general(text: str):
     assert CTX.current_mode == RequestMode.GENERAL, "MODE VIOLATION"
     
     # Reuse existing ChatBot logic for general conversation
     # Or simple print for now if ChatBot is not imported correctly
-    return ChatBot(text)
+    # Speech starts with the first sentence instead of after the whole completion
+    answer = SpokenStream(ChatBotStream(text))
+    for sentence in answer:
+        print(f"[General] {sentence}")
+    answer.wait()  # Don't start listening while still talking
+    return answer.text
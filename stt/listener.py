@@ -1,5 +1,9 @@
-from Backend.SpeechToText import SpeechRecognition
+from Backend.SpeechToText import SpeechRecognition, SpeechRecognitionStream
 
 def listen():
     # Wrapper for SpeechRecognition to match requested interface
     return SpeechRecognition()
+
+def listen_stream():
+    # Partial hypotheses while the user is speaking, then the final one (hypothesis.final)
+    return SpeechRecognitionStream()
@@ -0,0 +1,89 @@
+import numpy as np
+from unittest.mock import MagicMock, patch
+
+from Backend.AudioCapture import AudioCaptureService
+
+
+def make_service(preroll_seconds=0.25, buffer_seconds=1.0):
+    # 16 kHz, 1000-sample blocks -> 16 blocks/s
+    service = AudioCaptureService(blocksize=1000, buffer_seconds=buffer_seconds,
+                                  preroll_seconds=preroll_seconds, samplerate=16000)
+    with patch("Backend.AudioCapture.sd.InputStream", return_value=MagicMock()):
+        service.start()
+    return service
+
+
+def push(service, value):
+    block = np.full((service.blocksize, 1), value, dtype=np.int16)
+    service._callback(block, service.blocksize, None, None)
+
+
+def test_stream_opened_once():
+    service = AudioCaptureService(blocksize=1000, samplerate=16000)
+    with patch("Backend.AudioCapture.sd.InputStream", return_value=MagicMock()) as stream_cls:
+        service.start()
+        service.start()
+    assert stream_cls.call_count == 1
+    print("SUCCESS: Single stream across turns.")
+
+
+def test_preroll_returns_blocks_before_onset():
+    service = make_service()
+    start = service.flush()
+    for v in range(1, 8):
+        push(service, v)
+
+    seqs = []
+    while True:
+        seq, block = service.read(timeout=0)
+        if seq is None:
+            break
+        seqs.append((seq, int(block[0])))
+
+    onset_seq = seqs[-1][0]
+    pre = service.preroll(onset_seq, since=start)
+    # 0.25 s at 16 blocks/s -> 4 blocks of pre-roll
+    assert service.preroll_blocks == 4
+    assert pre.shape == (4 * service.blocksize,)
+    assert list(pre[::service.blocksize]) == [3, 4, 5, 6]
+    print("SUCCESS: Pre-roll captured.")
+
+
+def test_preroll_never_crosses_turn_start():
+    service = make_service()
+    push(service, 1)
+    push(service, 2)
+    start = service.flush()
+    push(service, 3)
+    seq, _ = service.read(timeout=0)
+    assert len(service.preroll(seq, since=start)) == 0
+    print("SUCCESS: Stale audio excluded from pre-roll.")
+
+
+def test_lagging_reader_skips_overwritten_blocks():
+    service = make_service(buffer_seconds=0.5)
+    for v in range(service.capacity + 3):
+        push(service, v)
+    seq, block = service.read(timeout=0)
+    assert service.overruns > 0
+    assert int(block[0]) == seq
+    print("SUCCESS: Overrun detected.")
+
+
+def test_restart_reopens_stream():
+    service = AudioCaptureService(blocksize=1000, samplerate=16000)
+    with patch("Backend.AudioCapture.sd.InputStream", return_value=MagicMock()) as stream_cls:
+        service.start()
+        push(service, 1)
+        start = service.restart()
+    assert stream_cls.call_count == 2 and service.running
+    assert start == 0 and service.read(timeout=0) == (None, None)
+    print("SUCCESS: Stalled stream reopened.")
+
+
+if __name__ == "__main__":
+    test_stream_opened_once()
+    test_preroll_returns_blocks_before_onset()
+    test_preroll_never_crosses_turn_start()
+    test_lagging_reader_skips_overwritten_blocks()
+    test_restart_reopens_stream()
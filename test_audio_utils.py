@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import scipy.io.wavfile as wav
+import speech_recognition as sr
+
+from Backend.audio_utils import UtteranceBuffer, pcm_to_audio_data, read_wav_pcm
+
+
+def test_in_memory_matches_file_round_trip(tmp_path=None):
+    samplerate = 16000
+    rng = np.random.default_rng(0)
+    blocks = [rng.integers(-3000, 3000, 1024, dtype=np.int16) for _ in range(20)]
+
+    buffer = UtteranceBuffer(samplerate, 0.5)  # deliberately too small: forces growth
+    for block in blocks:
+        buffer.append(block)
+    assert len(buffer) == 20 * 1024
+
+    temp_wav = os.path.join(str(tmp_path) if tmp_path else ".", "test_handoff.wav")
+    wav.write(temp_wav, samplerate, np.concatenate(blocks))
+    try:
+        with sr.AudioFile(temp_wav) as source:
+            expected = sr.Recognizer().record(source)
+    finally:
+        os.remove(temp_wav)
+
+    audio = buffer.to_audio_data()
+    assert audio.sample_rate == samplerate and audio.sample_width == 2
+    assert audio.get_raw_data() == expected.get_raw_data()
+    # Engines resample/encode from this, so the conversions must work on the memoryview too
+    assert audio.get_wav_data(convert_rate=8000)
+    print("SUCCESS: In-memory hand-off matches file round-trip.")
+
+
+def test_audio_data_shares_buffer_memory():
+    samples = np.arange(100, dtype=np.int16)
+    audio = pcm_to_audio_data(samples, 16000)
+    samples[0] = 7
+    assert audio.get_raw_data()[:2] == np.int16(7).tobytes()
+    print("SUCCESS: No copy made.")
+
+
+def test_read_wav_fixture():
+    samples, samplerate = read_wav_pcm("debug_output.wav")
+    assert samplerate == 44100
+    assert samples.dtype == np.int16 and len(samples) == 220500
+
+
+if __name__ == "__main__":
+    test_in_memory_matches_file_round_trip()
+    test_audio_data_shares_buffer_memory()
+    test_read_wav_fixture()
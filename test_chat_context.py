@@ -0,0 +1,156 @@
+import os
+import tempfile
+import threading
+
+from Backend.ChatContext import ChatContext, message_tokens
+
+SYSTEM = [{"role": "system", "content": "You are a helpful assistant."}]
+
+
+def turn(i):
+    return [{"role": "user", "content": f"question number {i} " + "word " * 40},
+            {"role": "assistant", "content": f"answer number {i} " + "word " * 60}]
+
+
+def fake_summarize(previous, messages):
+    return f"{previous} covered {len(messages)} messages".strip()
+
+
+def test_prompt_stays_bounded():
+    print("\n[Test] Prompt size stays flat as history grows")
+    ctx = ChatContext(summarize=fake_summarize, recent_turns=3, token_budget=1500)
+    history = []
+    sizes = []
+    for i in range(60):
+        history.append(turn(i)[0])
+        prompt = ctx.build(SYSTEM, history)
+        ctx.wait()
+        sizes.append(sum(message_tokens(m) for m in prompt))
+        assert prompt[0] == SYSTEM[0]
+        assert prompt[-1] is history[-1]
+        history.append(turn(i)[1])
+
+    print(f"Prompt tokens: first {sizes[0]}, max {max(sizes)}, last {sizes[-1]}")
+    assert max(sizes) <= 1500
+    metrics = ctx.metrics()
+    print(f"Metrics: {metrics}")
+    assert metrics["summaries"] > 0 and metrics["summarized_messages"] > 0
+    assert metrics["history_tokens_last"] > 5 * metrics["prompt_tokens_last"]
+    print("SUCCESS")
+
+
+def test_recent_turns_verbatim_with_summary():
+    print("\n[Test] Recent turns verbatim, older ones summarized")
+    ctx = ChatContext(summarize=fake_summarize, recent_turns=2, token_budget=10000)
+    history = []
+    for i in range(5):
+        history.extend(turn(i))
+    history.append({"role": "user", "content": "latest"})
+
+    ctx.build(SYSTEM, history)
+    ctx.wait()
+    prompt = ctx.build(SYSTEM, history)
+    assert "covered 7 messages" in prompt[1]["content"]
+    assert prompt[2:] == history[7:]
+    print("SUCCESS")
+
+
+def test_turn_never_waits_for_summary():
+    print("\n[Test] Slow summarizer does not block build()")
+    release = threading.Event()
+
+    def slow_summarize(previous, messages):
+        release.wait(5)
+        return "summary"
+
+    ctx = ChatContext(summarize=slow_summarize, recent_turns=1, token_budget=100000)
+    history = []
+    for i in range(4):
+        history.extend(turn(i))
+    history.append({"role": "user", "content": "latest"})
+
+    prompt = ctx.build(SYSTEM, history)
+    # Summary pending: older messages are still sent verbatim
+    assert prompt[1:] == history
+    release.set()
+    ctx.wait()
+    assert ctx.summary == "summary"
+    print("SUCCESS")
+
+
+def test_summary_failure_is_not_fatal():
+    print("\n[Test] Failing summarizer keeps serving prompts")
+
+    def broken(previous, messages):
+        raise RuntimeError("down")
+
+    ctx = ChatContext(summarize=broken, recent_turns=1, token_budget=600)
+    history = []
+    for i in range(10):
+        history.extend(turn(i))
+    history.append({"role": "user", "content": "latest"})
+    ctx.build(SYSTEM, history)
+    ctx.wait()
+    prompt = ctx.build(SYSTEM, history)
+    assert sum(message_tokens(m) for m in prompt) <= 600
+    assert ctx.metrics()["summary_errors"] >= 1
+    print("SUCCESS")
+
+
+def test_backlog_is_summarized_in_bounded_batches():
+    print("\n[Test] A long unsummarized backlog is split into bounded calls")
+    batches = []
+
+    def counting(previous, messages):
+        batches.append(sum(message_tokens(m) for m in messages))
+        return fake_summarize(previous, messages)
+
+    ctx = ChatContext(summarize=counting, recent_turns=1, token_budget=1500, batch_tokens=1000)
+    history = []
+    for i in range(100):
+        history.extend(turn(i))
+    history.append({"role": "user", "content": "latest"})
+    ctx.build(SYSTEM, history)
+    ctx.wait()
+
+    assert len(batches) > 1 and max(batches) <= 1000
+    assert ctx.summarized_upto == len(history) - 2  # All but the recent turn
+    print(f"SUCCESS: {len(batches)} calls, largest {max(batches)} tokens")
+
+
+def test_summary_survives_restart():
+    print("\n[Test] Summary state is persisted")
+    calls = []
+
+    def recording(previous, messages):
+        calls.append(len(messages))
+        return fake_summarize(previous, messages)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ChatSummary.json")
+        history = []
+        for i in range(5):
+            history.extend(turn(i))
+        history.append({"role": "user", "content": "latest"})
+
+        ctx = ChatContext(summarize=recording, recent_turns=1, state_path=path)
+        ctx.build(SYSTEM, history)
+        ctx.wait()
+        assert calls == [9]
+
+        restarted = ChatContext(summarize=recording, recent_turns=1, state_path=path)
+        assert restarted.summary == ctx.summary and restarted.summarized_upto == 9
+        prompt = restarted.build(SYSTEM, history)
+        restarted.wait()
+        assert calls == [9]  # Nothing summarized twice
+        assert "covered 9 messages" in prompt[1]["content"] and prompt[2:] == history[9:]
+    print("SUCCESS")
+
+
+if __name__ == "__main__":
+    test_prompt_stays_bounded()
+    test_recent_turns_verbatim_with_summary()
+    test_turn_never_waits_for_summary()
+    test_summary_failure_is_not_fatal()
+    test_backlog_is_summarized_in_bounded_batches()
+    test_summary_survives_restart()
@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+import time
+
+from Backend.ChatStore import ChatStore
+
+
+def make_store(tmp, **kwargs):
+    return ChatStore(path=os.path.join(tmp, "ChatLog.jsonl"), legacy_path=os.path.join(tmp, "ChatLog.json"), **kwargs)
+
+
+def test_append_and_reload():
+    print("\n[Test] Appended messages survive a restart")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        store.append({"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"})
+        store.append({"role": "user", "content": "naïve café"})
+        store.close()
+
+        with open(store.path, encoding="utf-8") as f:
+            assert len(f.readlines()) == 3
+
+        reopened = make_store(tmp)
+        assert [m["content"] for m in reopened.messages()] == ["hi", "hello", "naïve café"]
+        reopened.close()
+    print("SUCCESS")
+
+
+def test_legacy_import_and_torn_line():
+    print("\n[Test] Legacy ChatLog.json imported once, torn line skipped")
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "ChatLog.json"), "w") as f:
+            json.dump([{"role": "user", "content": "old"}], f, indent=4)
+
+        store = make_store(tmp)
+        assert store.messages() == [{"role": "user", "content": "old"}]
+        assert store.stats["imported"] == 1
+        store.close()
+
+        with open(store.path, "a", encoding="utf-8") as f:
+            f.write('{"role": "assistant", "con')  # crash mid-write
+        reopened = make_store(tmp)
+        assert len(reopened.messages()) == 1
+        assert reopened.stats["skipped_lines"] == 1 and reopened.stats["imported"] == 0
+        reopened.close()
+    print("SUCCESS")
+
+
+def test_append_after_torn_line():
+    print("\n[Test] Appends after a torn line survive a restart")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        store.append({"role": "user", "content": "a"})
+        store.close()
+        with open(store.path, "a", encoding="utf-8") as f:
+            f.write('{"role": "assistant", "cont')  # Crash mid-write
+
+        store = make_store(tmp)
+        store.append({"role": "user", "content": "b"})
+        store.close()
+
+        reopened = make_store(tmp)
+        assert [m["content"] for m in reopened.messages()] == ["a", "b"]
+        assert reopened.stats["skipped_lines"] == 1
+        reopened.close()
+    print("SUCCESS")
+
+
+def test_batched_fsync():
+    print("\n[Test] fsync once per batch")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp, fsync_every=10, fsync_interval=3600)
+        for i in range(25):
+            store.append({"role": "user", "content": str(i)})
+        assert store.stats["fsyncs"] == 2
+        store.close()
+        assert store.stats["fsyncs"] == 3
+    print("SUCCESS")
+
+
+def test_background_compaction():
+    print("\n[Test] Compaction keeps the newest messages and archives the rest")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp, max_messages=10)
+        for i in range(16):
+            store.append({"role": "user", "content": str(i)})
+
+        for _ in range(100):
+            if store.stats["compactions"]:
+                break
+            time.sleep(0.01)
+        archived, messages = store.snapshot()
+        assert store.stats["compactions"] == 1
+        assert archived == 6 and [m["content"] for m in messages] == [str(i) for i in range(6, 16)]
+
+        store.append({"role": "user", "content": "16"})
+        store.close()
+        with open(store.path + ".archive", encoding="utf-8") as f:
+            assert len(f.readlines()) == 6
+        reopened = make_store(tmp)
+        assert reopened.snapshot()[0] == 6 and len(reopened.messages()) == 11  # Numbering survives a restart
+        reopened.close()
+    print("SUCCESS")
+
+
+if __name__ == "__main__":
+    test_append_and_reload()
+    test_legacy_import_and_torn_line()
+    test_append_after_torn_line()
+    test_batched_fsync()
+    test_background_compaction()
@@ -0,0 +1,64 @@
+import numpy as np
+
+from Backend.ConfirmationDecoder import ConfirmationDecoder, KeywordSpotter, classify_text, DecisionStats, ConfirmationResult
+
+
+def test_no_is_decided_immediately():
+    decoder = ConfirmationDecoder()
+    assert decoder.update([]) == (None, 0.0, 0.0)
+    decision, confidence, margin = decoder.update(["no"])
+    assert decision == "no" and confidence == 1.0 and margin == 1.0
+    print("SUCCESS: NO decided on first hit.")
+
+
+def test_any_no_cancels():
+    decoder = ConfirmationDecoder()
+    assert decoder.update(["yes", "yes", "yes", "yes", "no"])[0] == "no"
+    assert decoder.update(["sure", "wait"])[0] == "no"
+    print("SUCCESS: A single NO outweighs any number of YES.")
+
+
+def test_yes_is_never_decided_from_keywords():
+    decoder = ConfirmationDecoder()
+    decision, confidence, margin = decoder.update(["yes", "yes"])
+    assert decision is None and confidence == 1.0 and margin == 1.0  # The transcript has to agree
+    print("SUCCESS: YES left to the full transcript.")
+
+
+def test_fallback_keeps_original_matching():
+    assert classify_text("yes please") == "yes"
+    assert classify_text("no don't send it") == "no"
+    assert classify_text("yes no") == "no"  # NO first (safe default)
+    assert classify_text("") is None
+
+
+def test_stats_per_path():
+    stats = DecisionStats()
+    stats.record(ConfirmationResult("yes", "keyword", latency_ms=200))
+    stats.record(ConfirmationResult("yes", "keyword", latency_ms=400))
+    stats.record(ConfirmationResult("no", "fallback", latency_ms=1500))
+    summary = stats.summary()
+    assert summary["keyword"] == {"count": 2, "p50_ms": 300, "max_ms": 400}
+    assert summary["fallback"]["count"] == 1
+
+
+def test_spotter_ignores_silence():
+    spotter = KeywordSpotter()
+    try:
+        spotter.warm_up()
+    except Exception as e:
+        print(f"SKIPPED: PocketSphinx unavailable ({e})")
+        return
+    spotter.start(44100)  # Resampled to 16 kHz internally
+    for _ in range(20):
+        assert spotter.feed(np.zeros(1024, dtype=np.int16)) == []
+    assert spotter.finish() == []
+
+
+if __name__ == "__main__":
+    test_no_is_decided_immediately()
+    test_any_no_cancels()
+    test_yes_is_never_decided_from_keywords()
+    test_fallback_keeps_original_matching()
+    test_stats_per_path()
+    test_spotter_ignores_silence()
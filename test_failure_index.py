@@ -0,0 +1,122 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from Backend.FailureIndex import FailureIndex, RECENT_REASONS
+from Backend.MemoryStore import MemoryStore
+
+DAY = 24 * 3600
+
+
+def test_decayed_counts():
+    print("\n[Test] Time-decayed failure counts")
+    with tempfile.TemporaryDirectory() as tmp:
+        index = FailureIndex(path=os.path.join(tmp, "index.json"), half_life=7 * DAY, clock=lambda: 0.0)
+        for _ in range(4):
+            index.record("send_message", "timeout", ts=0.0)
+        assert index.count("send_message") == 4
+        assert index.recent_count("send_message", now=0.0) == 4.0
+        assert abs(index.recent_count("send_message", now=7 * DAY) - 2.0) < 1e-9
+        # Months later the old failures barely count, the lifetime total still does
+        count, recent = index.record("send_message", "timeout", ts=90 * DAY)
+        assert count == 5 and recent < 1.01
+        assert index.recent_count("unknown_goal") == 0.0
+    print("SUCCESS: Old failures fade.")
+
+
+def test_bounded_reasons_and_persistence():
+    print("\n[Test] Bounded reasons, persisted index")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.json")
+        index = FailureIndex(path=path)
+        assert not index.loaded
+        for i in range(RECENT_REASONS + 5):
+            index.record("open_app", f"reason {i}")
+        assert index.reasons("open_app", 3) == [f"reason {i}" for i in range(RECENT_REASONS + 2, RECENT_REASONS + 5)]
+        with open(path) as f:
+            assert len(json.load(f)["open_app"]["reasons"]) == RECENT_REASONS
+
+        again = FailureIndex(path=path)
+        assert again.loaded and again.count("open_app") == RECENT_REASONS + 5
+
+        store = MemoryStore(os.path.join(tmp, "friday.db"))
+        on_store = FailureIndex(store=store)
+        on_store.record("play_media", "not found")
+        assert FailureIndex(store=store).reasons("play_media") == ["not found"]
+        store.close()
+    print("SUCCESS: Index survives restarts.")
+
+
+def test_bootstrap_from_failure_log():
+    print("\n[Test] Bootstrap from the failure log")
+    with tempfile.TemporaryDirectory() as tmp:
+        index = FailureIndex(path=os.path.join(tmp, "index.json"))
+        index.bootstrap([
+            {"goal_type": "web_search", "failure_reason": "network", "timestamp": "2026-01-01T10:00:00"},
+            {"goal_type": "web_search", "failure_reason": "timeout", "timestamp": "2026-01-01T10:05:00"},
+            {"goal_type": "open_app", "failure_reason": "missing", "timestamp": "not a date"},
+        ])
+        assert index.count("web_search") == 2
+        assert index.reasons("web_search") == ["network", "timeout"]
+        assert FailureIndex(path=os.path.join(tmp, "index.json")).count("open_app") == 1
+    print("SUCCESS: Existing history counted once.")
+
+
+def test_analyzer_escalates_on_recent_failures():
+    print("\n[Test] FailureAnalyzer escalation")
+    from Backend.FailureAnalyzer import FailureAnalyzer
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                analyzer = FailureAnalyzer()
+                results = [analyzer.analyze_failure("send_message", "ctx", "execution", "focus lost")
+                           for _ in range(3)]
+            assert [r["correction"] for r in results] == ["REFOCUS", "REFOCUS", "ABORT"]
+            assert results[-1]["failure_count"] == 3
+            context = analyzer.get_learning_context("send_message")
+            assert "failed 3 times" in context and context.endswith("focus lost, focus lost, focus lost.")
+            assert analyzer.get_learning_context("other") is None
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS: Escalation uses the index.")
+
+
+def test_failures_are_appended_not_rewritten():
+    print("\n[Test] Recording a failure appends one line")
+    from Backend.MemoryManager import MemoryManager
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                memory = MemoryManager()
+            with open(memory.files["failures"], "w") as f:
+                json.dump([{"goal_type": "legacy"}], f)
+            before = os.path.getmtime(memory.files["failures"]), os.path.getsize(memory.files["failures"])
+
+            for i in range(3):
+                memory.record_failure({"goal_type": "open_app", "failure_reason": f"r{i}"})
+            with open(memory.failure_log, "a") as f:
+                f.write('{"goal_type": "torn')  # Crash mid-write
+            memory.record_failure({"goal_type": "open_app", "failure_reason": "r3"})
+
+            assert (os.path.getmtime(memory.files["failures"]), os.path.getsize(memory.files["failures"])) == before
+            assert [f["goal_type"] for f in memory.get_failures()] == ["legacy"] + ["open_app"] * 4
+            assert memory.get_failures_by_goal("open_app")[-1]["failure_reason"] == "r3"
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS: Legacy list untouched, new failures appended.")
+
+
+if __name__ == "__main__":
+    test_decayed_counts()
+    test_bounded_reasons_and_persistence()
+    test_bootstrap_from_failure_log()
+    test_analyzer_escalates_on_recent_failures()
+    test_failures_are_appended_not_rewritten()
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import time
+
+from Backend.StrategyHealth import StrategyHealthManager
+
+
+def _read(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def test_updates_are_written_behind_once():
+    print("\n[Test] Debounced write-behind")
+    path = os.path.join(tempfile.mkdtemp(), "health.json")
+    mgr = StrategyHealthManager(path=path, flush_delay=0.2)
+    for _ in range(50):
+        mgr.record_failure("web_search")
+    mgr.record_success("web_search")
+
+    # Readers see the update at once; the file does not exist yet
+    assert mgr.get_health("web_search").success_count == 1
+    assert not os.path.exists(path)
+
+    time.sleep(0.5)
+    data = _read(path)
+    assert data["web_search"]["success_count"] == 1
+    assert data["web_search"]["consecutive_failures"] == 0
+    assert not os.path.exists(path + ".tmp")
+    print("SUCCESS: 51 updates, one flush.")
+
+
+def test_new_manager_sees_pending_updates():
+    print("\n[Test] Read-your-writes across managers")
+    path = os.path.join(tempfile.mkdtemp(), "health.json")
+    mgr = StrategyHealthManager(path=path, flush_delay=60)
+    mgr.record_failure("open_app")
+    other = StrategyHealthManager(path=path, flush_delay=60)
+    assert other.get_health("open_app").failure_count == 1
+    print("SUCCESS: Pending updates flushed before load.")
+
+
+def test_reload_if_changed():
+    print("\n[Test] External edits are picked up")
+    path = os.path.join(tempfile.mkdtemp(), "health.json")
+    mgr = StrategyHealthManager(path=path, flush_delay=60)
+    mgr.record_success("play_music")
+    mgr.flush()
+
+    time.sleep(0.01)
+    with open(path, "w") as f:
+        json.dump({"play_music": {"success_count": 0, "failure_count": 7}}, f)
+    mgr.reload_if_changed()
+    assert mgr.get_health("play_music").failure_count == 7
+
+    # Unchanged file: the in-memory map is kept as is
+    mgr.get_health("play_music").failure_count = 8
+    mgr.reload_if_changed()
+    assert mgr.get_health("play_music").failure_count == 8
+    print("SUCCESS: Reloaded only when the file changed.")
+
+
+def test_flush_ignores_later_cwd_changes():
+    print("\n[Test] Flush target fixed at construction")
+    cwd = os.getcwd()
+    home, elsewhere = tempfile.mkdtemp(), tempfile.mkdtemp()
+    os.chdir(home)
+    try:
+        mgr = StrategyHealthManager(path="memory/strategy_health.json", flush_delay=60)
+        mgr.record_failure("web_search")
+        os.chdir(elsewhere)
+        mgr.flush()
+    finally:
+        os.chdir(cwd)
+    assert os.path.exists(os.path.join(home, "memory", "strategy_health.json"))
+    assert not os.path.exists(os.path.join(elsewhere, "memory"))
+    print("SUCCESS: Written where the manager was created.")
+
+
+def test_failed_flush_keeps_updates():
+    print("\n[Test] Failed flush stays dirty")
+    blocker = os.path.join(tempfile.mkdtemp(), "not_a_dir")
+    with open(blocker, "w") as f:
+        f.write("x")
+    mgr = StrategyHealthManager(path=os.path.join(tempfile.mkdtemp(), "health.json"), flush_delay=60)
+    mgr.record_success("open_app")
+    good_path, mgr.path = mgr.path, os.path.join(blocker, "health.json")
+    mgr.flush()
+    assert mgr._dirty
+    mgr.path = good_path
+    mgr.flush()
+    assert not mgr._dirty and _read(good_path)["open_app"]["success_count"] == 1
+    print("SUCCESS: Retried after a failed write.")
+
+
+if __name__ == "__main__":
+    test_updates_are_written_behind_once()
+    test_new_manager_sees_pending_updates()
+    test_reload_if_changed()
+    test_flush_ignores_later_cwd_changes()
+    test_failed_flush_keeps_updates()
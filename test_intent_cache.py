@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import time
+
+from FRIDAY.core.intent_cache import IntentCache
+
+PLAY = {"domain": "MEDIA", "action": "play", "parameters": {"special": "last_song"}, "confidence": 0.95}
+
+
+def test_hit_on_normalized_repeat():
+    print("\n[Test] Normalized repeats hit the cache")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = IntentCache("prompt v1", path=os.path.join(tmp, "cache.json"))
+        assert cache.get("Play my last song.") is None
+        cache.put("Play my last song.", PLAY)
+
+        data = cache.get("play my last song")
+        assert data == PLAY
+        data["parameters"]["special"] = "mutated"  # Callers get their own copy
+        assert cache.get("PLAY MY LAST SONG!") == PLAY
+
+        metrics = cache.metrics()
+        assert metrics["hits"] == 2 and metrics["misses"] == 1 and metrics["hit_rate"] == 2 / 3
+    print("SUCCESS: Intent cache hit.")
+
+
+def test_prompt_change_invalidates_persisted_entries():
+    print("\n[Test] A new system prompt invalidates persisted entries")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.json")
+        IntentCache("prompt v1", path=path).put("pause music", PLAY)
+
+        assert IntentCache("prompt v1", path=path).get("pause music") == PLAY
+        changed = IntentCache("prompt v2", path=path)
+        assert changed.get("pause music") is None
+        assert changed.metrics()["invalidated"] == 1
+    print("SUCCESS: Stale entries dropped.")
+
+
+def test_ttl_and_lru():
+    print("\n[Test] TTL expiry and LRU eviction")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = IntentCache("p", path=os.path.join(tmp, "cache.json"), ttl=0.05, max_entries=2)
+        cache.put("a", PLAY)
+        time.sleep(0.06)
+        assert cache.get("a") is None and cache.metrics()["expired"] == 1
+
+        cache.ttl = 60
+        for text in ["a", "b", "c"]:
+            cache.put(text, PLAY)
+        assert cache.get("a") is None and cache.get("c") == PLAY
+        assert cache.metrics()["evictions"] == 1
+        with open(cache.path) as f:
+            assert set(json.load(f)["entries"]) == {"b", "c"}
+    print("SUCCESS: Bounded and expiring.")
+
+
+if __name__ == "__main__":
+    test_hit_on_normalized_repeat()
+    test_prompt_change_invalidates_persisted_entries()
+    test_ttl_and_lru()
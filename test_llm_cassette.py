@@ -0,0 +1,77 @@
+import tempfile
+import time
+
+import pytest
+
+from Backend.LLMCassette import Cassette, CassetteMiss, cassette_key
+from Backend.LLMGateway import LLMGateway
+from test_llm_gateway import stub_server  # noqa: F401  (pytest fixture)
+
+OFFLINE = "http://127.0.0.1:9"  # Nothing listens here
+
+
+def _ask(gateway, content="hi", **kwargs):
+    return gateway.chat("chat", model="llama-3.3-70b-versatile",
+                        messages=[{"role": "user", "content": content}], **kwargs)
+
+
+def test_record_then_replay_offline(stub_server):
+    url, _ = stub_server
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = LLMGateway(api_key="test", base_url=url, cassette=Cassette(tmp, mode="record"))
+        _ask(recorder)
+        "".join(c.choices[0].delta.content or "" for c in _ask(recorder, "stream me", stream=True))
+        assert recorder.cassette.stats["recorded"] == 2
+
+        player = LLMGateway(api_key="test", base_url=OFFLINE,
+                            cassette=Cassette(tmp, mode="replay", latency_ms=50, chunk_ms=20))
+        start = time.perf_counter()
+        completion = _ask(player)
+        assert completion.choices[0].message.content == "general"
+        assert completion.usage.prompt_tokens == 12
+        assert time.perf_counter() - start >= 0.05
+
+        start = time.perf_counter()
+        chunks = list(_ask(player, "stream me", stream=True))
+        elapsed = time.perf_counter() - start
+        assert [c.choices[0].delta.content for c in chunks] == ["Hello", " there"]
+        assert 0.07 <= elapsed < 0.5  # 50 ms to the first chunk + 20 ms gap
+
+        site = player.metrics.summary()["chat"]
+        assert site["calls"] == 2 and site["completion_tokens"] == 3 and "ttft_p50_ms" in site
+
+        with pytest.raises(CassetteMiss):
+            _ask(player, "never recorded")
+        print("SUCCESS: Recorded once, replayed without the network.")
+
+
+def test_cohere_replay():
+    with tempfile.TemporaryDirectory() as tmp:
+        cassette = Cassette(tmp, mode="replay", latency_ms=0)
+        kwargs = {"model": "command-r-08-2024", "message": "plan this", "preamble": "You are a planner"}
+
+        class Response:
+            text = '{"plan": []}'
+            meta = None
+
+        cassette.record_cohere(kwargs, Response(), 0.3)
+        gateway = LLMGateway(api_key="test", base_url=OFFLINE, cassette=cassette)
+        assert gateway.cohere_chat("planner", **kwargs).text == '{"plan": []}'
+
+
+def test_key_ignores_clock_lines():
+    def messages(clock):
+        return {"model": "m", "messages": [
+            {"role": "system", "content": f"Please use this real-time information if needed:\nDay: Monday\nTime: {clock}\n"},
+            {"role": "user", "content": "hello"}]}
+
+    assert cassette_key("groq", messages("10 hours, 1 minutes")) == cassette_key("groq", messages("11 hours, 59 minutes"))
+    other = messages("10 hours")
+    other["messages"][1]["content"] = "bye"
+    assert cassette_key("groq", messages("10 hours")) != cassette_key("groq", other)
+
+
+if __name__ == "__main__":
+    test_cohere_replay()
+    test_key_ignores_clock_lines()
+    print("Run the record/replay test with pytest (it needs the stub server fixture).")
@@ -0,0 +1,206 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from Backend.LLMGateway import LLMGateway, DeadlineExceeded
+
+
+class StubState:
+    def __init__(self):
+        self.script = []       # Status codes to return before succeeding
+        self.delay = 0.0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+
+class StubGroq(BaseHTTPRequestHandler):
+    """Minimal /openai/v1/chat/completions: scripted status codes, optional delay."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = self.server.state
+        with cls.lock:
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+            status = cls.script.pop(0) if cls.script else 200
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.active -= 1
+
+        if status == 200 and body.get("stream"):
+            events = []
+            for word in ["Hello", " there"]:
+                events.append({"id": "stub", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                               "choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]})
+            events[-1]["x_groq"] = {"id": "stub", "usage": {"prompt_tokens": 5, "completion_tokens": 2,
+                                                            "total_tokens": 7}}
+            payload = "".join(f"data: {json.dumps(e)}\n\n" for e in events).encode() + b"data: [DONE]\n\n"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        if status != 200:
+            payload = json.dumps({"error": {"message": "overloaded"}}).encode()
+        else:
+            payload = json.dumps({
+                "id": "stub", "object": "chat.completion", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "general"}}],
+                "usage": {"prompt_tokens": 12, "completion_tokens": 1, "total_tokens": 13},
+            }).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except BrokenPipeError:
+            pass  # Client gave up (deadline test)
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGroq)
+    server.state = StubState()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", server.state
+    server.shutdown()
+
+
+def _ask(gateway, site="classifier", **kwargs):
+    return gateway.chat(site, model="llama-3.3-70b-versatile",
+                        messages=[{"role": "user", "content": "hi"}], **kwargs)
+
+
+def test_retries_transient_errors_and_records_metrics(stub_server):
+    stub_server, state = stub_server
+    state.script = [503, 429]
+    gateway = LLMGateway(api_key="test", base_url=stub_server, max_retries=2, backoff=0.01)
+
+    completion = _ask(gateway)
+    assert completion.choices[0].message.content == "general"
+
+    site = gateway.metrics.summary()["classifier"]
+    assert site["calls"] == 1 and site["retries"] == 2 and site["errors"] == 0
+    assert site["prompt_tokens"] == 12 and site["completion_tokens"] == 1
+    print("SUCCESS: Transient errors retried.")
+
+
+def test_gives_up_after_bounded_retries(stub_server):
+    stub_server, state = stub_server
+    state.script = [503, 503, 503]
+    gateway = LLMGateway(api_key="test", base_url=stub_server, max_retries=1, backoff=0.01)
+    with pytest.raises(Exception):
+        _ask(gateway)
+    assert gateway.metrics.summary()["classifier"]["errors"] == 1
+
+
+def test_deadline_applies_to_slow_calls(stub_server):
+    stub_server, state = stub_server
+    state.delay = 1.0
+    gateway = LLMGateway(api_key="test", base_url=stub_server, max_retries=0)
+    start = time.perf_counter()
+    with pytest.raises(Exception):
+        _ask(gateway, deadline=0.2)
+    assert time.perf_counter() - start < 0.9
+
+
+def test_concurrency_is_bounded(stub_server):
+    stub_server, state = stub_server
+    state.delay = 0.1
+    # Identical requests would be coalesced; this test is about the slot limit
+    gateway = LLMGateway(api_key="test", base_url=stub_server, max_concurrency=2, singleflight=False)
+    threads = [threading.Thread(target=_ask, args=(gateway, "chat")) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert state.max_active <= 2
+    assert gateway.metrics.summary()["chat"]["calls"] == 6
+    print("SUCCESS: Concurrency limited.")
+
+
+def test_stream_releases_slot_and_records_ttft(stub_server):
+    stub_server, state = stub_server
+    gateway = LLMGateway(api_key="test", base_url=stub_server, max_concurrency=1)
+    for _ in range(2):  # Second call would block forever if the slot leaked
+        chunks = _ask(gateway, "chat", stream=True, deadline=2)
+        assert "".join(c.choices[0].delta.content or "" for c in chunks) == "Hello there"
+
+    site = gateway.metrics.summary()["chat"]
+    assert site["calls"] == 2 and "ttft_p50_ms" in site
+    assert site["completion_tokens"] == 4
+
+
+def test_stream_abandoned_early_releases_slot(stub_server):
+    stub_server, state = stub_server
+    gateway = LLMGateway(api_key="test", base_url=stub_server, max_concurrency=1)
+    streams = []  # Kept alive, so only the early break (not garbage collection) can free the slot
+    for _ in range(2):
+        streams.append(_ask(gateway, "chat", stream=True, deadline=2))
+        for chunk in streams[-1]:
+            break
+    assert gateway._semaphore.acquire(timeout=0.5)
+    assert gateway.metrics.summary()["chat"]["errors"] == 0
+
+
+def test_identical_inflight_requests_are_coalesced(stub_server):
+    stub_server, state = stub_server
+    state.delay = 0.2
+    gateway = LLMGateway(api_key="test", base_url=stub_server, max_concurrency=4)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(_ask(gateway, "classifier"))) for _ in range(5)]
+    threads.append(threading.Thread(target=lambda: results.append(_ask(gateway, "classifier", temperature=0))))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 6 and all(r.choices[0].message.content == "general" for r in results)
+    assert state.max_active == 2  # One shared call + the request with different params
+    site = gateway.metrics.summary()["classifier"]
+    assert site["calls"] == 2 and site["coalesced"] == 4
+    assert gateway.singleflight.collapsed == 4
+
+    _ask(gateway, "classifier")  # Nothing is cached once the flight has landed
+    assert gateway.metrics.summary()["classifier"]["calls"] == 3
+    print("SUCCESS: Identical in-flight requests shared one upstream call.")
+
+
+def test_coalesced_callers_share_errors(stub_server):
+    stub_server, state = stub_server
+    state.script = [400]
+    state.delay = 0.2
+    gateway = LLMGateway(api_key="test", base_url=stub_server, max_retries=0)
+    errors = []
+
+    def ask():
+        try:
+            _ask(gateway)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=ask) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(errors) == 3 and gateway.metrics.summary()["classifier"]["errors"] == 1
+
+
+def test_no_slot_within_deadline():
+    gateway = LLMGateway(api_key="test", base_url="http://127.0.0.1:9", max_concurrency=1)
+    gateway._semaphore.acquire()
+    with pytest.raises(DeadlineExceeded):
+        _ask(gateway, deadline=0.05)
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from Backend.LLMGateway import LLMGateway
+from Backend.LLMTelemetry import TelemetryLog, estimate_cost, prune_sessions, report
+from test_llm_gateway import stub_server  # noqa: F401  (pytest fixture)
+
+
+def test_gateway_calls_are_logged_per_site(stub_server):
+    url, state = stub_server
+    with tempfile.TemporaryDirectory() as tmp:
+        log = TelemetryLog(os.path.join(tmp, "session-test.jsonl"))
+        gateway = LLMGateway(api_key="test", base_url=url, backoff=0.01, telemetry=log)
+        messages = [{"role": "user", "content": "hi"}]
+
+        state.script = [503]
+        gateway.chat("classifier", model="llama-3.3-70b-versatile", messages=messages)
+        for _ in range(3):
+            list(gateway.chat("chat", model="llama-3.3-70b-versatile", messages=messages, stream=True))
+        log.record("intent", cache="hit")
+        log.record("intent", model="llama-3.3-70b-versatile", latency=0.4, prompt_tokens=100, completion_tokens=20)
+        log.close()
+
+        sites = report(log.path)
+        print(f"Report: {sites}")
+        assert sites["classifier"]["model_calls"] == 1 and sites["classifier"]["retries"] == 1
+        assert sites["classifier"]["prompt_tokens"] == 12
+        assert sites["chat"]["model_calls"] == 3 and "ttft_p50_ms" in sites["chat"]
+        assert sites["chat"]["completion_tokens"] == 6
+        assert sites["intent"]["cache"] == {"hit": 1, "miss": 1} and sites["intent"]["avoided_rate"] == 0.5
+        assert sites["intent"]["latency_p50_ms"] == 400.0
+        assert abs(sites["intent"]["cost_usd"] - estimate_cost("llama-3.3-70b-versatile", 100, 20)) < 1e-12
+
+        # The report command
+        out = subprocess.run([sys.executable, "-m", "Backend.LLMTelemetry", log.path],
+                             capture_output=True, text=True, check=True).stdout
+        assert "classifier" in out and "chat" in out and "intent" in out
+        print("SUCCESS: Per-site telemetry recorded and aggregated.")
+
+
+def test_unknown_model_has_no_cost():
+    assert estimate_cost("some-new-model", 1000, 1000) is None
+    assert estimate_cost("llama-3.1-8b-instant", 1_000_000, 0) == 0.05
+
+
+def test_old_sessions_are_pruned():
+    with tempfile.TemporaryDirectory() as tmp:
+        for day in range(1, 6):
+            with open(os.path.join(tmp, f"session-2026010{day}-000000-1.jsonl"), "w") as f:
+                f.write("{}\n")
+        removed = prune_sessions(tmp, keep=2)
+        assert [os.path.basename(p) for p in removed] == [f"session-2026010{day}-000000-1.jsonl" for day in (1, 2, 3)]
+        assert sorted(os.listdir(tmp)) == ["session-20260104-000000-1.jsonl", "session-20260105-000000-1.jsonl"]
+        assert prune_sessions(tmp, keep=2) == []
+    print("SUCCESS: Only the newest sessions are kept.")
+
+
+if __name__ == "__main__":
+    test_unknown_model_has_no_cost()
+    test_old_sessions_are_pruned()
+    print("Run the gateway test with pytest (it needs the stub server fixture).")
@@ -0,0 +1,48 @@
+from Backend.LocalClassifier import classify_locally, classify_with_fast_path, fast_path_stats
+
+
+def test_deterministic_commands_skip_the_llm():
+    for prompt, label in [
+        ("open chrome", "realtime"),
+        ("play believer", "realtime"),
+        ("search for python tutorials", "realtime"),
+        ("send a message to mum saying hi", "realtime"),
+        ("hello", "general"),
+        ("what is the time", "general"),
+    ]:
+        result = classify_with_fast_path(prompt, lambda p: (_ for _ in ()).throw(AssertionError(p)))
+        assert result == label, prompt
+    print("SUCCESS: No LLM calls for deterministic commands.")
+
+
+def test_ambiguous_input_goes_to_llm():
+    calls = []
+    assert classify_with_fast_path("tell me a joke", lambda p: calls.append(p) or "general") == "general"
+    assert classify_with_fast_path("why is the sky blue", lambda p: calls.append(p) or "general") == "general"
+    assert calls == ["tell me a joke", "why is the sky blue"]
+    assert classify_locally("this is great")[0] is None  # "hi" inside "this" is not a greeting
+
+
+def test_message_questions_go_to_llm():
+    calls = []
+    for prompt in ["what is a text message to a friend", "how do i send a message to someone on whatsapp"]:
+        assert classify_locally(prompt)[1] < 0.9, prompt
+        classify_with_fast_path(prompt, lambda p: calls.append(p) or "general")
+    assert len(calls) == 2
+    assert classify_locally("whatsapp dad that i am late")[:2] == ("realtime", 0.9)
+    print("SUCCESS: Only commands start a message without the LLM.")
+
+
+def test_report_counts_avoided_calls_per_class():
+    classify_with_fast_path("open notepad", lambda p: "realtime")
+    report = fast_path_stats.report()
+    assert report["classes"]["open_application"]["avoided"] >= 1
+    assert report["mean_llm_ms"] is not None  # From the LLM calls above
+    assert report["classes"]["open_application"]["saved_ms"] is not None
+
+
+if __name__ == "__main__":
+    test_deterministic_commands_skip_the_llm()
+    test_ambiguous_input_goes_to_llm()
+    test_message_questions_go_to_llm()
+    test_report_counts_avoided_calls_per_class()
@@ -0,0 +1,95 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from Backend.MemoryManager import MemoryManager
+
+
+def make_manager():
+    with contextlib.redirect_stdout(io.StringIO()):  # "Initialized memory file" notices
+        return MemoryManager()
+
+
+def test_reads_are_cached_until_the_file_changes():
+    print("\n[Test] mtime/size validated read cache")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            memory = make_manager()
+            assert memory.get_preference("browser") == "chrome"
+            for _ in range(10):
+                memory.get_preference("theme")
+            assert memory.stats["misses"] == 1 and memory.stats["hits"] == 10
+
+            # Edited behind our back: the size/mtime change forces a re-read
+            with open(memory.files["preferences"], "w") as f:
+                json.dump({"browser": "firefox", "theme": "light"}, f)
+            assert memory.get_preference("browser") == "firefox"
+            assert memory.stats["misses"] == 2
+            assert memory.cache_stats()["hit_rate"] == 10 / 12
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS: Re-parsed only after the file changed.")
+
+
+def test_own_writes_invalidate():
+    print("\n[Test] Writes invalidate the cache")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            memory = make_manager()
+            assert memory.get_contact("Mom") is None
+            memory.add_contact("Mom", {"phone": "1"})
+            assert memory.get_contact("mom") == {"phone": "1"}
+            memory.add_contact("mom", {"phone": "2"})
+            assert memory.get_contact("MOM") == {"phone": "2"}
+            assert memory.stats["invalidations"] == 2
+
+            memory.record_failure({"goal_type": "open_app", "failure_reason": "missing"})
+            memory.record_failure({"goal_type": "web_search", "failure_reason": "timeout"})
+            assert len(memory.get_failures()) == 2
+            assert memory.get_failures_by_goal("open_app") == [{"goal_type": "open_app", "failure_reason": "missing"}]
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS: Own writes are visible immediately.")
+
+
+def test_callers_cannot_corrupt_the_cache():
+    print("\n[Test] Returned values are copies or read-only views")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            memory = make_manager()
+            memory.add_contact("dad", {"phone": "1"})
+            memory.get_contact("dad")["phone"] = "changed"
+            assert memory.get_contact("dad") == {"phone": "1"}
+
+            memory.record_failure({"goal_type": "open_app", "failure_reason": "missing"})
+            memory.get_failures().append({"goal_type": "x"})
+            memory.get_failures()[0]["failure_reason"] = "changed"
+            assert memory.get_failures() == [{"goal_type": "open_app", "failure_reason": "missing"}]
+
+            # Bulk readers share one read-only view instead of a copy per call
+            view = memory._failures_view()
+            assert view is memory._failures_view() and view == ({"goal_type": "open_app", "failure_reason": "missing"},)
+            try:
+                view[0]["failure_reason"] = "changed"
+                assert False, "the shared view must be read-only"
+            except TypeError:
+                pass
+            memory.record_failure({"goal_type": "web_search", "failure_reason": "timeout"})
+            assert len(memory._failures_view()) == 2 and len(view) == 1
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS: Cached documents are never handed out writable.")
+
+
+if __name__ == "__main__":
+    test_reads_are_cached_until_the_file_changes()
+    test_own_writes_invalidate()
+    test_callers_cannot_corrupt_the_cache()
@@ -0,0 +1,126 @@
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+
+from Backend.MemoryManager import MemoryManager
+from Backend.MemoryStore import MemoryStore, import_json
+from Backend.OutcomeManager import OutcomeManager
+from Backend.StrategyHealth import StrategyHealthManager
+
+
+def write_json(root, relative, data):
+    path = os.path.join(root, relative)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_repository_api():
+    print("\n[Test] Keyed records and failure log")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(os.path.join(tmp, "friday.db"))
+        assert store._execute("PRAGMA journal_mode")[0][0] == "wal"
+
+        store.put("contacts", "mom", {"phone": "1"})
+        store.put("contacts", "mom", {"phone": "2"})
+        assert store.get("contacts", "mom") == {"phone": "2"}
+        assert store.get("contacts", "dad", "none") == "none"
+        store.seed("preferences", {"theme": "dark"})
+        store.put("preferences", "theme", "light")
+        store.seed("preferences", {"theme": "dark", "browser": "chrome"})
+        assert store.items("preferences") == {"browser": "chrome", "theme": "light"}
+
+        for i in range(10):
+            store.append_failure("learning", {"n": i}, keep=4)
+        assert [f["n"] for f in store.failures("learning")] == [6, 7, 8, 9]
+        store.append_failure("memory", {"goal_type": "a"}, goal_type="a")
+        store.append_failure("memory", {"goal_type": "b"}, goal_type="b")
+        assert store.failures("memory", goal_type="b") == [{"goal_type": "b"}]
+
+        plan = store._execute("EXPLAIN QUERY PLAN SELECT data FROM failures WHERE source = 'memory' AND goal_type = 'b'")
+        assert "failures_by_goal" in str(plan)
+        store.close()
+    print("SUCCESS: Repository API and indexes.")
+
+
+def test_managers_on_the_store():
+    print("\n[Test] MemoryManager / OutcomeManager / StrategyHealth on SQLite")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            store = MemoryStore(os.path.join(tmp, "friday.db"))
+            memory = MemoryManager(store=store)
+            assert memory.get_preference("browser") == "chrome"
+            memory.add_contact("Mom", {"phone": "1"})
+            assert memory.get_contact("MOM") == {"phone": "1"}
+            memory.record_failure({"goal_type": "send_message", "failure_reason": "timeout"})
+            memory.record_failure({"goal_type": "open_app", "failure_reason": "missing"})
+            assert [f["failure_reason"] for f in memory.get_failures_by_goal("open_app")] == ["missing"]
+            assert not os.path.exists("memory/contacts.json")
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                health = StrategyHealthManager(store=store, flush_delay=60)
+                health.record_failure("web_search")
+                health.flush()
+            assert StrategyHealthManager(store=store).get_health("web_search").failure_count == 1
+
+            om = OutcomeManager(store=store, health_manager=health)
+            with contextlib.redirect_stdout(io.StringIO()):
+                for success in (True, False, True):
+                    om.record("g1", "chrome", "open_app_direct", success, 1.0, 0, False)
+            om = OutcomeManager(store=store, health_manager=health)  # Aggregates rebuilt by SQL
+            assert om.get_strategy_stats("open_app_direct")["count"] == 3
+            assert len(om.recent_outcomes("g1", limit=10)) == 3
+            with contextlib.redirect_stdout(io.StringIO()):
+                om.record("g1", "chrome", "open_app_direct", True, 1.0, 0, False)
+            assert len(om.recent_outcomes("g1", limit=10)) == 4
+            assert not os.path.exists("memory/outcomes.jsonl")
+            health.flush()
+            store.close()
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS: Managers read and write the store only.")
+
+
+def test_json_import_runs_once():
+    print("\n[Test] One-shot JSON import")
+    with tempfile.TemporaryDirectory() as tmp:
+        write_json(tmp, "memory/contacts.json", {"mom": {"phone": "1"}})
+        write_json(tmp, "memory/failures.json", [{"goal_type": "open_app"}])
+        with open(os.path.join(tmp, "memory", "failures.jsonl"), "w") as f:
+            f.write(json.dumps({"goal_type": "web_search"}) + "\n")
+        write_json(tmp, "memory/outcomes.json", [{"goal_id": "g1", "strategy": "s", "success": True}])
+        write_json(tmp, "memory/media_preferences.json",
+                   {"history": [{"song": "believer", "best_platform": "youtube", "timestamp": 1.0}], "preferences": {}})
+        write_json(tmp, "FRIDAY/memory/failures.json", [{"error": "x"}])
+        write_json(tmp, "Data/trusted_contacts.json", [" Mom "])  # Stays file-backed
+
+        path = os.path.join(tmp, "friday.db")
+        store = MemoryStore(path)
+        counts = import_json(store, root=tmp)
+        assert counts == {"contacts": 1, "failures": 2, "learning_failures": 1, "outcomes": 1, "media": 1}
+        assert import_json(store, root=tmp) == {}
+        assert store.items("trusted_contacts") == {}
+
+        # Forcing a re-import adds nothing twice
+        recount = import_json(store, root=tmp, force=True)
+        assert recount["failures"] == recount["outcomes"] == recount["media"] == 0
+        assert len(store.failures("memory")) == 2
+        assert store.last_platform("believer") == "youtube"
+        assert store.outcome_totals("strategy")["s"]["successes"] == 1
+        store.close()
+
+        # A second connection sees the committed import
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM failures").fetchone()[0] == 3
+    print("SUCCESS: Imported once.")
+
+
+if __name__ == "__main__":
+    test_repository_api()
+    test_managers_on_the_store()
+    test_json_import_runs_once()
@@ -0,0 +1,71 @@
+import threading
+import time
+
+from Backend.Orchestration import OrchestrationStats, classify_and_prepare
+
+
+def slow(result, seconds, calls=None):
+    def fn(prompt):
+        if calls is not None:
+            calls.append(threading.current_thread().name)
+        time.sleep(seconds)
+        return result
+    return fn
+
+
+def test_concurrent_overlaps_classifier_and_preparation():
+    print("\n[Test] Goal preparation overlaps the classifier call")
+    stats = OrchestrationStats()
+    start = time.perf_counter()
+    intent, prepared = classify_and_prepare("open chrome", slow("realtime", 0.2), slow(("goal", "strategy"), 0.15),
+                                            mode="concurrent", stats=stats)
+    elapsed = time.perf_counter() - start
+    print(f"Elapsed: {elapsed * 1000:.0f} ms")
+    assert intent == "realtime" and prepared == ("goal", "strategy")
+    assert elapsed < 0.3
+    assert stats.speculation["used"] == 1
+    print("SUCCESS")
+
+
+def test_general_discards_preparation():
+    print("\n[Test] 'general' discards the prepared goal")
+    stats = OrchestrationStats()
+    intent, prepared = classify_and_prepare("how are you", slow("general", 0.05), slow(("goal", "strategy"), 0.01),
+                                            mode="concurrent", stats=stats)
+    assert intent == "general" and prepared is None
+    assert stats.speculation["discarded"] == 1
+    print("SUCCESS")
+
+
+def test_sequential_and_failures():
+    print("\n[Test] Sequential mode never prepares; failures fall back to None")
+    calls = []
+    intent, prepared = classify_and_prepare("open chrome", slow("realtime", 0), slow("x", 0, calls), mode="sequential")
+    assert intent == "realtime" and prepared is None and not calls
+
+    def broken(prompt):
+        raise RuntimeError("boom")
+
+    stats = OrchestrationStats()
+    intent, prepared = classify_and_prepare("open chrome", slow("realtime", 0), broken, mode="concurrent", stats=stats)
+    assert intent == "realtime" and prepared is None and stats.speculation["failed"] == 1
+    print("SUCCESS")
+
+
+def test_report_percentiles():
+    print("\n[Test] Latency percentiles per mode")
+    stats = OrchestrationStats()
+    for ms in range(1, 101):
+        stats.record("sequential", ms / 1000)
+    report = stats.report()
+    print(f"Report: {report}")
+    assert round(report["sequential"]["p50_ms"]) == 50
+    assert round(report["sequential"]["p99_ms"]) == 99
+    print("SUCCESS")
+
+
+if __name__ == "__main__":
+    test_concurrent_overlaps_classifier_and_preparation()
+    test_general_discards_preparation()
+    test_sequential_and_failures()
+    test_report_percentiles()
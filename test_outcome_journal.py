@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+
+from Backend.OutcomeManager import OutcomeManager
+from Backend.StrategyHealth import StrategyHealthManager
+
+
+def make_manager(tmp, **kwargs):
+    # Own health file: record() never reaches the process-wide registry or memory/strategy_health.json
+    health = StrategyHealthManager(path=os.path.join(tmp, "strategy_health.json"))
+    return OutcomeManager(journal_path=os.path.join(tmp, "outcomes.jsonl"),
+                          checkpoint_path=os.path.join(tmp, "outcomes.checkpoint.json"),
+                          legacy_path=os.path.join(tmp, "outcomes.json"), health_manager=health, **kwargs)
+
+
+def record(om, goal_id, strategy, success, target="chrome"):
+    return om.record(goal_id=goal_id, target=target, strategy=strategy, primary_success=success,
+                     time_taken=1.0, retries=0, fallback_used=False)
+
+
+def test_stats_without_reparsing():
+    print("\n[Test] Aggregates kept in memory")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            om = make_manager(tmp)
+            for i in range(4):
+                record(om, "g1", "open_app_direct", i != 0)
+            record(om, "g2", "search_web", True, target="weather")
+
+            stats = om.get_strategy_stats("open_app_direct")
+            assert stats["count"] == 4 and stats["success_rate"] == 0.75
+            assert om.get_target_stats("chrome")["count"] == 4
+            assert om.get_strategy_stats("nope") == {"count": 0, "success_rate": 0.0}
+            assert len(om.recent_outcomes("g1", limit=2)) == 2
+            assert om.recent_outcomes("g2", target="chrome") == []
+
+            with open(om.journal_path) as f:
+                assert len(f.readlines()) == 5
+            om.close()
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS")
+
+
+def test_rebuild_from_checkpoint_and_journal():
+    print("\n[Test] Checkpoint + journal tail rebuild the same aggregates")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            om = make_manager(tmp, checkpoint_every=3)
+            for i in range(7):
+                record(om, f"g{i}", "send_whatsapp", i % 2 == 0)
+            expected = om.get_strategy_stats("send_whatsapp")
+            om._journal.close()  # Crash: no final checkpoint
+            with open(om.journal_path, "a") as f:
+                f.write('{"goal_id": "torn", "strat')
+
+            reopened = make_manager(tmp, checkpoint_every=3)
+            assert reopened.get_strategy_stats("send_whatsapp") == expected
+            assert reopened.recent_outcomes("g6")[0]["success"] is True
+            record(reopened, "g7", "send_whatsapp", True)
+            reopened.close()
+
+            with open(reopened.journal_path) as f:
+                assert json.loads(f.readlines()[-1])["goal_id"] == "g7"
+            assert make_manager(tmp).get_strategy_stats("send_whatsapp")["count"] == 8
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS")
+
+
+def test_legacy_import():
+    print("\n[Test] Legacy outcomes.json imported into the journal")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with open(os.path.join(tmp, "outcomes.json"), "w") as f:
+                json.dump([{"goal_id": "old", "strategy_id": "default_action", "success": True, "time_taken": 1.0,
+                            "retries": 0}], f)
+            om = make_manager(tmp)
+            assert om.get_strategy_stats("default_action")["count"] == 1
+            assert om.recent_outcomes("old")[0]["strategy_id"] == "default_action"
+            om.close()
+        finally:
+            os.chdir(cwd)
+    print("SUCCESS")
+
+
+if __name__ == "__main__":
+    test_stats_without_reparsing()
+    test_rebuild_from_checkpoint_and_journal()
+    test_legacy_import()
@@ -0,0 +1,89 @@
+from Backend.contracts import Goal, Strategy
+from Backend.GSOAdapter import GSOAdapter
+from Backend.PlanCache import PlanCache, context_bucket
+
+
+def strategy(name):
+    return Strategy(name=name, confidence=0.9, reason="test")
+
+
+def test_deterministic_plans():
+    print("\n[Test] Deterministic plans match convert_to_commands")
+    cases = [
+        (Goal(name="send_message", target="Mom", content="hi"), strategy("send_whatsapp")),
+        (Goal(name="search_web", target="python docs"), strategy("search_web")),
+        (Goal(name="open_application", target="chrome"), strategy("open_app_direct")),
+        (Goal(name="generate_image", content="a red fox"), strategy("generate_image_local")),
+    ]
+    for goal, strat in cases:
+        plan = GSOAdapter.convert_to_plan(goal, strat)
+        assert GSOAdapter.plan_to_commands(plan) == GSOAdapter.convert_to_commands(goal, strat), plan
+
+    # Not covered, or incomplete: the Planner is still needed
+    assert GSOAdapter.convert_to_plan(Goal(name="system_control", target="volume"), strategy("system_action")) is None
+    assert GSOAdapter.convert_to_plan(Goal(name="send_message", target="Mom"), strategy("send_whatsapp")) is None
+    assert GSOAdapter.convert_to_plan(Goal(name="search_web"), strategy("search_web")) is None
+    print("SUCCESS")
+
+
+def test_cache_and_bypass():
+    print("\n[Test] Planner only called on cache misses")
+    calls = []
+
+    def planner():
+        calls.append(1)
+        return {"plan": [{"action": "system", "target": "volume up"}]}
+
+    cache = PlanCache()
+    goal, strat = Goal(name="system_control", target="Volume  Up"), strategy("system_action")
+
+    first = cache.plan(goal, strat, {}, planner)
+    first["plan"][0]["risk"] = "low"  # Verifier mutates steps in place
+    second = cache.plan(Goal(name="system_control", target="volume up"), strat, {}, planner)
+    assert len(calls) == 1
+    assert "risk" not in second["plan"][0]
+
+    # A different context bucket is a different prompt
+    cache.plan(goal, strat, {"autonomy_level": 0.2}, planner)
+    assert len(calls) == 2
+
+    cache.plan(Goal(name="open_application", target="chrome"), strategy("open_app_direct"), {}, planner)
+    assert len(calls) == 2
+
+    cache.invalidate(goal, strat, {})
+    cache.plan(goal, strat, {}, planner)
+    assert len(calls) == 3
+
+    report = cache.report()
+    print(f"Report: {report}")
+    assert report["deterministic"] == 1 and report["hits"] == 1 and report["planner_calls"] == 3
+    assert report["invalidations"] == 1
+    print("SUCCESS")
+
+
+def test_failed_plans_not_cached():
+    print("\n[Test] Planner errors are not cached")
+    cache = PlanCache()
+    goal, strat = Goal(name="system_control", target="volume"), strategy("system_action")
+    cache.plan(goal, strat, None, lambda: [])
+    assert cache.get(goal, strat, None) is None
+    assert context_bucket({"interaction_speed": 0.9, "surprise_tolerance": 0.1}) == "fast+cautious"
+    print("SUCCESS")
+
+
+def test_content_is_part_of_the_key():
+    print("\n[Test] Different message bodies never share a plan")
+    cache = PlanCache()
+    strat = strategy("send_sms")
+    cache.put(Goal(name="send_message", target="Mom", content="saying A"), strat, None,
+              {"plan": [{"action": "send", "target": "Mom", "content": "saying A"}]})
+    assert cache.get(Goal(name="send_message", target="Mom", content="saying B"), strat, None) is None
+    assert cache.get(Goal(name="send_message", target="mom", content="saying A"), strat, None) is not None
+    print("SUCCESS")
+
+
+if __name__ == "__main__":
+    test_deterministic_plans()
+    test_cache_and_bypass()
+    test_failed_plans_not_cached()
+    test_content_is_part_of_the_key()
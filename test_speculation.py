@@ -0,0 +1,62 @@
+from Backend.GoalExtractor import GoalExtractor
+from Backend.normalize import normalize_text
+from Backend.STTEngines import Hypothesis
+from core.classifier import classify
+from core.modes import RequestMode
+from core.speculation import SpeculativeRouter, raw_prefix, stable_prefix
+
+
+def test_stable_prefix():
+    assert stable_prefix("", "Open.") == ""
+    assert stable_prefix("Open chrome.", "Open chrome and.") == "open chrome"
+    assert stable_prefix("Play.", "Open chrome.") == ""
+    assert raw_prefix("Open Chrome, and.", "open chrome") == "Open Chrome,"
+
+
+def test_speculation_reused_when_final_matches():
+    warmed = []
+    extractor = GoalExtractor()  # Expects normalized input, like on the final path
+    router = SpeculativeRouter({"mode": classify, "goal": lambda text: extractor.extract_goal(normalize_text(text))},
+                               warmups=[warmed.append])
+    for partial in ["Open.", "Open chrome.", "Open chrome."]:
+        router.feed(Hypothesis(partial))
+    results = router.resolve("Open chrome.")
+
+    assert results["mode"] == RequestMode.ACTION
+    assert results["goal"].name == "open_application" and results["goal"].target == "chrome"
+    assert router.stats["hits"] == 1 and router.stats["rollbacks"] == 0
+    assert len(warmed) == 1  # Once per utterance
+    print("SUCCESS: Speculative routing reused.")
+
+
+def test_speculation_rolled_back_when_tail_changes():
+    router = SpeculativeRouter({"mode": classify})
+    router.feed(Hypothesis("Hello."))
+    router.feed(Hypothesis("Hello."))
+    results = router.resolve("Hello open chrome.")
+
+    assert results["mode"] == RequestMode.ACTION  # Recomputed on the final text
+    assert router.stats["rollbacks"] == 1 and router.stats["hits"] == 0
+    print("SUCCESS: Speculation rolled back.")
+
+
+def test_analyzers_see_raw_text():
+    seen = []
+    router = SpeculativeRouter({"text": lambda text: seen.append(text) or text})
+    router.feed(Hypothesis("Call Mom."))
+    router.feed(Hypothesis("Call Mom now."))
+    assert router.resolve("Call Mom, now!")["text"] == "Call Mom, now!"  # Rolled back: the raw final text
+    assert seen == ["Call Mom", "Call Mom, now!"]
+
+    router.feed(Hypothesis("Call Mom."))
+    router.feed(Hypothesis("Call Mom."))
+    assert router.resolve("call mom")["text"] == "Call Mom."  # Same normalized text: speculation reused
+    assert router.stats["hits"] == 1
+    print("SUCCESS: Normalization only decides reuse.")
+
+
+if __name__ == "__main__":
+    test_stable_prefix()
+    test_speculation_reused_when_final_matches()
+    test_speculation_rolled_back_when_tail_changes()
+    test_analyzers_see_raw_text()
@@ -0,0 +1,39 @@
+import os
+
+from Backend.SpeechCache import SpeechCache, cache_key
+
+
+def test_hit_after_put_and_survives_restart(tmp_path):
+    cache = SpeechCache(str(tmp_path), max_bytes=1024, memory_bytes=1024)
+    assert cache.get("aria", "Done.") is None
+    cache.put("aria", "Done.", b"mp3-done")
+    assert cache.get("aria", "Done.") == b"mp3-done"
+    assert cache.get("guy", "Done.") is None  # Voice is part of the key
+
+    reopened = SpeechCache(str(tmp_path), max_bytes=1024, memory_bytes=1024)
+    assert reopened.get("aria", "Done.") == b"mp3-done"
+    assert reopened.stats()["disk_hits"] == 1
+
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 2 and stats["writes"] == 1
+    print("SUCCESS: Cache hit from memory and disk.")
+
+
+def test_lru_eviction_respects_budget(tmp_path):
+    cache = SpeechCache(str(tmp_path), max_bytes=250, memory_bytes=0)
+    cache.put("v", "one", b"1" * 100)
+    cache.put("v", "two", b"2" * 100)
+    assert cache.get("v", "one")          # "one" is now most recently used
+    cache.put("v", "three", b"3" * 100)   # Over budget: evicts "two"
+
+    assert cache.contains("v", "one") and cache.contains("v", "three")
+    assert not cache.contains("v", "two")
+    assert not os.path.exists(os.path.join(str(tmp_path), cache_key("v", "two") + ".mp3"))
+    assert cache.stats()["evictions"] == 1 and cache.stats()["disk_bytes"] == 200
+    print("SUCCESS: LRU eviction.")
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_hit_after_put_and_survives_restart(tempfile.mkdtemp())
+    test_lru_eviction_respects_budget(tempfile.mkdtemp())
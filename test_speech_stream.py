@@ -0,0 +1,72 @@
+import os
+import tempfile
+from types import SimpleNamespace
+
+from Backend.ChatStore import ChatStore
+from Backend.SpeechStream import SentenceSplitter, SpokenStream, strip_tag
+
+
+def test_sentences_split_as_they_complete():
+    splitter = SentenceSplitter(min_chars=12)
+    assert splitter.feed("The capital of France") == []
+    assert splitter.feed(" is Paris. It has") == ["The capital of France is Paris."]
+    assert splitter.feed(" about 2 million people, e.g. in the city") == []  # "e.g." is not a boundary
+    assert splitter.feed(" proper!\nSure. Anything else") == [
+        "It has about 2 million people, e.g. in the city proper!"]
+    assert splitter.flush() == ["Sure. Anything else"]  # Short "Sure." is merged, not spoken alone
+
+
+def test_spoken_stream_queues_each_sentence_before_stream_ends():
+    spoken = []
+    chunks = iter(["Hello there, Sir. ", "Here is ", "your answer. ", "Bye"])
+    stream = SpokenStream(chunks, speak=spoken.append)
+
+    it = iter(stream)
+    assert next(it) == "Hello there, Sir."
+    assert spoken == ["Hello there, Sir."]  # Speaking while later chunks are unread
+    assert list(it) == ["Here is your answer.", "Bye"]
+    assert stream.text == "Hello there, Sir. Here is your answer. Bye"
+    print("SUCCESS: Sentence streaming.")
+
+
+def test_stop_tag_split_across_chunks():
+    assert "".join(strip_tag(["Hello", " there.<", "/s", ">"])) == "Hello there."
+    assert list(strip_tag(["a <b", "> c <", "p>"])) == ["a <b", "> c ", "<p>"]  # "<" held back, then released
+    assert list(strip_tag(["x</", "y"])) == ["x", "</y"]
+
+
+class _FailingGateway:
+    """Streams a few chunks, then drops the connection."""
+
+    def chat(self, site, **kwargs):
+        def chunks():
+            for text in ["The answer", " is 4", "2.</", "s>"]:
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+            raise RuntimeError("stream reset")
+        return chunks()
+
+
+def test_chatbot_stream_keeps_errors_out_of_the_answer():
+    import Backend.Chatbot as chatbot
+
+    cwd = os.getcwd()
+    saved = chatbot.get_gateway, chatbot.get_chat_store
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        store = ChatStore(path=os.path.join(tmp, "ChatLog.jsonl"), legacy_path=os.path.join(tmp, "ChatLog.json"))
+        chatbot.get_gateway, chatbot.get_chat_store = _FailingGateway, lambda: store
+        try:
+            assert chatbot.ChatBot("What is 6 times 7?") == "The answer is 42."
+            assert store.messages() == []  # Incomplete answers are not logged
+        finally:
+            chatbot.get_gateway, chatbot.get_chat_store = saved
+            store.close()
+            os.chdir(cwd)
+    print("SUCCESS: Error kept out of the answer.")
+
+
+if __name__ == "__main__":
+    test_sentences_split_as_they_complete()
+    test_spoken_stream_queues_each_sentence_before_stream_ends()
+    test_stop_tag_split_across_chunks()
+    test_chatbot_stream_keeps_errors_out_of_the_answer()
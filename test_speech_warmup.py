@@ -0,0 +1,39 @@
+import os
+
+from Backend.SpeechCache import SpeechCache
+from Backend.SpeechWarmup import PhraseUsage, SpeechWarmup
+
+
+def test_warmup_fills_cache_and_skips_warm_phrases(tmp_path):
+    cache = SpeechCache(str(tmp_path / "cache"))
+    cache.put("aria", "Done.", b"done")
+    synthesized = []
+
+    def synthesize(text):
+        synthesized.append(text)
+        return text.encode()
+
+    warmup = SpeechWarmup(cache, synthesize, "aria", ["Done.", "Recorded.", "Cancelled.", "Recorded."], gap=0)
+    warmup.run()
+
+    assert synthesized == ["Recorded.", "Cancelled."]
+    assert warmup.stats == {"rendered": 2, "already_warm": 1, "failed": 0}
+    assert cache.get("aria", "Cancelled.") == b"Cancelled."
+    print("SUCCESS: Warm-up rendered missing phrases only.")
+
+
+def test_usage_history_round_trip(tmp_path):
+    path = os.path.join(str(tmp_path), "usage.json")
+    usage = PhraseUsage(path)
+    for text in ["Opening chrome", "Opening chrome", "Done.", "x" * 500]:
+        usage.record(text)
+    usage.save()
+
+    reloaded = PhraseUsage(path)
+    assert reloaded.top(5) == ["Opening chrome", "Done."]  # Long answers are not tracked
+
+
+if __name__ == "__main__":
+    import pathlib, tempfile
+    test_warmup_fills_cache_and_skips_warm_phrases(pathlib.Path(tempfile.mkdtemp()))
+    test_usage_history_round_trip(tempfile.mkdtemp())
@@ -0,0 +1,77 @@
+import threading
+import time
+
+from Backend.SpeechWorker import SpeechWorker
+
+
+class FakeBackend:
+    def __init__(self, synth_delay=0.0, play_time=0.05):
+        self.synth_delay = synth_delay
+        self.play_time = play_time
+        self.played = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def synthesize(self, text):
+        if text == "broken":
+            raise RuntimeError("synthesis failed")
+        time.sleep(self.synth_delay)
+        return text.upper()
+
+    def play(self, audio, stop_event):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        stop_event.wait(self.play_time)
+        with self._lock:
+            self.active -= 1
+        self.played.append(audio)
+
+
+def test_utterances_play_in_order_without_overlap():
+    backend = FakeBackend()
+    worker = SpeechWorker(backend.synthesize, backend.play).start()
+
+    start = time.perf_counter()
+    handles = [worker.speak(t) for t in ["opening chrome", "done", "ready"]]
+    assert time.perf_counter() - start < 0.05  # speak() never blocks
+    for h in handles:
+        assert h.wait(2)
+
+    assert backend.played == ["OPENING CHROME", "DONE", "READY"]
+    assert backend.max_active == 1
+    metrics = worker.metrics()
+    assert metrics["spoken"] == 3 and metrics["queue_depth"] == 0
+    assert metrics["ttfa_p50_ms"] is not None
+    print("SUCCESS: Ordered, non-overlapping playback.")
+
+
+def test_cancel_barges_in():
+    backend = FakeBackend(play_time=5.0)
+    worker = SpeechWorker(backend.synthesize, backend.play).start()
+    first = worker.speak("a long answer")
+    second = worker.speak("queued")
+    while first.started_at is None:
+        time.sleep(0.01)
+
+    assert worker.cancel() == 2
+    assert first.wait(1) and second.wait(1)
+    assert first.cancelled and second.cancelled
+    assert backend.played == ["A LONG ANSWER"]  # Stopped early, second never played
+    assert worker.metrics()["cancelled"] == 2
+    print("SUCCESS: Barge-in cancelled playback.")
+
+
+def test_fallback_on_synthesis_failure():
+    backend = FakeBackend()
+    fallback = []
+    worker = SpeechWorker(backend.synthesize, backend.play, fallback=fallback.append).start()
+    assert worker.speak("broken").wait(2)
+    assert fallback == ["broken"] and worker.metrics()["spoken"] == 1
+
+
+if __name__ == "__main__":
+    test_utterances_play_in_order_without_overlap()
+    test_cancel_barges_in()
+    test_fallback_on_synthesis_failure()
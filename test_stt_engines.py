@@ -0,0 +1,66 @@
+import os
+import wave
+
+import numpy as np
+import pytest
+import speech_recognition as sr
+
+from Backend.STTEngines import STTEngine, GoogleEngine, get_engine
+from bench_stt_engines import benchmark_engine, load_clips, word_error_rate
+
+
+class EchoEngine(STTEngine):
+    """Stub engine: 'recognizes' a fixed transcript per clip length."""
+    name = "echo"
+    offline = True
+
+    def __init__(self, transcripts):
+        super().__init__()
+        self.transcripts = transcripts
+
+    def transcribe(self, audio_data, language="en-US"):
+        text = self.transcripts.get(len(audio_data.frame_data))
+        if text is None:
+            raise sr.UnknownValueError()
+        return text
+
+
+def write_clip(directory, name, seconds, reference=None):
+    samples = np.zeros(int(16000 * seconds), dtype=np.int16)
+    with wave.open(os.path.join(directory, f"{name}.wav"), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(samples.tobytes())
+    if reference is not None:
+        with open(os.path.join(directory, f"{name}.txt"), "w") as f:
+            f.write(reference)
+    return len(samples) * 2
+
+
+def test_word_error_rate():
+    assert word_error_rate("open chrome", "Open Chrome.") == (0, 2)
+    assert word_error_rate("play blinding lights", "play lights") == (1, 3)
+    assert word_error_rate("yes", "yes please") == (1, 1)
+    assert word_error_rate("send hi to mom", "") == (4, 4)
+
+
+def test_get_engine_registry():
+    assert isinstance(get_engine("google"), GoogleEngine)
+    assert get_engine("google") is get_engine("GOOGLE")
+    with pytest.raises(ValueError):
+        get_engine("nonexistent")
+
+
+def test_benchmark_reports_rtf_latency_and_wer(tmp_path):
+    a = write_clip(tmp_path, "a", 1.0, "open chrome")
+    b = write_clip(tmp_path, "b", 2.0, "play some music")
+    write_clip(tmp_path, "c", 0.5)  # no reference: timed only
+
+    engine = EchoEngine({a: "open chrome", b: "play sum music"})
+    result = benchmark_engine(engine, load_clips(tmp_path), "en-US")
+
+    assert result["clips"] == 3
+    assert result["wer"] == pytest.approx(1 / 5)
+    assert result["rtf"] >= 0 and result["p95_ms"] >= result["p50_ms"]
+    print(f"SUCCESS: {result}")
@@ -0,0 +1,93 @@
+import os
+import wave
+
+import numpy as np
+
+from Backend.VoiceActivity import (AdaptiveVAD, run_vad, run_vad_on_wav,
+                                   SPEECH_START, SPEECH_END, MAX_DURATION, WAIT_TIMEOUT)
+
+SAMPLERATE = 16000
+
+
+def write_fixture(path, noise_rms, speech_rms, speech_at, speech_len, total):
+    """Noise bed with a voiced (300 Hz harmonic) burst, written as a 16-bit WAV."""
+    rng = np.random.default_rng(1)
+    n = int(total * SAMPLERATE)
+    signal = rng.normal(0, noise_rms, n)
+    start, end = int(speech_at * SAMPLERATE), int((speech_at + speech_len) * SAMPLERATE)
+    t = np.arange(end - start) / SAMPLERATE
+    signal[start:end] += speech_rms * np.sqrt(2) * np.sin(2 * np.pi * 300 * t)
+    samples = np.clip(signal, -32768, 32767).astype(np.int16)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(SAMPLERATE)
+        wf.writeframes(samples.tobytes())
+    return path
+
+
+def test_noisy_room_does_not_trigger_on_background(tmp_path):
+    # Background noise at RMS 800 would trip the old static EnergyThreshold (400) immediately
+    path = write_fixture(os.path.join(tmp_path, "noisy.wav"), noise_rms=800, speech_rms=4000,
+                         speech_at=1.5, speech_len=1.0, total=5.0)
+    events, vad = run_vad_on_wav(path, blocksize=1024, silence_timeout=0.8, max_duration=5.0)
+
+    names = [e for e, _ in events]
+    assert names == [SPEECH_START, SPEECH_END], events
+    start_time, end_time = events[0][1], events[1][1]
+    assert 1.5 <= start_time <= 1.6
+    assert 2.5 + 0.8 <= end_time <= 2.5 + 0.8 + 0.2
+    assert 600 < vad.noise_floor < 1000
+    print(f"SUCCESS: Noisy room -> {events}, floor {vad.noise_floor:.0f}")
+
+
+def test_quiet_room_detects_soft_speech(tmp_path):
+    path = write_fixture(os.path.join(tmp_path, "quiet.wav"), noise_rms=30, speech_rms=300,
+                         speech_at=0.5, speech_len=0.6, total=3.0)
+    events, _ = run_vad_on_wav(path, blocksize=1024, silence_timeout=0.8, max_duration=5.0)
+    assert [e for e, _ in events] == [SPEECH_START, SPEECH_END], events
+    print(f"SUCCESS: Quiet room -> {events}")
+
+
+def test_hysteresis_keeps_recording_through_decay():
+    vad = AdaptiveVAD(SAMPLERATE, 1000, silence_timeout=0.5, max_duration=10.0, calibration=0)
+    noise = np.full(1000, 100, dtype=np.int16)
+    loud = np.full(1000, 1000, dtype=np.int16)
+    # Between end and start thresholds: keeps speech alive but would not start it
+    decay = np.full(1000, 200, dtype=np.int16)
+
+    for _ in range(20):
+        assert vad.process(noise) is None
+    assert vad.process(decay) is None
+    assert vad.process(loud) == SPEECH_START
+    for _ in range(30):
+        assert vad.process(decay) is None
+    assert vad.state == vad.SPEECH
+    print("SUCCESS: Hysteresis verified.")
+
+
+def test_max_duration_and_wait_timeout():
+    vad = AdaptiveVAD(SAMPLERATE, 1000, silence_timeout=1.0, max_duration=0.5, calibration=0)
+    loud = np.full(16000, 3000, dtype=np.int16)
+    assert [e for e, _ in run_vad(loud, vad)] == [SPEECH_START, MAX_DURATION]
+
+    vad = AdaptiveVAD(SAMPLERATE, 1000, wait_timeout=0.5)
+    silence = np.zeros(16000, dtype=np.int16)
+    assert [e for e, _ in run_vad(silence, vad)] == [WAIT_TIMEOUT]
+
+
+def test_block_rms_matches_float_reference():
+    vad = AdaptiveVAD(SAMPLERATE, 1024)
+    block = np.array([-32768, 32767] * 512, dtype=np.int16)
+    expected = np.sqrt(np.mean(block.astype(np.float64) ** 2))
+    assert abs(vad.block_rms(block) - expected) < 1e-6
+
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as d:
+        test_noisy_room_does_not_trigger_on_background(d)
+        test_quiet_room_detects_soft_speech(d)
+    test_hysteresis_keeps_recording_through_decay()
+    test_max_duration_and_wait_timeout()
+    test_block_rms_matches_float_reference()